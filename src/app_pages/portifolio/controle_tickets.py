@@ -10,15 +10,34 @@ acompanhamento dos tickets em andamento.
 Visto que o painel está ligado via API, as informações sempre estarão atualizadas.
 """
 
-import altair as alt
 import streamlit as st
 import polars as pl
 import random
 
 from streamlit import session_state as ss
-from datetime import datetime
-from tools.api_data import buscar_dados_random_user, processar_dados_random_user
-from mockup_data.faker_data_generation import gerar_dados_tickets
+from datetime import date, datetime
+from tools.avatares import TAMANHO_AVATAR, obter_cache_avatares
+from tools.cache_datasets import em_cache
+from tools.desempenho import MedicaoRegiao, MedidorDesempenho, iniciar_desempenho
+from tools.esquemas import VERSAO_ESQUEMA
+from tools.provedor_analistas import (
+    buscar_analistas_remotos,
+    gerar_analistas_locais,
+    obter_provedor_analistas,
+)
+from tools.repositorio_datasets import HandleDataset, obter_repositorio
+from tools.tickets_dados import (
+    DIAS_ALERTA,
+    IndicadoresTickets,
+    calcular_indicadores,
+    em_atendimento,
+    em_atendimento_ha_mais_de,
+    indexar_analistas,
+    particionar,
+    tickets_por_analista_status,
+    tickets_por_mes_status,
+)
+from mockup_data.faker_data_generation import gerar_dados_tickets_df
 
 # region Config Página
 # Nesta seção é definido o título da página, o layout e os itens de menu - itens para
@@ -27,88 +46,214 @@ st.set_page_config(
     page_title="Controle de tickets",
     layout="wide",
 )
+
+# Tempo de cada região nesta execução, exibido no painel "Performance"
+medidor: MedidorDesempenho = iniciar_desempenho("controle_tickets")
 # endregion
 
 
 # region Gerar Dados
-# Analistas - RandomUser.me
-def gerar_dados_analistas(qtd: int = 10) -> list[dict]:
+# Semente usada no primeiro acesso. Todas as sessões começam com os mesmos dados, que
+# são lidos do cache em disco em vez de gerados novamente.
+SEMENTE_PADRAO: int = 0
+
+
+# Analistas - RandomUser.me, com analistas locais enquanto a API não responde
+def gerar_dados_analistas(qtd: int, seed: int) -> pl.DataFrame | None:
     """
     Função para gerar dados para os analistas.
-    Retorna uma lista de dicionários com os dados gerados.
+    Retorna os analistas do site RandomUser.me, caso já tenham sido obtidos. Caso
+    contrário, a busca é iniciada em segundo plano e a função retorna None, sem
+    esperar pela resposta.
 
     Args:
-        qtd (int, optional):
-        Quantidade de analistas a serem gerados. Padrão é 10.
+        qtd (int):
+        Quantidade de analistas a serem gerados.
+
+        seed (int):
+        Semente enviada à API.
 
     Returns:
-        list[dict]:
-        Lista de dicionários com os dados gerados para analistas.
+        pl.DataFrame | None:
+        DataFrame com os dados dos analistas, ou None se ainda não estiverem
+        disponíveis.
     """
-    return buscar_dados_random_user(qtd)
+    return obter_provedor_analistas().remotos(qtd, seed)
 
 
 # Tickets - Faker
 def dados_tickets(
-    qtd: int = 10, df_analistas: pl.DataFrame = pl.DataFrame()
+    qtd: int = 10,
+    df_analistas: pl.DataFrame = pl.DataFrame(),
+    seed: int | None = None,
+    data_referencia: datetime | None = None,
 ) -> pl.DataFrame:
     """
     Função para gerar dados para os tickets.
-    Retorna uma lista de dicionários com os dados gerados.
+    Retorna um DataFrame com os dados gerados.
 
     Returns:
-        list[dict]:
-        Lista de dicionários com os dados gerados para tickets.
+        pl.DataFrame:
+        DataFrame com os dados gerados para tickets.
+    """
+    return gerar_dados_tickets_df(
+        qtd=qtd, df_analistas=df_analistas, seed=seed, data_referencia=data_referencia
+    )
+
+
+# Analistas e Tickets - cache em disco
+def parametros_dados(seed: int) -> dict:
+    """
+    Função para sortear os parâmetros de geração dos dados a partir da semente.
     """
-    return gerar_dados_tickets(qtd=qtd, df_analistas=df_analistas)
+    rng = random.Random(seed)
+    return {
+        "qtd_analistas": rng.randint(5, 25),
+        "qtd_tickets": rng.randint(5, 200),
+        "data_referencia": datetime.combine(date.today(), datetime.min.time()),
+        "origem_analistas": "randomuser",
+        "versao_esquema": VERSAO_ESQUEMA,
+    }
 
 
-# endregion
+def gerar_dados(seed: int) -> HandleDataset:
+    """
+    Função para gerar os dados de analistas e tickets.
+    Os dados ficam no repositório compartilhado entre as sessões, e são lidos do cache
+    em disco quando já foram gerados com a mesma semente.
+
+    Enquanto os analistas do site RandomUser.me não estão disponíveis, os dados são
+    gerados com analistas locais (um conjunto de dados à parte, com origem "local").
+
+    Args:
+        seed (int):
+        Semente usada na geração dos dados.
+
+    Returns:
+        HandleDataset:
+        Handle para os dados gerados, com as tabelas "analistas" e "tickets".
+    """
+    parametros: dict = parametros_dados(seed)
+    qtd_analistas: int = parametros["qtd_analistas"]
+
+    df_analistas: pl.DataFrame | None = None
+    if not em_cache("controle_tickets", parametros, seed):
+        df_analistas = gerar_dados_analistas(qtd=qtd_analistas, seed=seed)
+        if df_analistas is None:
+            parametros["origem_analistas"] = "local"
+            df_analistas = gerar_analistas_locais(qtd=qtd_analistas, seed=seed)
+
+    def gerar() -> dict[str, pl.DataFrame]:
+        analistas: pl.DataFrame = (
+            df_analistas
+            if df_analistas is not None
+            else buscar_analistas_remotos(qtd=qtd_analistas, seed=seed)
+        )
+        if analistas.is_empty():
+            raise RuntimeError("Não foi possível obter os analistas.")
+
+        df_tickets: pl.DataFrame = dados_tickets(
+            qtd=parametros["qtd_tickets"],
+            df_analistas=analistas,
+            seed=seed,
+            data_referencia=parametros["data_referencia"],
+        )
+
+        return {"analistas": analistas, "tickets": df_tickets}
+
+    return obter_repositorio().obter("controle_tickets", parametros, seed, gerar)
+
+
+@st.fragment(run_every=1)
+def aguardar_analistas(seed: int) -> None:
+    """
+    Verifica a cada segundo se a busca dos analistas remotos terminou e, quando
+    terminar, executa a página novamente para exibir os novos analistas.
+    """
+    qtd_analistas: int = parametros_dados(seed)["qtd_analistas"]
+    if obter_provedor_analistas().em_andamento(qtd_analistas, seed):
+        st.caption("Buscando analistas no site randomuser.me...")
+    else:
+        st.rerun()
+
 
-# region Random Qtd
-random_qtd_analistas = random.randint(5, 25)
-random_qtd_tickets = random.randint(5, 200)
 # endregion
 
 # region Session State
-if "analistas" not in ss:
-    ss.analistas = gerar_dados_analistas(qtd=random_qtd_analistas)
-    ss.df_analistas = (
-        processar_dados_random_user(ss.analistas)
-        .with_columns((pl.col("Nome") + " " + pl.col("Sobrenome")).alias("Analista"))
-        .select(["Foto", "Analista", "Email Empresarial", "Telefone"])
-    )
+medicao: MedicaoRegiao = medidor.iniciar_regiao("Session State")
+if "semente_tickets" not in ss:
+    ss.semente_tickets = SEMENTE_PADRAO
 
-if "tickets" not in ss:
-    ss.tickets = dados_tickets(qtd=random_qtd_tickets, df_analistas=ss.df_analistas)
-    ss.df_tickets = pl.DataFrame(ss.tickets)
+# O conjunto de dados é obtido do repositório a cada execução: quando os analistas
+# remotos chegam, o conjunto gerado com os analistas locais é substituído.
+ss.dataset_tickets = gerar_dados(seed=ss.semente_tickets)
 
 # DFs
-df_analistas: pl.DataFrame = ss.df_analistas
-df_tickets: pl.DataFrame = ss.df_tickets
+df_analistas: pl.DataFrame = ss.dataset_tickets.dados["analistas"]
+df_tickets: pl.DataFrame = ss.dataset_tickets.dados["tickets"]
+
+# Dados agregados dos gráficos, calculados uma única vez por conjunto de dados
+df_tickets_mes_status: pl.DataFrame = ss.dataset_tickets.materializar(
+    "tickets_mes_status",
+    lambda dados: tickets_por_mes_status(dados["tickets"]),
+)
+df_tickets_analista_status: pl.DataFrame = ss.dataset_tickets.materializar(
+    "tickets_analista_status",
+    lambda dados: tickets_por_analista_status(dados["tickets"]),
+)
+
+# Tickets e dados separados por analista, para a sessão de cada analista
+perfis_analistas: dict[str, dict] = ss.dataset_tickets.materializar(
+    "perfis_analistas",
+    lambda dados: indexar_analistas(dados["analistas"]),
+)
+
+# Fotos dos analistas: o download de todas as fotos do conjunto de dados é iniciado em
+# segundo plano, e as fotos são exibidas a partir do cache local
+cache_avatares = obter_cache_avatares()
+ss.dataset_tickets.materializar(
+    "pre_carregar_avatares",
+    lambda dados: cache_avatares.pre_carregar(dados["analistas"]["Foto"].unique()),
+)
+
+tickets_por_analista: dict[str, pl.DataFrame] = ss.dataset_tickets.materializar(
+    "tickets_por_analista",
+    lambda dados: particionar(dados["tickets"], "Analista"),
+)
+status_por_analista: dict[str, pl.DataFrame] = ss.dataset_tickets.materializar(
+    "status_por_analista",
+    lambda dados: particionar(df_tickets_analista_status, "Analista"),
+)
+
+# Indicadores do resumo e dos analistas. A data de referência é guardada junto com o
+# artefato, que é recalculado (e substituído) quando o dia muda
+indicadores: IndicadoresTickets = ss.dataset_tickets.materializar(
+    "indicadores",
+    lambda dados: calcular_indicadores(dados["tickets"], datetime.now()),
+    versao=date.today(),
+)
+
+medicao.registrar_linhas(df_tickets)
 
 # endregion
 
 # region Sidebar
+medidor.iniciar_regiao("Sidebar")
 # Botão - Gerar Novos Dados
 with st.sidebar:
     if st.button(label="Gerar Novos Dados", width="stretch"):
-        ss.analistas = gerar_dados_analistas(qtd=random_qtd_analistas)
-        ss.df_analistas = (
-            processar_dados_random_user(ss.analistas)
-            .with_columns(
-                (pl.col("Nome") + " " + pl.col("Sobrenome")).alias("Analista")
-            )
-            .select(["Foto", "Analista", "Email Empresarial", "Telefone"])
-        )
-
-        ss.tickets = dados_tickets(qtd=random_qtd_tickets, df_analistas=ss.df_analistas)
-        ss.df_tickets = pl.DataFrame(ss.tickets)
+        ss.semente_tickets = random.randrange(2**32)
         st.rerun()
 
+    if obter_provedor_analistas().em_andamento(
+        parametros_dados(ss.semente_tickets)["qtd_analistas"], ss.semente_tickets
+    ):
+        aguardar_analistas(ss.semente_tickets)
+
 # endregion
 
 # region App
+medicao = medidor.iniciar_regiao("App")
 st.title(
     "Controle de Tickets",
 )
@@ -187,29 +332,33 @@ with tabs[0]:
     with col1:
         st.metric(
             label="Tickets Abertos",
-            value=f"{len(df_tickets.filter(pl.col('Status Ticket') == 'Aberto')):,}",
+            value=f"{indicadores.totais['Aberto']:,}",
             border=True,
         )
 
     with col2:
         st.metric(
             label="Tickets Pendentes",
-            value=f"{len(df_tickets.filter(pl.col('Status Ticket') == 'Pendente')):,}",
+            value=f"{indicadores.totais['Pendente']:,}",
             border=True,
         )
 
     with col3:
         st.metric(
             label="Tickets Concluídos",
-            value=f"{len(df_tickets.filter(pl.col('Status Ticket') == 'Concluído')):,}",
+            value=f"{indicadores.totais['Concluído']:,}",
             border=True,
         )
 
     st.write("### Comparativo Mes a Mes")
 
+    # O Altair é importado somente aqui, depois que os indicadores já foram enviados ao
+    # navegador
+    import altair as alt
+
     fig = (
         alt.Chart(
-            df_tickets,
+            df_tickets_mes_status,
             title="Tickets por período, considerando a data de criação",
         )
         .mark_bar()
@@ -222,14 +371,13 @@ with tabs[0]:
             ),
             xOffset="Status Ticket",
             y=alt.Y(
-                field="Status Ticket",
-                aggregate="count",
+                "Quantidade:Q",
                 title="Quantidade",
             ),
             color=alt.Color("Status Ticket", legend={"orient": "top"}).scale(
                 scheme="lightgreyred"
             ),
-            text="count(*):Q",
+            text="Quantidade:Q",
         )
     )
 
@@ -242,10 +390,11 @@ with tabs[0]:
 with tabs[1]:
     st.write("### Relação de Tickets")
     st.dataframe(data=df_tickets, width="stretch")
+    medicao.registrar_linhas(df_tickets)
 
 with tabs[2]:
     with st.sidebar:
-        relacao_analistas: pl.DataFrame = ss.df_analistas
+        relacao_analistas: pl.DataFrame = df_analistas
         analista_selecionado: list[str] = st.multiselect(
             label="Analista",
             width=400,
@@ -267,8 +416,12 @@ with tabs[2]:
         )
 
     for analista in analista_selecionado:
-        dados_analista = ss.df_analistas.filter(pl.col("Analista") == analista)
-        tickets_analista = df_tickets.filter(pl.col("Analista") == analista)
+        dados_analista = perfis_analistas[analista]
+        tickets_analista = tickets_por_analista.get(analista, df_tickets.clear())
+        status_analista = status_por_analista.get(
+            analista, df_tickets_analista_status.clear()
+        )
+        indicadores_analista: dict = indicadores.por_analista.get(analista, {})
 
         col1, col2, col3 = st.columns(
             spec=[0.1, 0.3, 0.6],
@@ -277,21 +430,21 @@ with tabs[2]:
 
         with col1:
             st.image(
-                dados_analista["Foto"][0],
-                width=180,
+                cache_avatares.obter(dados_analista["Foto"]) or dados_analista["Foto"],
+                width=TAMANHO_AVATAR,
             )
 
         with col2:
             st.title(f"{analista}")
-            st.write(f"Tel Comercial: {dados_analista["Telefone"][0]}")
-            st.write(f"E-mail Comercial: {dados_analista["Email Empresarial"][0]}")
+            st.write(f"Tel Comercial: {dados_analista["Telefone"]}")
+            st.write(f"E-mail Comercial: {dados_analista["Email Empresarial"]}")
 
         with col3:
             col1, col2, col3, col4 = st.columns(spec=4, gap="medium")
             with col1:
-                base = alt.Chart(tickets_analista).encode(
+                base = alt.Chart(status_analista).encode(
                     y=alt.Y("Status Ticket:N", title=None),
-                    x=alt.X("count(Status Ticket):Q", title=None),
+                    x=alt.X("Quantidade:Q", title=None),
                     color=alt.Color(
                         "Status Ticket:N",
                         legend=None,
@@ -306,7 +459,7 @@ with tabs[2]:
                     size=15,
                     color="white",
                     fontWeight="bold",
-                ).encode(text="count(*):Q")
+                ).encode(text="Quantidade:Q")
 
                 chart = alt.layer(bars, text)
 
@@ -315,9 +468,7 @@ with tabs[2]:
             with col2:
                 st.metric(
                     label="Tickets em Atendimento",
-                    value=f"{tickets_analista.filter(
-                            (pl.col("Status Ticket").is_in(["Aberto", "Pendente"]))
-                ).count()[0, 0]:,}",
+                    value=f"{indicadores_analista.get("Em Atendimento", 0):,}",
                     border=False,
                     height="content",
                     help="""
@@ -328,11 +479,9 @@ with tabs[2]:
             with col3:
                 st.metric(
                     label="Qtd tickets > 15 dias",
-                    value=f"{tickets_analista.filter(
-                        (pl.col("Status Ticket").is_in(["Aberto", "Pendente"])) &
-                        ((datetime.now() - pl.col("Data Criação Ticket"))
-                        .dt.total_days() > 15)
-                    ).count()[0, 0]:,}",
+                    value=f"{indicadores_analista.get(
+                        f"Mais de {DIAS_ALERTA} Dias", 0
+                    ):,}",
                     border=False,
                     height="content",
                     help="""
@@ -351,13 +500,7 @@ with tabs[2]:
                 )
                 if somente_tkt_15_dias:
                     tickets_analista = tickets_analista.filter(
-                        (pl.col("Status Ticket").is_in(["Aberto", "Pendente"]))
-                        & (
-                            (
-                                datetime.now() - pl.col("Data Criação Ticket")
-                            ).dt.total_days()
-                            > 15
-                        )
+                        em_atendimento_ha_mais_de(indicadores.data_referencia)
                     )
 
                 somente_tkt_atendimento = st.toggle(
@@ -366,10 +509,14 @@ with tabs[2]:
                     key=f"toggleematendimento{analista}",
                 )
                 if somente_tkt_atendimento:
-                    tickets_analista = tickets_analista.filter(
-                        (pl.col("Status Ticket").is_in(["Aberto", "Pendente"]))
-                    )
+                    tickets_analista = tickets_analista.filter(em_atendimento())
 
         with st.expander(label="Relação de Tickets", expanded=False):
             st.dataframe(data=tickets_analista, width="stretch")
+        medicao.registrar_linhas(tickets_analista)
         st.write("---")
+# endregion
+
+# region Performance
+medidor.exibir_painel()
+# endregion
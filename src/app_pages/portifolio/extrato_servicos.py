@@ -9,18 +9,50 @@ pelo usuário, e agiliza o atendimento ao cliente caso este precise de mais info
 sobre os serviços prestados.
 """
 
-import altair as alt
+import os
 import streamlit as st
 import polars as pl
 import random
 
 from mockup_data.faker_data_generation import (
-    gerar_dados_projeto,
-    gerar_servicos_projeto,
+    gerar_dados_projeto_df,
+    gerar_servicos_projeto_df,
 )
-from tools.data_tools import salvar_xlsx
+from mockup_data.geracao_lotes import ARQUIVO_PROJETOS, ARQUIVO_SERVICOS
+from tools.data_tools import (
+    COMPRESSOES_PARQUET,
+    FORMATOS_EXPORTACAO,
+    salvar_csv,
+    salvar_ipc,
+    salvar_parquet,
+    salvar_xlsx,
+)
+from tools.desempenho import (
+    MedicaoRegiao,
+    MedidorDesempenho,
+    coletar,
+    iniciar_desempenho,
+)
+from tools.esquemas import VERSAO_ESQUEMA, formatar_codigo, formatar_codigos
+from tools.extrato_dados import (
+    CuboMensal,
+    construir_cubo_mensal,
+    custo_por_cliente,
+    custo_por_periodo,
+    enriquecer_servicos,
+    filtrar_cubo,
+    indexar_opcoes_filtro,
+    projetos_por_periodo,
+    projetos_por_valor,
+    totais_cubo,
+)
+from tools.filtros import MotorFiltros, filtrar_lazy
+from tools.repositorio_datasets import HandleDataset, obter_repositorio
 from streamlit import session_state as ss
-from datetime import datetime, timedelta
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
 
 # region Config Página
 # Nesta seção é definido o título da página, o layout e os itens de menu - itens para
@@ -29,65 +61,143 @@ st.set_page_config(
     page_title="Extrato de Serviços",
     layout="wide",
 )
+
+# Diretório opcional com os arquivos Parquet gerados por `mockup_data.geracao_lotes`.
+# Quando informado, os dados são lidos sob demanda com `pl.scan_parquet`, permitindo
+# usar conjuntos de dados maiores que a memória disponível.
+DIRETORIO_PARQUET: str | None = os.environ.get("EXTRATO_SERVICOS_PARQUET")
+
+# Tempo de cada região nesta execução, exibido no painel "Performance"
+medidor: MedidorDesempenho = iniciar_desempenho("extrato_servicos")
 # endregion
 
 
 # region Gerar Dados
-def gerar_dados() -> list[dict]:
+# Semente usada no primeiro acesso. Todas as sessões começam com os mesmos dados, que
+# são lidos do cache em disco em vez de gerados novamente.
+SEMENTE_PADRAO: int = 0
+
+
+def gerar_dados(seed: int) -> HandleDataset:
     """
     Função para gerar dados para o extrato de serviços por projeto.
-    Retorna uma lista de dicionários com os dados gerados.
+    Os dados ficam no repositório compartilhado entre as sessões, e são lidos do cache
+    em disco quando já foram gerados com a mesma semente.
+
+    Args:
+        seed (int):
+        Semente usada na geração dos dados.
 
     Returns:
-        list[dict]:
-        Lista de dicionários com os dados gerados para projetos e serviços.
+        HandleDataset:
+        Handle para os dados gerados, com as tabelas "projetos" e "servicos".
     """
+    rng = random.Random(seed)
+    parametros: dict = {
+        "qtd_itens": rng.randint(50, 200),
+        "qtd_projetos": rng.randint(10, 400),
+        "qtd_clientes": rng.randint(10, 500),
+        "qtd_servicos": rng.randint(50, 500),
+        "data_referencia": datetime.combine(date.today(), datetime.min.time()),
+        "versao_esquema": VERSAO_ESQUEMA,
+    }
+
+    def gerar() -> dict[str, pl.DataFrame]:
+        dados_projeto: pl.DataFrame = gerar_dados_projeto_df(
+            qtd_itens=parametros["qtd_itens"],
+            qtd_projetos=parametros["qtd_projetos"],
+            qtd_clientes=parametros["qtd_clientes"],
+            seed=seed,
+            data_referencia=parametros["data_referencia"],
+        )
 
-    dados_projeto: list[dict] = gerar_dados_projeto(
-        qtd_itens=random.randint(50, 200),
-        qtd_projetos=random.randint(10, 400),
-        qtd_clientes=random.randint(10, 500),
-    )
+        servicos_projeto: pl.DataFrame = gerar_servicos_projeto_df(
+            df_projetos=dados_projeto,
+            qtd_servicos=parametros["qtd_servicos"],
+            seed=seed,
+            data_referencia=parametros["data_referencia"],
+        )
 
-    servicos_projeto: list[dict] = [
-        gerar_servicos_projeto(projeto=projeto, qtd_servicos=random.randint(50, 500))
-        for projeto in dados_projeto
-    ]
+        return {"projetos": dados_projeto, "servicos": servicos_projeto}
 
-    return dados_projeto, servicos_projeto
+    return obter_repositorio().obter("extrato_servicos", parametros, seed, gerar)
 
 
-if "dados_projeto" not in ss or "servicos_projeto" not in ss:
-    ss.dados_projeto, ss.servicos_projeto = gerar_dados()
+medicao: MedicaoRegiao = medidor.iniciar_regiao("Gerar Dados")
+if DIRETORIO_PARQUET is None:
+    if "dataset_extrato" not in ss:
+        ss.dataset_extrato = gerar_dados(seed=SEMENTE_PADRAO)
 
-with st.sidebar:
-    if st.button(label="Gerar Novos Dados", width="stretch"):
-        ss.dados_projeto, ss.servicos_projeto = gerar_dados()
-        st.rerun()
+    with st.sidebar:
+        if st.button(label="Gerar Novos Dados", width="stretch"):
+            ss.dataset_extrato = gerar_dados(seed=random.randrange(2**32))
+            st.rerun()
+
+    medicao.registrar_linhas(ss.dataset_extrato.dados["servicos"])
 # endregion
 
 # region Transformar Dados
-df_projetos: pl.LazyFrame = pl.LazyFrame(ss.dados_projeto)
-df_servicos: pl.LazyFrame = pl.LazyFrame(ss.servicos_projeto)
-
-df_servicos_taxahora: pl.LazyFrame = (
-    df_servicos.join(
-        other=df_projetos,
-        left_on="Projeto Vinculado",
-        right_on="ID Projeto",
-        how="inner",
+@st.cache_resource(max_entries=4)
+def materializar_parquet(
+    nome: str, _funcao: Callable[[], Any], diretorio: str, versao: float
+) -> Any:
+    """
+    Equivalente a `HandleDataset.materializar` para os arquivos Parquet: o artefato é
+    calculado uma única vez e recalculado somente quando os arquivos são alterados
+    (`versao` é a data de modificação).
+    """
+    return _funcao()
+
+
+medicao = medidor.iniciar_regiao("Transformar Dados")
+if DIRETORIO_PARQUET is None:
+    # O join é executado uma única vez por conjunto de dados e o resultado fica em
+    # memória, compartilhado entre as sessões. As consultas abaixo partem dele.
+    df_servicos_taxahora: pl.LazyFrame = ss.dataset_extrato.materializar(
+        "servicos_taxahora",
+        lambda dados: coletar(
+            enriquecer_servicos(
+                df_servicos=dados["servicos"].lazy(),
+                df_projetos=dados["projetos"].lazy(),
+            )
+        ),
+    ).lazy()
+
+    # Opções dos filtros e cubo mensal, calculados uma única vez por conjunto de dados
+    opcoes_filtro: dict[str, pl.Series] = ss.dataset_extrato.materializar(
+        "opcoes_filtro",
+        lambda dados: indexar_opcoes_filtro(df_servicos_taxahora),
     )
-    .with_columns(
-        (pl.col("QTD Horas") * pl.col("Taxa/Hora Contratada")).alias("Custo Serviço")
+    cubo_mensal: CuboMensal = ss.dataset_extrato.materializar(
+        "cubo_mensal",
+        lambda dados: construir_cubo_mensal(df_servicos_taxahora),
     )
-    .sort(
-        by=["Projeto Vinculado", "Data Serviço"],
-        descending=[False, False],
+else:
+    df_servicos_taxahora: pl.LazyFrame = enriquecer_servicos(
+        df_servicos=pl.scan_parquet(Path(DIRETORIO_PARQUET) / ARQUIVO_SERVICOS),
+        df_projetos=pl.scan_parquet(Path(DIRETORIO_PARQUET) / ARQUIVO_PROJETOS),
     )
-)
+    versao_parquet: float = (
+        (Path(DIRETORIO_PARQUET) / ARQUIVO_SERVICOS).stat().st_mtime
+    )
+    opcoes_filtro: dict[str, pl.Series] = materializar_parquet(
+        "opcoes_filtro",
+        lambda: indexar_opcoes_filtro(df_servicos_taxahora),
+        DIRETORIO_PARQUET,
+        versao_parquet,
+    )
+    cubo_mensal: CuboMensal = materializar_parquet(
+        "cubo_mensal",
+        lambda: construir_cubo_mensal(df_servicos_taxahora),
+        DIRETORIO_PARQUET,
+        versao_parquet,
+    )
+
+medicao.registrar_linhas(cubo_mensal.dados)
 # endregion
 
 # region Filtros
+medicao = medidor.iniciar_regiao("Filtros")
 with st.sidebar:
     st.write("### Filtros")
 
@@ -107,121 +217,90 @@ with st.sidebar:
 
     cod_projeto_selecionado: int = st.multiselect(
         label="Código do Projeto",
-        options=df_servicos_taxahora.select(pl.col("Projeto Vinculado"))
-        .unique()
-        .sort("Projeto Vinculado")
-        .collect()
-        .to_series()
-        .to_list(),
+        options=opcoes_filtro["Projeto Vinculado"],
+        format_func=lambda chave: formatar_codigo(chave, "Projeto Vinculado"),
         placeholder="Selecione pelo código do projeto",
     )
     projeto_selecionado: str = st.multiselect(
         label="Nome do Projeto",
-        options=df_servicos_taxahora.select(pl.col("Nome Projeto"))
-        .unique()
-        .sort("Nome Projeto")
-        .collect()
-        .to_series()
-        .to_list(),
+        options=opcoes_filtro["Nome Projeto"],
         placeholder="Selecione pelo nome do projeto",
     )
     cod_servico_selecionado: int = st.multiselect(
         label="Código do Serviço",
-        options=df_servicos_taxahora.select(pl.col("ID Serviço"))
-        .unique()
-        .sort("ID Serviço")
-        .collect()
-        .to_series()
-        .to_list(),
+        options=opcoes_filtro["ID Serviço"],
+        format_func=lambda chave: formatar_codigo(chave, "ID Serviço"),
         placeholder="Selecione pelo código do serviço",
     )
     servico_selecionado: str = st.multiselect(
         label="Descrição Serviço",
-        options=df_servicos_taxahora.select(pl.col("Descrição Serviço"))
-        .unique()
-        .sort("Descrição Serviço")
-        .collect()
-        .to_series()
-        .to_list(),
+        options=opcoes_filtro["Descrição Serviço"],
         placeholder="Selecione pelo nome do serviço",
     )
     cod_cliente_selecionado: int = st.multiselect(
         label="Código do Cliente",
-        options=df_servicos_taxahora.select(pl.col("ID Cliente"))
-        .unique()
-        .sort("ID Cliente")
-        .collect()
-        .to_series()
-        .to_list(),
+        options=opcoes_filtro["ID Cliente"],
+        format_func=lambda chave: formatar_codigo(chave, "ID Cliente"),
         placeholder="Selecione pelo código do cliente",
     )
     cliente_selecionado: str = st.multiselect(
         label="Nome do Cliente",
-        options=df_servicos_taxahora.select(pl.col("Nome Cliente"))
-        .unique()
-        .sort("Nome Cliente")
-        .collect()
-        .to_series()
-        .to_list(),
+        options=opcoes_filtro["Nome Cliente"],
         placeholder="Selecione pelo nome do cliente",
     )
     responsavel_servico_selecionado: str = st.multiselect(
         label="Responsável pelo Serviço",
-        options=df_servicos_taxahora.select(pl.col("Responsável pelo Serviço"))
-        .unique()
-        .sort("Responsável pelo Serviço")
-        .collect()
-        .to_series()
-        .to_list(),
+        options=opcoes_filtro["Responsável pelo Serviço"],
         placeholder="Selecione pelo nome do cliente",
     )
 
     # Aplicar filtros
-    df_filtrada: pl.LazyFrame = df_servicos_taxahora.filter(
-        pl.col("Data Serviço").is_between(data_inicial, data_final)
-    )
-
-    if cod_projeto_selecionado:
-        df_filtrada = df_filtrada.filter(
-            pl.col("Projeto Vinculado").is_in(cod_projeto_selecionado)
-        )
-
-    if projeto_selecionado:
-        df_filtrada = df_filtrada.filter(
-            pl.col("Nome Projeto").is_in(projeto_selecionado)
-        )
-
-    if cod_cliente_selecionado:
-        df_filtrada = df_filtrada.filter(
-            pl.col("ID Cliente").is_in(cod_cliente_selecionado)
+    intervalos_filtro: dict[str, tuple[date, date]] = {
+        "Data Serviço": (data_inicial, data_final),
+    }
+    selecoes_filtro: dict[str, list] = {
+        "Projeto Vinculado": cod_projeto_selecionado,
+        "Nome Projeto": projeto_selecionado,
+        "ID Cliente": cod_cliente_selecionado,
+        "Nome Cliente": cliente_selecionado,
+        "ID Serviço": cod_servico_selecionado,
+        "Descrição Serviço": servico_selecionado,
+        "Responsável pelo Serviço": responsavel_servico_selecionado,
+    }
+
+    if DIRETORIO_PARQUET is None:
+        # Máscaras em cache por filtro: ao alterar um filtro, somente a máscara
+        # daquela coluna é recalculada.
+        motor_filtros: MotorFiltros = ss.dataset_extrato.materializar(
+            "motor_filtros",
+            lambda dados: MotorFiltros(coletar(df_servicos_taxahora)),
         )
-
-    if cliente_selecionado:
-        df_filtrada = df_filtrada.filter(
-            pl.col("Nome Cliente").is_in(cliente_selecionado)
-        )
-
-    if cod_servico_selecionado:
-        df_filtrada = df_filtrada.filter(
-            pl.col("ID Serviço").is_in(cod_servico_selecionado)
+        df_servicos_filtrados_taxahora: pl.DataFrame = motor_filtros.filtrar(
+            intervalos_filtro, selecoes_filtro
         )
-
-    if servico_selecionado:
-        df_filtrada = df_filtrada.filter(
-            pl.col("Descrição Serviço").is_in(servico_selecionado)
+    else:
+        df_servicos_filtrados_taxahora: pl.DataFrame = coletar(
+            filtrar_lazy(df_servicos_taxahora, intervalos_filtro, selecoes_filtro)
         )
 
-    if responsavel_servico_selecionado:
-        df_filtrada = df_filtrada.filter(
-            pl.col("Responsável pelo Serviço").is_in(responsavel_servico_selecionado)
-        )
+    # Totais e gráficos são calculados a partir do cubo mensal. Quando os filtros não
+    # podem ser atendidos pelo cubo (por exemplo, filtro por serviço), um cubo é
+    # construído a partir dos serviços filtrados.
+    cubo_filtrado: pl.DataFrame | None = filtrar_cubo(
+        cubo_mensal, intervalos_filtro["Data Serviço"], selecoes_filtro
+    )
+    if cubo_filtrado is None:
+        cubo_filtrado = construir_cubo_mensal(
+            df_servicos_filtrados_taxahora.lazy()
+        ).dados
 
-    df_servicos_filtrados_taxahora: pl.LazyFrame = df_filtrada.collect()
+    medicao.registrar_linhas(df_servicos_filtrados_taxahora)
 
 # endregion
 
 
 # region App
+medicao = medidor.iniciar_regiao("App")
 st.title("Extrato de Serviços")
 
 with st.expander(label="Sobre esta solução", expanded=False):
@@ -292,17 +371,14 @@ st.write("---")
 
 st.write("### Resumo")
 col1, col2, col3 = st.columns(3)
+total_servicos, total_horas, qtd_servicos = totais_cubo(cubo_filtrado)
 
 with col1:
-    total_servicos: float = df_filtrada.select(pl.col("Custo Serviço").sum()).collect()[
-        0, 0
-    ]
     st.metric(
         label="Valor Total dos Serviços", value=f"R$ {total_servicos:,.2f}", border=True
     )
 
 with col2:
-    total_horas: int = df_filtrada.select(pl.col("QTD Horas").sum()).collect()[0, 0]
     st.metric(
         label="Total de Horas",
         value=f"{total_horas:,.0f}h",
@@ -310,7 +386,6 @@ with col2:
     )
 
 with col3:
-    qtd_servicos: int = df_filtrada.select(pl.len()).collect()[0, 0]
     st.metric(
         label="Quantidade de Serviços",
         value=f"{qtd_servicos:,}",
@@ -321,15 +396,60 @@ tab1, tab2 = st.tabs(tabs=["Relação de Serviços", "Visualizações Gráficas"
 
 with tab1:
     st.write("### Relação de Serviços")
-    st.dataframe(df_filtrada.collect(), width="stretch")
-
-    st.download_button(
-        label="Exportar para Excel",
-        data=salvar_xlsx(df_filtrada.collect()),
-        file_name="extrato_servicos.xlsx",
+    # As chaves inteiras são formatadas como códigos somente na exibição e nos
+    # arquivos exportados
+    df_servicos_exibicao: pl.DataFrame = formatar_codigos(
+        df_servicos_filtrados_taxahora
     )
+    st.dataframe(df_servicos_exibicao, width="stretch")
+    medicao.registrar_linhas(df_servicos_filtrados_taxahora)
+
+    # Os arquivos são gerados somente ao clicar no botão (geração adiada), e não a
+    # cada interação com a página.
+    col1, col2, col3, col4 = st.columns(spec=4, vertical_alignment="bottom")
+    with col1:
+        st.download_button(
+            label="Exportar para Excel",
+            data=lambda: salvar_xlsx(df_servicos_exibicao),
+            file_name="extrato_servicos.xlsx",
+            mime=FORMATOS_EXPORTACAO["Excel"][2],
+        )
+
+    with col2:
+        compressao_parquet: str = st.selectbox(
+            label="Compressão Parquet",
+            options=COMPRESSOES_PARQUET,
+        )
+        st.download_button(
+            label="Exportar para Parquet",
+            data=lambda: salvar_parquet(
+                df_servicos_exibicao, compressao=compressao_parquet
+            ),
+            file_name="extrato_servicos.parquet",
+            mime=FORMATOS_EXPORTACAO["Parquet"][2],
+        )
+
+    with col3:
+        st.download_button(
+            label="Exportar para CSV",
+            data=lambda: salvar_csv(df_servicos_exibicao),
+            file_name="extrato_servicos.csv",
+            mime=FORMATOS_EXPORTACAO["CSV"][2],
+        )
+
+    with col4:
+        st.download_button(
+            label="Exportar para Arrow IPC",
+            data=lambda: salvar_ipc(df_servicos_exibicao),
+            file_name="extrato_servicos.arrow",
+            mime=FORMATOS_EXPORTACAO["Arrow IPC"][2],
+        )
 
 with tab2:
+    # O Altair é importado somente aqui, depois que o resumo e a tabela já foram
+    # enviados ao navegador
+    import altair as alt
+
     st.write("### Visualizações Gráficas")
 
     # Dashboard - Custo Total
@@ -337,16 +457,7 @@ with tab2:
         col1, col2 = st.columns(2)
         with col1:
             st.write("#### Por Período")
-            df_custo_por_periodo = (
-                df_servicos_filtrados_taxahora.sort("Data Serviço")
-                .group_by_dynamic(
-                    "Data Serviço",
-                    every="1mo",
-                )
-                .agg(
-                    pl.col("Custo Serviço").sum().alias("Custo Serviço"),
-                )
-            )
+            df_custo_por_periodo = custo_por_periodo(cubo_filtrado)
 
             fig = (
                 alt.Chart(
@@ -384,19 +495,14 @@ with tab2:
 
         with col2:
             st.write("#### Por Cliente (TOP 10)")
-            df_custo_por_cliente = df_servicos_filtrados_taxahora.group_by(
-                [
-                    "Nome Cliente",
-                    "ID Cliente",
-                    "CNPJ Cliente",
-                    "Projeto Vinculado",
-                ]
-            ).agg(pl.col("Custo Serviço").sum())
+            df_custo_por_cliente = custo_por_cliente(cubo_filtrado)
 
             fig = (
                 alt.Chart(
-                    df_custo_por_cliente.sort("Custo Serviço", descending=True).head(
-                        10
+                    formatar_codigos(
+                        df_custo_por_cliente.sort(
+                            "Custo Serviço", descending=True
+                        ).head(10)
                     ),
                     title="Clientes com maior valor de custo total de serviços (em R$)",
                 )
@@ -414,16 +520,7 @@ with tab2:
         col1, col2 = st.columns(2)
         with col1:
             st.write("#### Por Período")
-            df_projetos_por_periodo = (
-                df_servicos_filtrados_taxahora.sort("Data Criação Projeto")
-                .group_by_dynamic(
-                    "Data Criação Projeto",
-                    every="1mo",
-                )
-                .agg(
-                    pl.col("Projeto Vinculado").unique().count().alias("Quantidade"),
-                )
-            )
+            df_projetos_por_periodo = projetos_por_periodo(cubo_filtrado)
 
             fig = (
                 alt.Chart(
@@ -466,20 +563,14 @@ with tab2:
 
         with col2:
             st.write("#### Por Valor (TOP 10)")
-            df_projetos_por_valor = df_servicos_filtrados_taxahora.group_by(
-                [
-                    "Projeto Vinculado",
-                    "Nome Projeto",
-                    "Nome Cliente",
-                    "ID Cliente",
-                    "CNPJ Cliente",
-                ]
-            ).agg(pl.col("Custo Serviço").sum())
+            df_projetos_por_valor = projetos_por_valor(cubo_filtrado)
 
             fig = (
                 alt.Chart(
-                    df_projetos_por_valor.sort("Custo Serviço", descending=True).head(
-                        10
+                    formatar_codigos(
+                        df_projetos_por_valor.sort(
+                            "Custo Serviço", descending=True
+                        ).head(10)
                     ),
                     title="Projetos com maior valor de custo total de serviços (em R$)",
                 )
@@ -519,3 +610,7 @@ with tab2:
 
 
 # endregion
+
+# region Performance
+medidor.exibir_painel()
+# endregion
@@ -0,0 +1,567 @@
+"""
+Benchmark das principais operações de dados do projeto em várias escalas.
+
+Cada caso (geração de dados, join do extrato, filtros, agregação mensal, exportação,
+leitura da API e indicadores dos tickets) é executado em um processo próprio, para
+que o pico de memória (ru_maxrss) seja o do caso. Os dados de entrada de cada escala são
+gerados uma única vez e gravados em arquivos Arrow IPC.
+
+Os resultados são comparados com uma linha de base (JSON), que guarda também a
+quantidade de repetições de cada caso: o tempo só é comparado quando as repetições são
+as mesmas da linha de base. O script termina com código de saída 1 quando algum caso
+falha ou fica mais lento ou usa mais memória do que a tolerância.
+
+Uso (a partir da pasta src):
+    python -m benchmarks.bench_dados --escalas 1k 100k
+    python -m benchmarks.bench_dados --escalas 1k 100k --salvar-baseline
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import polars as pl
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+from mockup_data.faker_data_generation import (
+    gerar_dados_analistas_df,
+    gerar_dados_projeto_df,
+    gerar_dados_tickets_df,
+    gerar_servicos_projeto_df,
+)
+from tools.api_data import processar_corpo_random_user, processar_dados_random_user
+from tools.data_tools import salvar_xlsx
+from tools.esquemas import VERSAO_ESQUEMA, formatar_codigos
+from tools.extrato_dados import (
+    construir_cubo_mensal,
+    custo_por_cliente,
+    custo_por_periodo,
+    enriquecer_servicos,
+    projetos_por_periodo,
+    projetos_por_valor,
+)
+from tools.filtros import MotorFiltros, filtrar_lazy
+from tools.tickets_dados import calcular_indicadores
+
+PASTA_SRC: Path = Path(__file__).resolve().parents[1]
+ARQUIVO_BASELINE: Path = Path(__file__).with_name("baseline.json")
+DIRETORIO_ENTRADAS: Path = Path(tempfile.gettempdir()) / "portfolio_bench"
+
+ESCALAS: dict[str, int] = {"1k": 1_000, "100k": 100_000, "10M": 10_000_000}
+DATA_REFERENCIA: datetime = datetime(2026, 1, 1)
+QTD_ANALISTAS: int = 20
+
+# Diferenças abaixo destes valores não são consideradas regressão (ruído)
+TOLERANCIA_TEMPO: float = 0.5
+TOLERANCIA_MEMORIA: float = 0.25
+DIFERENCA_MINIMA_S: float = 0.01
+DIFERENCA_MINIMA_MB: float = 20.0
+
+_ARQUIVO_COMPLETO: str = ".completo"
+
+
+# region Entradas
+def _usuarios_random_user(qtd: int) -> bytes:
+    """
+    Gera uma resposta da API do site RandomUser.me com `qtd` usuários, no mesmo
+    formato da API.
+    """
+    df_analistas = gerar_dados_analistas_df(qtd=qtd, seed=0)
+    usuarios = [
+        {
+            "gender": "female",
+            "name": {"title": "Sra", "first": nome, "last": sobrenome},
+            "email": email,
+            "phone": telefone,
+            "id": {"name": "CPF", "value": None},
+            "picture": {"large": foto, "medium": foto, "thumbnail": foto},
+        }
+        for foto, (nome, _, sobrenome), email, telefone in zip(
+            df_analistas["Foto"],
+            (analista.rpartition(" ") for analista in df_analistas["Analista"]),
+            df_analistas["Email Empresarial"],
+            df_analistas["Telefone"],
+        )
+    ]
+    return json.dumps({"results": usuarios, "info": {"results": qtd}}).encode()
+
+
+def preparar_entradas(linhas: int, diretorio: Path = DIRETORIO_ENTRADAS) -> Path:
+    """
+    Gera e grava os dados de entrada de uma escala, caso ainda não existam. As
+    entradas ficam em uma pasta por versão da política de tipos (`VERSAO_ESQUEMA`).
+
+    Args:
+        linhas (int):
+        Quantidade de linhas (serviços, tickets e usuários) da escala.
+
+        diretorio (Path, optional):
+        Diretório das entradas. Padrão é `DIRETORIO_ENTRADAS`.
+
+    Returns:
+        Path:
+        Pasta com as entradas da escala.
+    """
+    pasta = diretorio / f"v{VERSAO_ESQUEMA}" / str(linhas)
+    if (pasta / _ARQUIVO_COMPLETO).exists():
+        return pasta
+    pasta.mkdir(parents=True, exist_ok=True)
+
+    df_projetos = gerar_dados_projeto_df(
+        qtd_itens=400,
+        qtd_projetos=400,
+        qtd_clientes=500,
+        seed=0,
+        data_referencia=DATA_REFERENCIA,
+    ).unique("ID Projeto", keep="first", maintain_order=True)
+    df_servicos = gerar_servicos_projeto_df(
+        df_projetos=df_projetos,
+        qtd_linhas=linhas,
+        qtd_servicos=500,
+        seed=0,
+        data_referencia=DATA_REFERENCIA,
+    )
+    df_projetos.write_ipc(pasta / "projetos.arrow")
+    df_servicos.write_ipc(pasta / "servicos.arrow")
+    enriquecer_servicos(df_servicos.lazy(), df_projetos.lazy()).collect().write_ipc(
+        pasta / "extrato.arrow"
+    )
+    del df_servicos
+
+    gerar_dados_tickets_df(
+        qtd=max(linhas // QTD_ANALISTAS, 1),
+        df_analistas=gerar_dados_analistas_df(qtd=QTD_ANALISTAS, seed=0),
+        seed=0,
+        data_referencia=DATA_REFERENCIA,
+    ).write_ipc(pasta / "tickets.arrow")
+
+    if linhas <= CASOS["random_user_dicts"][1]:
+        (pasta / "random_user.json").write_bytes(_usuarios_random_user(linhas))
+
+    (pasta / _ARQUIVO_COMPLETO).touch()
+    return pasta
+
+
+# endregion
+
+
+# region Casos
+# Cada caso recebe a pasta de entradas e a quantidade de linhas, lê o que precisa e
+# retorna a função que será medida.
+def _caso_gerar_projetos(entradas: Path, linhas: int) -> Callable[[], Any]:
+    return lambda: gerar_dados_projeto_df(
+        qtd_itens=linhas,
+        qtd_projetos=linhas,
+        qtd_clientes=max(linhas // 2, 1),
+        seed=0,
+        data_referencia=DATA_REFERENCIA,
+    )
+
+
+def _caso_gerar_servicos(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_projetos = pl.read_ipc(entradas / "projetos.arrow")
+    return lambda: gerar_servicos_projeto_df(
+        df_projetos=df_projetos,
+        qtd_linhas=linhas,
+        qtd_servicos=500,
+        seed=0,
+        data_referencia=DATA_REFERENCIA,
+    )
+
+
+def _caso_gerar_tickets(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_analistas = gerar_dados_analistas_df(qtd=QTD_ANALISTAS, seed=0)
+    return lambda: gerar_dados_tickets_df(
+        qtd=max(linhas // QTD_ANALISTAS, 1),
+        df_analistas=df_analistas,
+        seed=0,
+        data_referencia=DATA_REFERENCIA,
+    )
+
+
+def _caso_enriquecer_extrato(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_servicos = pl.read_ipc(entradas / "servicos.arrow")
+    df_projetos = pl.read_ipc(entradas / "projetos.arrow")
+    return lambda: enriquecer_servicos(df_servicos.lazy(), df_projetos.lazy()).collect()
+
+
+def _filtros_extrato(df: pl.DataFrame) -> tuple[dict, dict]:
+    """
+    Filtros típicos da barra lateral: um intervalo de datas e duas seleções.
+    """
+    data_maxima = df["Data Serviço"].max().date()
+    clientes = df["Nome Cliente"].unique().sort().head(5).to_list()
+    responsaveis = df["Responsável pelo Serviço"].unique().sort().head(50).to_list()
+    return (
+        {"Data Serviço": (data_maxima - timedelta(days=730), data_maxima)},
+        {"Nome Cliente": clientes, "Responsável pelo Serviço": responsaveis},
+    )
+
+
+def _caso_filtros_motor(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_extrato = pl.read_ipc(entradas / "extrato.arrow")
+    intervalos, selecoes = _filtros_extrato(df_extrato)
+    # Motor novo a cada execução: mede o cálculo das máscaras, sem o cache
+    return lambda: MotorFiltros(df_extrato).filtrar(intervalos, selecoes)
+
+
+def _caso_filtros_lazy(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_extrato = pl.read_ipc(entradas / "extrato.arrow")
+    intervalos, selecoes = _filtros_extrato(df_extrato)
+    return lambda: filtrar_lazy(df_extrato.lazy(), intervalos, selecoes).collect()
+
+
+def _caso_agregacao_mensal(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_extrato = pl.read_ipc(entradas / "extrato.arrow")
+
+    def agregar() -> list[pl.DataFrame]:
+        cubo = construir_cubo_mensal(df_extrato.lazy()).dados
+        return [
+            custo_por_periodo(cubo),
+            custo_por_cliente(cubo),
+            projetos_por_periodo(cubo),
+            projetos_por_valor(cubo),
+        ]
+
+    return agregar
+
+
+def _caso_salvar_xlsx(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_extrato = formatar_codigos(pl.read_ipc(entradas / "extrato.arrow"))
+    return lambda: salvar_xlsx(df_extrato)
+
+
+def _caso_random_user_dicts(entradas: Path, linhas: int) -> Callable[[], Any]:
+    dados = json.loads((entradas / "random_user.json").read_bytes())["results"]
+    return lambda: processar_dados_random_user(dados)
+
+
+def _caso_random_user_json(entradas: Path, linhas: int) -> Callable[[], Any]:
+    corpo = (entradas / "random_user.json").read_bytes()
+    return lambda: processar_corpo_random_user(corpo)
+
+
+def _caso_indicadores_tickets(entradas: Path, linhas: int) -> Callable[[], Any]:
+    df_tickets = pl.read_ipc(entradas / "tickets.arrow")
+    return lambda: calcular_indicadores(df_tickets, DATA_REFERENCIA)
+
+
+# Nome do caso: função que prepara o caso e quantidade máxima de linhas. O xlsx é
+# limitado pela quantidade de linhas de uma planilha do Excel, e a resposta da API pelo
+# tamanho do JSON em memória.
+CASOS: dict[str, tuple[Callable[[Path, int], Callable[[], Any]], int]] = {
+    "gerar_projetos": (_caso_gerar_projetos, 10_000_000),
+    "gerar_servicos": (_caso_gerar_servicos, 10_000_000),
+    "gerar_tickets": (_caso_gerar_tickets, 10_000_000),
+    "enriquecer_extrato": (_caso_enriquecer_extrato, 10_000_000),
+    "filtros_motor": (_caso_filtros_motor, 10_000_000),
+    "filtros_lazy": (_caso_filtros_lazy, 10_000_000),
+    "agregacao_mensal": (_caso_agregacao_mensal, 10_000_000),
+    "salvar_xlsx": (_caso_salvar_xlsx, 1_000_000),
+    "random_user_dicts": (_caso_random_user_dicts, 100_000),
+    "random_user_json": (_caso_random_user_json, 100_000),
+    "indicadores_tickets": (_caso_indicadores_tickets, 10_000_000),
+}
+
+
+def medir_caso(caso: str, linhas: int, entradas: Path, repeticoes: int) -> dict:
+    """
+    Executa o caso no processo atual e retorna o menor tempo e o pico de memória.
+    """
+    funcao = CASOS[caso][0](entradas, linhas)
+
+    tempos: list[float] = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    # No Linux, ru_maxrss é informado em KiB
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1_024
+    return {"tempo_s": round(min(tempos), 6), "pico_mb": round(pico_mb, 1)}
+
+
+# endregion
+
+
+# region Execução
+def _executar_python(*argumentos: str) -> str:
+    """
+    Executa este módulo em um novo processo e retorna a última linha da saída. Lança
+    `RuntimeError` quando o processo falha ou termina sem saída (por exemplo, ao ser
+    encerrado por falta de memória).
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_dados", *argumentos],
+        cwd=PASTA_SRC,
+        capture_output=True,
+        text=True,
+    )
+    erro = resultado.stderr.strip().splitlines()
+    saida = resultado.stdout.strip().splitlines()
+    if resultado.returncode != 0:
+        raise RuntimeError(
+            erro[-1] if erro else f"processo terminou com código {resultado.returncode}"
+        )
+    if not saida:
+        raise RuntimeError("processo terminou sem saída")
+    return saida[-1]
+
+
+def executar(
+    escalas: list[str], casos: list[str], repeticoes: int = 3
+) -> pl.DataFrame:
+    """
+    Executa os casos nas escalas informadas, cada um em um processo próprio.
+
+    Args:
+        escalas (list[str]):
+        Escalas a serem executadas (chaves de `ESCALAS`).
+
+        casos (list[str]):
+        Casos a serem executados (chaves de `CASOS`).
+
+        repeticoes (int, optional):
+        Quantidade de repetições de cada caso (é usado o menor tempo). Padrão é 3.
+
+    Returns:
+        pl.DataFrame:
+        Tabela com o caso, a escala, a quantidade de repetições, o tempo (s), o pico
+        de memória (MB) e o erro dos casos que falharam (ou cujas entradas não
+        puderam ser preparadas). Casos acima da sua quantidade máxima de linhas não
+        são executados.
+    """
+    resultados: list[dict] = []
+    for escala in escalas:
+        linhas = ESCALAS[escala]
+        casos_escala = [caso for caso in casos if linhas <= CASOS[caso][1]]
+        try:
+            entradas = _executar_python("--preparar", str(linhas))
+        except RuntimeError as e:
+            print(f"{escala:>5}: erro ao preparar as entradas ({e})", file=sys.stderr)
+            resultados.extend(
+                {
+                    "caso": caso,
+                    "escala": escala,
+                    "repeticoes": repeticoes,
+                    "erro": f"erro ao preparar as entradas: {e}",
+                }
+                for caso in casos_escala
+            )
+            continue
+
+        for caso in casos_escala:
+            print(f"{escala:>5} {caso}...", file=sys.stderr, flush=True)
+            try:
+                medicao = json.loads(
+                    _executar_python(
+                        "--caso",
+                        caso,
+                        "--linhas",
+                        str(linhas),
+                        "--entradas",
+                        entradas,
+                        "--repeticoes",
+                        str(repeticoes),
+                    )
+                )
+            except RuntimeError as e:
+                print(f"{escala:>5} {caso}: erro ({e})", file=sys.stderr)
+                medicao = {"erro": str(e)}
+            resultados.append(
+                {"caso": caso, "escala": escala, "repeticoes": repeticoes, **medicao}
+            )
+
+    return pl.DataFrame(
+        resultados,
+        schema={
+            "caso": pl.String,
+            "escala": pl.String,
+            "repeticoes": pl.Int64,
+            "tempo_s": pl.Float64,
+            "pico_mb": pl.Float64,
+            "erro": pl.String,
+        },
+    )
+
+
+def comparar(
+    resultados: pl.DataFrame,
+    baseline: pl.DataFrame,
+    tolerancia_tempo: float = TOLERANCIA_TEMPO,
+    tolerancia_memoria: float = TOLERANCIA_MEMORIA,
+) -> pl.DataFrame:
+    """
+    Compara os resultados com a linha de base e indica as regressões: tempo ou pico
+    de memória acima da linha de base mais a tolerância (e acima da diferença mínima).
+    O tempo só é comparado quando a quantidade de repetições é a mesma da linha de
+    base: com menos repetições, o menor tempo inclui o aquecimento do caso (por
+    exemplo, a criação dos geradores do Faker).
+
+    Args:
+        resultados (pl.DataFrame):
+        Resultados de `executar`.
+
+        baseline (pl.DataFrame):
+        Linha de base, no mesmo formato.
+
+        tolerancia_tempo (float, optional):
+        Aumento relativo de tempo tolerado. Padrão é `TOLERANCIA_TEMPO`.
+
+        tolerancia_memoria (float, optional):
+        Aumento relativo de memória tolerado. Padrão é `TOLERANCIA_MEMORIA`.
+
+    Returns:
+        pl.DataFrame:
+        Resultados com os valores da linha de base, as razões e a coluna "regressao".
+    """
+    return (
+        resultados.drop("erro")
+        .join(baseline, on=["caso", "escala"], how="left", suffix="_baseline")
+        .with_columns(
+            (pl.col("tempo_s") / pl.col("tempo_s_baseline")).alias("razao_tempo"),
+            (pl.col("pico_mb") / pl.col("pico_mb_baseline")).alias("razao_memoria"),
+        )
+        .with_columns(
+            (
+                (
+                    (pl.col("repeticoes") == pl.col("repeticoes_baseline"))
+                    & (pl.col("razao_tempo") > 1 + tolerancia_tempo)
+                    & (
+                        pl.col("tempo_s") - pl.col("tempo_s_baseline")
+                        > DIFERENCA_MINIMA_S
+                    )
+                )
+                | (
+                    (pl.col("razao_memoria") > 1 + tolerancia_memoria)
+                    & (
+                        pl.col("pico_mb") - pl.col("pico_mb_baseline")
+                        > DIFERENCA_MINIMA_MB
+                    )
+                )
+            )
+            .fill_null(False)
+            .alias("regressao")
+        )
+    )
+
+
+def ler_baseline(arquivo: Path = ARQUIVO_BASELINE) -> pl.DataFrame:
+    """
+    Lê a linha de base gravada por `salvar_baseline`.
+    """
+    return pl.DataFrame(
+        json.loads(arquivo.read_text(encoding="utf-8"))["resultados"],
+        schema={
+            "caso": pl.String,
+            "escala": pl.String,
+            "repeticoes": pl.Int64,
+            "tempo_s": pl.Float64,
+            "pico_mb": pl.Float64,
+        },
+    )
+
+
+def salvar_baseline(resultados: pl.DataFrame, arquivo: Path = ARQUIVO_BASELINE) -> None:
+    """
+    Grava os resultados como linha de base, junto com a descrição da máquina.
+    Resultados de escalas não executadas agora são mantidos.
+    """
+    resultados = resultados.drop("erro", strict=False)
+    if arquivo.exists():
+        resultados = pl.concat(
+            [
+                ler_baseline(arquivo).join(
+                    resultados, on=["caso", "escala"], how="anti"
+                ),
+                resultados,
+            ]
+        )
+
+    conteudo = {
+        "maquina": {
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "sistema": platform.platform(),
+            "processador": platform.machine(),
+        },
+        "resultados": resultados.sort("escala", "caso").to_dicts(),
+    }
+    arquivo.write_text(json.dumps(conteudo, indent=2) + "\n", encoding="utf-8")
+
+
+# endregion
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--escalas", nargs="+", choices=ESCALAS, default=["1k", "100k"])
+    parser.add_argument("--casos", nargs="+", choices=CASOS, default=list(CASOS))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=ARQUIVO_BASELINE)
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--tolerancia-tempo", type=float, default=TOLERANCIA_TEMPO)
+    parser.add_argument("--tolerancia-memoria", type=float, default=TOLERANCIA_MEMORIA)
+    # Argumentos internos, usados nos processos de cada caso
+    parser.add_argument("--preparar", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--caso", choices=CASOS, help=argparse.SUPPRESS)
+    parser.add_argument("--linhas", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--entradas", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.preparar is not None:
+        print(preparar_entradas(args.preparar))
+        sys.exit(0)
+
+    if args.caso is not None:
+        medicao = medir_caso(args.caso, args.linhas, args.entradas, args.repeticoes)
+        print(json.dumps(medicao))
+        sys.exit(0)
+
+    resultados = executar(args.escalas, args.casos, args.repeticoes)
+
+    falhas = resultados.filter(pl.col("erro").is_not_null())
+    if not falhas.is_empty():
+        with pl.Config(tbl_rows=-1, tbl_width_chars=200, fmt_str_lengths=200):
+            print(falhas.select("caso", "escala", "erro"))
+        print(f"{falhas.height} caso(s) falharam.")
+        sys.exit(1)
+
+    if args.salvar_baseline:
+        salvar_baseline(resultados, args.baseline)
+        print(f"Linha de base gravada em {args.baseline}")
+        sys.exit(0)
+
+    if not args.baseline.exists():
+        print(resultados)
+        print(f"Linha de base não encontrada: {args.baseline} (use --salvar-baseline)")
+        sys.exit(0)
+
+    comparacao = comparar(
+        resultados,
+        ler_baseline(args.baseline),
+        args.tolerancia_tempo,
+        args.tolerancia_memoria,
+    )
+    with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200):
+        print(comparacao)
+
+    repeticoes_diferentes = comparacao.filter(
+        pl.col("repeticoes") != pl.col("repeticoes_baseline")
+    )
+    if not repeticoes_diferentes.is_empty():
+        print(
+            f"{repeticoes_diferentes.height} caso(s) com quantidade de repetições "
+            "diferente da linha de base: o tempo não foi comparado."
+        )
+
+    regressoes = comparacao.filter(pl.col("regressao"))
+    if not regressoes.is_empty():
+        print(f"{regressoes.height} regressão(ões) acima da tolerância.")
+        sys.exit(1)
@@ -0,0 +1,166 @@
+"""
+Benchmark da política de tipos (`tools.esquemas`) nas tabelas geradas.
+
+Para projetos, serviços e tickets, compara o tamanho em memória de cada coluna com os
+tipos da política (`pl.Enum`, `pl.Categorical` e chaves inteiras) e com as colunas
+textuais (incluindo os códigos formatados, como PROJ0000000012). Em seguida, compara o
+tempo dos filtros `is_in`, do join e dos agrupamentos usados pelas páginas nas duas
+versões dos dados.
+
+Uso (a partir da pasta src):
+    python -m benchmarks.bench_esquema --linhas 1000000
+"""
+
+import argparse
+import time
+import polars as pl
+
+from collections.abc import Callable
+from datetime import datetime
+from mockup_data.faker_data_generation import (
+    gerar_dados_analistas_df,
+    gerar_dados_projeto_df,
+    gerar_dados_tickets_df,
+    gerar_servicos_projeto_df,
+)
+from tools.esquemas import relatorio_memoria, remover_esquema
+from tools.extrato_dados import enriquecer_servicos
+from tools.tickets_dados import calcular_indicadores, tickets_por_analista_status
+
+DATA_REFERENCIA: datetime = datetime(2026, 1, 1)
+QTD_ANALISTAS: int = 20
+
+
+def gerar_tabelas(linhas: int) -> dict[str, pl.DataFrame]:
+    """
+    Gera as tabelas de projetos, serviços e tickets com os tipos da política.
+    """
+    df_projetos = gerar_dados_projeto_df(
+        qtd_itens=400,
+        qtd_projetos=400,
+        qtd_clientes=500,
+        seed=0,
+        data_referencia=DATA_REFERENCIA,
+    ).unique("ID Projeto", keep="first", maintain_order=True)
+
+    return {
+        "projetos": df_projetos,
+        "servicos": gerar_servicos_projeto_df(
+            df_projetos=df_projetos,
+            qtd_linhas=linhas,
+            qtd_servicos=500,
+            seed=0,
+            data_referencia=DATA_REFERENCIA,
+        ),
+        "tickets": gerar_dados_tickets_df(
+            qtd=max(linhas // QTD_ANALISTAS, 1),
+            df_analistas=gerar_dados_analistas_df(qtd=QTD_ANALISTAS, seed=0),
+            seed=0,
+            data_referencia=DATA_REFERENCIA,
+        ),
+    }
+
+
+def medir(funcao: Callable[[], object], repeticoes: int) -> float:
+    """
+    Retorna o menor tempo, em ms, entre as repetições da função.
+    """
+    tempos: list[float] = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1_000
+
+
+def operacoes(
+    tabelas: dict[str, pl.DataFrame],
+) -> dict[str, Callable[[dict[str, pl.DataFrame]], object]]:
+    """
+    Operações medidas, cada uma recebendo as tabelas (com ou sem a política de tipos).
+    Os valores dos filtros são sorteados uma única vez, a partir dos dados.
+    """
+    responsaveis = (
+        tabelas["servicos"]["Responsável pelo Serviço"].unique().sort().head(5)
+    ).to_list()
+    clientes = tabelas["projetos"]["Nome Cliente"].unique().sort().head(5).to_list()
+
+    return {
+        "is_in Responsável pelo Serviço": lambda t: t["servicos"].filter(
+            pl.col("Responsável pelo Serviço").is_in(responsaveis)
+        ),
+        "is_in Status Ticket": lambda t: t["tickets"].filter(
+            pl.col("Status Ticket").is_in(["Aberto", "Pendente"])
+        ),
+        "join serviços x projetos": lambda t: enriquecer_servicos(
+            t["servicos"].lazy(), t["projetos"].lazy()
+        ).collect(),
+        "join + is_in Nome Cliente": lambda t: enriquecer_servicos(
+            t["servicos"].lazy(), t["projetos"].lazy()
+        )
+        .filter(pl.col("Nome Cliente").is_in(clientes))
+        .collect(),
+        "group_by Descrição Serviço": lambda t: t["servicos"]
+        .group_by("Descrição Serviço")
+        .agg(pl.col("QTD Horas").sum()),
+        "group_by Analista, Status": lambda t: tickets_por_analista_status(
+            t["tickets"]
+        ),
+        "indicadores dos tickets": lambda t: calcular_indicadores(
+            t["tickets"], DATA_REFERENCIA
+        ),
+    }
+
+
+def executar(linhas: int, repeticoes: int = 5) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Executa o benchmark e retorna o relatório de memória e o relatório de tempo.
+
+    Args:
+        linhas (int):
+        Quantidade de serviços e de tickets gerados.
+
+        repeticoes (int, optional):
+        Quantidade de repetições de cada operação. Padrão é 5.
+
+    Returns:
+        tuple[pl.DataFrame, pl.DataFrame]:
+        Relatório de memória por tabela e coluna, e tempo de cada operação com as
+        colunas textuais e com a política de tipos.
+    """
+    tabelas = gerar_tabelas(linhas)
+    tabelas_texto = {nome: remover_esquema(df) for nome, df in tabelas.items()}
+
+    memoria = pl.concat(
+        relatorio_memoria(df).select(pl.lit(nome).alias("Tabela"), pl.all())
+        for nome, df in tabelas.items()
+    )
+
+    tempos = pl.DataFrame(
+        [
+            (
+                nome,
+                medir(lambda: operacao(tabelas_texto), repeticoes),
+                medir(lambda: operacao(tabelas), repeticoes),
+            )
+            for nome, operacao in operacoes(tabelas).items()
+        ],
+        schema=["Operação", "Texto (ms)", "Política (ms)"],
+        orient="row",
+    ).with_columns(
+        (pl.col("Texto (ms)") / pl.col("Política (ms)")).alias("Aceleração (x)")
+    )
+
+    return memoria, tempos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    memoria, tempos = executar(args.linhas, args.repeticoes)
+    with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200, float_precision=2):
+        print(memoria)
+        print(tempos)
@@ -0,0 +1,133 @@
+"""
+Benchmark dos formatos de exportação do Extrato de Serviços.
+
+Compara o tempo de escrita e o tamanho do arquivo de cada formato com o xlsx gerado
+por `salvar_xlsx`.
+
+Uso (a partir da pasta src):
+    python -m benchmarks.bench_exportacao --linhas 100000
+"""
+
+import argparse
+import time
+import polars as pl
+
+from collections.abc import Callable
+from datetime import datetime
+from io import BytesIO
+from mockup_data.faker_data_generation import (
+    gerar_dados_projeto_df,
+    gerar_servicos_projeto_df,
+)
+from tools.data_tools import (
+    COMPRESSOES_PARQUET,
+    salvar_csv,
+    salvar_ipc,
+    salvar_parquet,
+    salvar_xlsx,
+)
+from tools.esquemas import formatar_codigos
+from tools.extrato_dados import enriquecer_servicos
+
+
+def gerar_extrato(qtd_linhas: int, seed: int = 0) -> pl.DataFrame:
+    """
+    Gera um extrato de serviços enriquecido com aproximadamente `qtd_linhas` linhas,
+    com os códigos formatados como nos arquivos exportados pela página.
+    """
+    df_projetos = gerar_dados_projeto_df(
+        qtd_itens=200,
+        qtd_projetos=400,
+        qtd_clientes=500,
+        seed=seed,
+        data_referencia=datetime(2026, 1, 1),
+    ).unique("ID Projeto")
+    df_servicos = gerar_servicos_projeto_df(
+        df_projetos=df_projetos,
+        qtd_linhas=qtd_linhas,
+        qtd_servicos=500,
+        seed=seed,
+        data_referencia=datetime(2026, 1, 1),
+    )
+    return formatar_codigos(
+        enriquecer_servicos(df_servicos.lazy(), df_projetos.lazy()).collect()
+    )
+
+
+def medir(
+    funcao: Callable[[pl.DataFrame], BytesIO], df: pl.DataFrame, repeticoes: int
+) -> tuple[float, int]:
+    """
+    Retorna o menor tempo de escrita (em segundos) e o tamanho do arquivo (em bytes).
+    """
+    tempos: list[float] = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        arquivo = funcao(df)
+        tempos.append(time.perf_counter() - inicio)
+
+    arquivo.seek(0, 2)
+    return min(tempos), arquivo.tell()
+
+
+def executar(qtd_linhas: int, repeticoes: int = 3) -> pl.DataFrame:
+    """
+    Executa o benchmark e retorna uma tabela com o tempo e o tamanho de cada formato,
+    também relativos ao xlsx.
+
+    Args:
+        qtd_linhas (int):
+        Quantidade de linhas do extrato.
+
+        repeticoes (int, optional):
+        Quantidade de repetições de cada formato (é usado o menor tempo). Padrão é 3.
+
+    Returns:
+        pl.DataFrame:
+        Resultado do benchmark.
+    """
+    df = gerar_extrato(qtd_linhas)
+
+    formatos: dict[str, Callable[[pl.DataFrame], BytesIO]] = {
+        "xlsx": lambda df: salvar_xlsx(df, streaming=False),
+        "xlsx (streaming)": lambda df: salvar_xlsx(df, streaming=True),
+        "csv": salvar_csv,
+        "arrow ipc": salvar_ipc,
+        "arrow ipc (zstd)": lambda df: salvar_ipc(df, compressao="zstd"),
+    }
+    formatos |= {
+        f"parquet ({compressao})": lambda df, compressao=compressao: salvar_parquet(
+            df, compressao=compressao
+        )
+        for compressao in COMPRESSOES_PARQUET
+    }
+
+    resultados = [
+        (formato, *medir(funcao, df, repeticoes))
+        for formato, funcao in formatos.items()
+    ]
+
+    return (
+        pl.DataFrame(
+            resultados,
+            schema=["Formato", "Tempo (s)", "Tamanho (bytes)"],
+            orient="row",
+        )
+        .with_columns(
+            (pl.col("Tempo (s)") / pl.col("Tempo (s)").first()).alias("Tempo / xlsx"),
+            (pl.col("Tamanho (bytes)") / pl.col("Tamanho (bytes)").first()).alias(
+                "Tamanho / xlsx"
+            ),
+        )
+        .with_columns(pl.lit(df.height).alias("Linhas"))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200):
+        print(executar(args.linhas, args.repeticoes))
@@ -0,0 +1,230 @@
+"""
+Benchmark do tempo de importação (cold start) das páginas do projeto.
+
+As páginas são lidas do `main.py` e, para cada uma, as importações de nível superior
+(as que são executadas sempre que a página é aberta pela primeira vez no processo) são
+executadas em um novo interpretador com `python -X importtime`. A saída é interpretada
+para obter o tempo total e os módulos mais lentos de cada página.
+
+Cada página tem um orçamento para o tempo de importação sem o Streamlit, e as
+bibliotecas importadas somente quando necessárias (`MODULOS_TARDIOS`) não podem ser
+carregadas pelas importações de nível superior. O script termina com código de saída 1
+quando alguma página ultrapassa o orçamento ou carrega uma dessas bibliotecas.
+
+Uso (a partir da pasta src):
+    python -m benchmarks.bench_importacao --repeticoes 5
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import polars as pl
+
+from pathlib import Path
+
+PASTA_SRC: Path = Path(__file__).resolve().parents[1]
+
+# Orçamento do tempo de importação de cada página sem o Streamlit (ms). Páginas sem
+# orçamento usam o orçamento padrão.
+ORCAMENTO_PADRAO_MS: float = 50.0
+ORCAMENTOS_MS: dict[str, float] = {
+    "app_pages/portifolio/extrato_servicos.py": 350.0,
+    "app_pages/portifolio/controle_tickets.py": 400.0,
+}
+
+# Bibliotecas importadas somente no primeiro uso (geração de dados, gráficos e
+# exportação), que não podem ser carregadas ao abrir as páginas
+MODULOS_TARDIOS: tuple[str, ...] = ("faker", "altair", "xlsxwriter", "pyarrow")
+
+# Código que exibe os pacotes carregados no interpretador
+_LISTAR_MODULOS: str = (
+    "import sys; print(*{nome.split('.')[0] for nome in sys.modules})"
+)
+
+
+def paginas_app(main: Path = PASTA_SRC / "main.py") -> list[Path]:
+    """
+    Retorna os arquivos das páginas registradas com `st.Page` no `main.py`.
+
+    Args:
+        main (Path, optional):
+        Arquivo principal do projeto. Padrão é o `main.py` da pasta src.
+
+    Returns:
+        list[Path]:
+        Arquivos das páginas.
+    """
+    return [
+        (main.parent / no.args[0].value).resolve()
+        for no in ast.walk(ast.parse(main.read_text(encoding="utf-8")))
+        if isinstance(no, ast.Call)
+        and isinstance(no.func, ast.Attribute)
+        and no.func.attr == "Page"
+        and no.args
+        and isinstance(no.args[0], ast.Constant)
+    ]
+
+
+def importacoes_pagina(pagina: Path) -> str:
+    """
+    Retorna o código das importações de nível superior da página. Importações feitas
+    dentro de funções ou blocos (importações tardias) não são incluídas.
+    """
+    arvore = ast.parse(pagina.read_text(encoding="utf-8"))
+    return "\n".join(
+        ast.unparse(no)
+        for no in arvore.body
+        if isinstance(no, (ast.Import, ast.ImportFrom))
+    )
+
+
+def interpretar_importtime(saida: str) -> dict[str, int]:
+    """
+    Interpreta a saída de `-X importtime` e retorna o tempo acumulado, em
+    microssegundos, de cada módulo importado diretamente (sem os submódulos).
+
+    Args:
+        saida (str):
+        Saída de erro (stderr) do interpretador.
+
+    Returns:
+        dict[str, int]:
+        Dicionário com o nome e o tempo acumulado de cada módulo.
+    """
+    modulos: dict[str, int] = {}
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = linha.removeprefix("import time:").split("|")
+        if not nome.startswith("  "):  # submódulos são indentados
+            modulos[nome.strip()] = int(acumulado)
+    return modulos
+
+
+def medir_importacao(codigo: str) -> dict[str, int]:
+    """
+    Executa o código em um novo interpretador com `-X importtime` e retorna o tempo
+    acumulado de cada módulo importado diretamente.
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=PASTA_SRC,
+        env=os.environ | {"PYTHONPATH": str(PASTA_SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return interpretar_importtime(resultado.stderr)
+
+
+def modulos_tardios_carregados(codigo: str) -> list[str]:
+    """
+    Executa o código em um novo interpretador e retorna os módulos de
+    `MODULOS_TARDIOS` carregados por ele, inclusive indiretamente.
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-c", f"{codigo}\n{_LISTAR_MODULOS}"],
+        cwd=PASTA_SRC,
+        env=os.environ | {"PYTHONPATH": str(PASTA_SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    carregados = set(resultado.stdout.split())
+    return [modulo for modulo in MODULOS_TARDIOS if modulo in carregados]
+
+
+def executar(repeticoes: int = 5, qtd_modulos: int = 3) -> pl.DataFrame:
+    """
+    Executa o benchmark e retorna uma tabela com o tempo de importação de cada página.
+    É usada a repetição mais rápida de cada página.
+
+    Args:
+        repeticoes (int, optional):
+        Quantidade de repetições por página. Padrão é 5.
+
+        qtd_modulos (int, optional):
+        Quantidade de módulos mais lentos listados por página. Padrão é 3.
+
+    Returns:
+        pl.DataFrame:
+        Resultado do benchmark, com o tempo total, o tempo do Streamlit, o tempo da
+        página sem o Streamlit, o orçamento, os módulos mais lentos, os módulos de
+        `MODULOS_TARDIOS` carregados e se a página atendeu ao orçamento.
+    """
+    # Módulos importados na inicialização do interpretador (site, encodings...) não
+    # fazem parte do tempo das páginas
+    interpretador = medir_importacao("pass").keys()
+
+    resultados: list[tuple] = []
+    for pagina in paginas_app():
+        codigo = importacoes_pagina(pagina)
+        modulos = min(
+            (
+                {
+                    nome: tempo
+                    for nome, tempo in medir_importacao(codigo).items()
+                    if nome not in interpretador
+                }
+                for _ in range(repeticoes)
+            ),
+            key=lambda modulos: sum(modulos.values()),
+        )
+
+        total = sum(modulos.values())
+        streamlit = modulos.pop("streamlit", 0)
+        mais_lentos = sorted(modulos.items(), key=lambda item: -item[1])[:qtd_modulos]
+        nome_pagina = pagina.relative_to(PASTA_SRC).as_posix()
+        orcamento = ORCAMENTOS_MS.get(nome_pagina, ORCAMENTO_PADRAO_MS)
+        tardios = modulos_tardios_carregados(codigo)
+
+        resultados.append(
+            (
+                nome_pagina,
+                total / 1_000,
+                streamlit / 1_000,
+                (total - streamlit) / 1_000,
+                orcamento,
+                ", ".join(
+                    f"{nome} ({tempo / 1_000:.0f})" for nome, tempo in mais_lentos
+                ),
+                ", ".join(tardios),
+                not tardios and (total - streamlit) / 1_000 <= orcamento,
+            )
+        )
+
+    return pl.DataFrame(
+        resultados,
+        schema=[
+            "Página",
+            "Total (ms)",
+            "Streamlit (ms)",
+            "Página (ms)",
+            "Orçamento (ms)",
+            "Módulos mais lentos (ms)",
+            "Importações tardias",
+            "Dentro do Orçamento",
+        ],
+        orient="row",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--modulos", type=int, default=3)
+    args = parser.parse_args()
+
+    resultado = executar(args.repeticoes, args.modulos)
+    with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200, fmt_str_lengths=100):
+        print(resultado)
+
+    fora_orcamento = resultado.filter(~pl.col("Dentro do Orçamento"))
+    if not fora_orcamento.is_empty():
+        print(
+            f"{fora_orcamento.height} página(s) fora do orçamento ou com importações "
+            "tardias carregadas."
+        )
+        sys.exit(1)
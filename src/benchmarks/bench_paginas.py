@@ -0,0 +1,268 @@
+"""
+Benchmark da latência de execução (rerun) das páginas do projeto.
+
+Cada página registrada no `main.py` é aberta pela navegação do app em uma sessão
+simulada (`streamlit.testing.v1.AppTest`), sem navegador. Em seguida, as interações
+típicas da página (botão "Gerar Novos Dados", filtros, seleção de analistas...) são
+repetidas e o tempo de cada execução é medido. O resultado traz a primeira execução
+(cold start), os percentis 50 e 95 das demais, e a quantidade de elementos exibidos.
+
+A API do RandomUser.me e as fotos dos analistas são servidas por um servidor local
+(`verificacoes.servidor_local`), para que o resultado não dependa da rede.
+
+Cada página tem um orçamento de latência (p95). O script termina com código de saída 1
+quando alguma página ultrapassa o orçamento ou gera uma exceção.
+
+Uso (a partir da pasta src):
+    python -m benchmarks.bench_paginas --ciclos 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import polars as pl
+
+from collections.abc import Callable
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block, Node
+from benchmarks.bench_importacao import PASTA_SRC, paginas_app
+from tools.esquemas import PREFIXOS_CODIGO
+from verificacoes.servidor_local import ServidorLocal
+
+TIMEOUT_EXECUCAO: float = 120.0
+
+# Orçamento de latência (p95 das execuções após a primeira, em ms) de cada página.
+# Páginas sem orçamento usam o orçamento padrão.
+ORCAMENTO_PADRAO_MS: float = 500.0
+ORCAMENTOS_MS: dict[str, float] = {
+    "app_pages/inicio/sobre.py": 100.0,
+    "app_pages/portifolio/extrato_servicos.py": 400.0,
+    "app_pages/portifolio/controle_tickets.py": 1_000.0,
+    "app_pages/projetos_pessoais/streamglitch.py": 800.0,
+    "app_pages/projetos_pessoais/sapo_saver.py": 100.0,
+}
+
+
+# region Interações
+def _widget(widgets, label: str):
+    """
+    Retorna o widget com o rótulo informado.
+    """
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def _selecionar(at: AppTest, label: str, qtd: int) -> None:
+    """
+    Seleciona as `qtd` primeiras opções do multiselect da barra lateral.
+    """
+    multiselect = _widget(at.sidebar.multiselect, label)
+    multiselect.set_value(multiselect.options[:qtd])
+
+
+def _selecionar_codigos(at: AppTest, label: str, coluna: str, qtd: int) -> None:
+    """
+    Seleciona os `qtd` primeiros códigos do multiselect da barra lateral. As opções
+    exibidas são os códigos formatados, e os valores do widget são as chaves inteiras.
+    """
+    multiselect = _widget(at.sidebar.multiselect, label)
+    prefixo = PREFIXOS_CODIGO[coluna]
+    multiselect.set_value(
+        [int(opcao.removeprefix(prefixo)) for opcao in multiselect.options[:qtd]]
+    )
+
+
+def _alternar_analistas(at: AppTest, label: str) -> None:
+    """
+    Alterna o toggle de cada analista selecionado.
+    """
+    for toggle in at.toggle:
+        if toggle.label == label:
+            toggle.set_value(not toggle.value)
+
+
+# Interações de cada página, executadas em ordem a cada ciclo. Páginas sem interações
+# são somente executadas novamente.
+Interacao = tuple[str, Callable[[AppTest], None]]
+INTERACOES: dict[str, list[Interacao]] = {
+    "app_pages/inicio/sobre.py": [
+        ("Idioma en-US", lambda at: at.sidebar.radio[0].set_value("en-US")),
+        ("Idioma pt-BR", lambda at: at.sidebar.radio[0].set_value("pt-BR")),
+    ],
+    "app_pages/portifolio/extrato_servicos.py": [
+        ("Filtrar clientes", lambda at: _selecionar(at, "Nome do Cliente", 3)),
+        (
+            "Filtrar projetos",
+            lambda at: _selecionar_codigos(
+                at, "Código do Projeto", "Projeto Vinculado", 2
+            ),
+        ),
+        ("Filtrar serviços", lambda at: _selecionar(at, "Descrição Serviço", 2)),
+        (
+            "Limpar projetos",
+            lambda at: _selecionar_codigos(
+                at, "Código do Projeto", "Projeto Vinculado", 0
+            ),
+        ),
+        ("Limpar serviços", lambda at: _selecionar(at, "Descrição Serviço", 0)),
+        ("Limpar clientes", lambda at: _selecionar(at, "Nome do Cliente", 0)),
+        (
+            "Gerar Novos Dados",
+            lambda at: _widget(at.sidebar.button, "Gerar Novos Dados").click(),
+        ),
+    ],
+    "app_pages/portifolio/controle_tickets.py": [
+        ("Selecionar analistas", lambda at: _selecionar(at, "Analista", 3)),
+        ("Mais de 15 dias", lambda at: _alternar_analistas(at, "Mais de 15 dias")),
+        ("Em atendimento", lambda at: _alternar_analistas(at, "Em atendimento")),
+        ("Limpar analistas", lambda at: _selecionar(at, "Analista", 0)),
+        (
+            "Gerar Novos Dados",
+            lambda at: _widget(at.sidebar.button, "Gerar Novos Dados").click(),
+        ),
+    ],
+}
+# endregion
+
+
+# region Medição
+def contar_elementos(no: Node) -> int:
+    """
+    Retorna a quantidade de elementos exibidos abaixo do nó (sem contar os blocos de
+    layout, como colunas e abas).
+    """
+    if isinstance(no, Block):
+        return sum(contar_elementos(filho) for filho in no.children.values())
+    return 1
+
+
+def executar_pagina(pagina: str, ciclos: int) -> dict:
+    """
+    Abre a página em uma nova sessão e mede a primeira execução e as execuções
+    seguintes às interações.
+
+    Args:
+        pagina (str):
+        Caminho da página, relativo à pasta src.
+
+        ciclos (int):
+        Quantidade de vezes que as interações da página são repetidas.
+
+    Returns:
+        dict:
+        Dicionário com a página, o tempo da primeira execução e das demais (ms), a
+        quantidade de elementos exibidos e as exceções geradas.
+    """
+    at = AppTest.from_file(
+        str(PASTA_SRC / "main.py"), default_timeout=TIMEOUT_EXECUCAO
+    )
+    at.switch_page(pagina)
+
+    inicio = time.perf_counter()
+    at.run()
+    primeira_ms = (time.perf_counter() - inicio) * 1_000
+    excecoes = [excecao.value for excecao in at.exception]
+
+    latencias: list[float] = []
+    interacoes = INTERACOES.get(pagina, [("Executar novamente", lambda at: None)])
+    for _ in range(ciclos):
+        for nome, interagir in interacoes:
+            if excecoes:
+                break
+            interagir(at)
+            inicio = time.perf_counter()
+            at.run()
+            latencias.append((time.perf_counter() - inicio) * 1_000)
+            excecoes = [f"{nome}: {excecao.value}" for excecao in at.exception]
+
+    return {
+        "pagina": pagina,
+        "primeira_ms": primeira_ms,
+        "latencias_ms": latencias,
+        "elementos": contar_elementos(at.main) + contar_elementos(at.sidebar),
+        "excecoes": excecoes,
+    }
+
+
+def executar(ciclos: int = 5) -> pl.DataFrame:
+    """
+    Executa o benchmark em todas as páginas do `main.py`.
+
+    Args:
+        ciclos (int, optional):
+        Quantidade de vezes que as interações de cada página são repetidas. Padrão
+        é 5.
+
+    Returns:
+        pl.DataFrame:
+        Resultado do benchmark, com a primeira execução, a quantidade de execuções,
+        os percentis 50 e 95, o orçamento, a quantidade de elementos, as exceções e
+        se a página atendeu ao orçamento.
+    """
+    resultados: list[tuple] = []
+    for arquivo in paginas_app():
+        pagina = arquivo.relative_to(PASTA_SRC).as_posix()
+        print(f"{pagina}...", file=sys.stderr, flush=True)
+        medicao = executar_pagina(pagina, ciclos)
+
+        latencias = pl.Series(medicao["latencias_ms"], dtype=pl.Float64)
+        orcamento = ORCAMENTOS_MS.get(pagina, ORCAMENTO_PADRAO_MS)
+        p95 = latencias.quantile(0.95, interpolation="linear")
+        resultados.append(
+            (
+                pagina,
+                medicao["primeira_ms"],
+                latencias.len(),
+                latencias.quantile(0.5, interpolation="linear"),
+                p95,
+                orcamento,
+                medicao["elementos"],
+                "; ".join(medicao["excecoes"]),
+                not medicao["excecoes"] and p95 is not None and p95 <= orcamento,
+            )
+        )
+
+    return pl.DataFrame(
+        resultados,
+        schema=[
+            ("Página", pl.String),
+            ("Primeira (ms)", pl.Float64),
+            ("Execuções", pl.Int64),
+            ("p50 (ms)", pl.Float64),
+            ("p95 (ms)", pl.Float64),
+            ("Orçamento p95 (ms)", pl.Float64),
+            ("Elementos", pl.Int64),
+            ("Exceções", pl.String),
+            ("Dentro do Orçamento", pl.Boolean),
+        ],
+        orient="row",
+    )
+
+
+# endregion
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ciclos", type=int, default=5)
+    args = parser.parse_args()
+
+    # Cache em disco vazio: a primeira execução inclui a geração dos dados, e os
+    # conjuntos gerados pelo benchmark não ficam no cache do app
+    os.environ.setdefault("PORTFOLIO_CACHE_DIR", tempfile.mkdtemp(prefix="bench_"))
+    # O app é executado a partir da raiz do projeto (`streamlit run src/main.py`), e
+    # algumas páginas leem arquivos com caminhos relativos a ela
+    os.chdir(PASTA_SRC.parent)
+
+    # As páginas leem o endereço da API ao importar `tools.api_data`, por isso ele é
+    # definido antes da primeira execução
+    with ServidorLocal() as servidor:
+        os.environ["RANDOM_USER_URL"] = servidor.url
+        resultado = executar(args.ciclos)
+    with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200, fmt_str_lengths=100):
+        print(resultado)
+
+    fora_orcamento = resultado.filter(~pl.col("Dentro do Orçamento"))
+    if not fora_orcamento.is_empty():
+        print(f"{fora_orcamento.height} página(s) fora do orçamento ou com exceções.")
+        sys.exit(1)
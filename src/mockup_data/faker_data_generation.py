@@ -2,13 +2,199 @@
 Este script gera dados sintéticos (não reais) para serem utilizados neste projeto.
 """
 
+import os
+import numpy as np
 import polars as pl
 import random
-from faker import Faker
 from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from tools.esquemas import (
+    ESQUEMA_PROJETOS,
+    ESQUEMA_SERVICOS,
+    ESQUEMA_TICKETS,
+    aplicar_esquema,
+)
 
-fk_en: Faker = Faker("en_US")
-fk_br: Faker = Faker("pt_BR")
+if TYPE_CHECKING:
+    from faker import Faker
+
+
+@lru_cache(maxsize=None)
+def obter_faker(locale: str) -> "Faker":
+    """
+    Retorna a instância do Faker do idioma, criada somente no primeiro uso. A geração
+    colunar e a leitura do cache em disco não usam o Faker, então a biblioteca só é
+    importada quando necessária.
+
+    Args:
+        locale (str):
+        Idioma do Faker, por exemplo "pt_BR" ou "en_US".
+
+    Returns:
+        Faker:
+        Instância do Faker do idioma.
+    """
+    from faker import Faker
+
+    return Faker(locale)
+
+
+# region Pools de Valores
+# Os campos textuais são amostrados de pools gerados uma única vez por processo, em vez
+# de usar `fk_br.unique`, cujo conjunto de valores já vistos cresce a cada nova geração
+# de dados e nunca é liberado. A memória usada pelos pools é fixa.
+TAMANHO_POOL: int = 2_000
+
+CAMPOS_POOL: dict[str, tuple[str, str]] = {
+    "nome": ("pt_BR", "name"),
+    "empresa": ("pt_BR", "company"),
+    "palavra": ("en_US", "word"),
+    "descricao": ("en_US", "text"),
+}
+
+
+@lru_cache(maxsize=None)
+def pool_valores(campo: str) -> np.ndarray:
+    """
+    Retorna o pool de valores únicos de um campo, gerado na primeira chamada.
+    O Faker usado é próprio do pool e tem semente fixa, então o pool é o mesmo em
+    qualquer processo.
+
+    Args:
+        campo (str):
+        Nome do campo, uma das chaves de `CAMPOS_POOL`.
+
+    Returns:
+        np.ndarray:
+        Array com os valores únicos do pool.
+    """
+    from faker import Faker
+
+    locale, metodo = CAMPOS_POOL[campo]
+    fk: Faker = Faker(locale)
+    fk.seed_instance(0)
+
+    gerador = getattr(fk, metodo)
+    if metodo == "text":
+        valores = (gerador(max_nb_chars=60) for _ in range(TAMANHO_POOL))
+    else:
+        valores = (gerador() for _ in range(TAMANHO_POOL))
+
+    return np.array(list(dict.fromkeys(valores)), dtype=object)
+
+
+def amostrar_valores(campo: str, qtd: int, rng: np.random.Generator) -> pl.Series:
+    """
+    Sorteia `qtd` valores do pool do campo, com reposição.
+
+    Args:
+        campo (str):
+        Nome do campo, uma das chaves de `CAMPOS_POOL`.
+
+        qtd (int):
+        Quantidade de valores a serem sorteados.
+
+        rng (np.random.Generator):
+        Gerador de números aleatórios.
+
+    Returns:
+        pl.Series:
+        Série com os valores sorteados.
+    """
+    pool = pool_valores(campo)
+    return pl.Series(pool[rng.integers(0, len(pool), qtd)], dtype=pl.String)
+
+
+def amostrar_unicos(campo: str, qtd: int, rng: np.random.Generator) -> pl.Series:
+    """
+    Sorteia `qtd` valores distintos do pool do campo, por meio de uma permutação.
+    Quando `qtd` é maior que o pool, os valores são repetidos com o sufixo
+    " - Filial N", o que mantém a unicidade sem aumentar o pool.
+
+    Args:
+        campo (str):
+        Nome do campo, uma das chaves de `CAMPOS_POOL`.
+
+        qtd (int):
+        Quantidade de valores a serem sorteados.
+
+        rng (np.random.Generator):
+        Gerador de números aleatórios.
+
+    Returns:
+        pl.Series:
+        Série com os valores sorteados, sem repetições.
+    """
+    pool = pool_valores(campo)
+    rodadas = -(-qtd // len(pool)) if qtd else 1
+    idx = rng.choice(len(pool) * rodadas, qtd, replace=False)
+
+    valores = pl.Series(pool[idx % len(pool)], dtype=pl.String)
+    filial = pl.Series(idx // len(pool) + 1)
+
+    return (
+        pl.select(
+            pl.when(filial > 1)
+            .then(pl.concat_str(pl.lit(valores), pl.lit(" - Filial "), pl.lit(filial)))
+            .otherwise(pl.lit(valores))
+        )
+        .to_series()
+        .rename(campo)
+    )
+
+
+def gerar_cnpjs_unicos(qtd: int, rng: np.random.Generator) -> pl.Series:
+    """
+    Gera `qtd` CNPJs válidos e distintos (matriz, "0001"), com dígitos verificadores
+    calculados de forma vetorizada.
+
+    Args:
+        qtd (int):
+        Quantidade de CNPJs a serem gerados.
+
+        rng (np.random.Generator):
+        Gerador de números aleatórios.
+
+    Returns:
+        pl.Series:
+        Série com os CNPJs formatados (XX.XXX.XXX/0001-XX).
+    """
+    raiz = rng.choice(10**8, qtd, replace=False)
+
+    digitos = np.zeros((qtd, 14), dtype=np.int64)
+    for i in range(8):
+        digitos[:, 7 - i] = raiz // 10**i % 10
+    digitos[:, 11] = 1
+
+    for posicao, pesos in (
+        (12, [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]),
+        (13, [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]),
+    ):
+        resto = digitos[:, :posicao] @ np.array(pesos) % 11
+        digitos[:, posicao] = np.where(resto < 2, 0, 11 - resto)
+
+    raiz_str = pl.Series(raiz).cast(pl.String).str.zfill(8)
+    dv = pl.Series(digitos[:, 12] * 10 + digitos[:, 13]).cast(pl.String).str.zfill(2)
+
+    return (
+        pl.select(
+            pl.concat_str(
+                pl.lit(raiz_str).str.slice(0, 2),
+                pl.lit("."),
+                pl.lit(raiz_str).str.slice(2, 3),
+                pl.lit("."),
+                pl.lit(raiz_str).str.slice(5, 3),
+                pl.lit("/0001-"),
+                pl.lit(dv),
+            )
+        )
+        .to_series()
+        .rename("cnpj")
+    )
+
+
+# endregion
 
 
 # region Extrato Serviços
@@ -41,16 +227,20 @@ def gerar_dados_projeto(
     Returns:
         list[dict]: Retorna uma lista de dicionários com os dados gerados.
     """
+    rng = np.random.default_rng()
+    nomes_clientes = amostrar_unicos("empresa", qtd_itens, rng).to_list()
+    cnpjs_clientes = gerar_cnpjs_unicos(qtd_itens, rng).to_list()
+
     return [
         {
             "ID Projeto": "PROJ" + str(random.randint(1, qtd_projetos)).zfill(10),
-            "Nome Projeto": " ".join(fk_en.words(3)).title(),
-            "Data Criação Projeto": fk_br.date_time_between(
+            "Nome Projeto": " ".join(obter_faker("en_US").words(3)).title(),
+            "Data Criação Projeto": obter_faker("pt_BR").date_time_between(
                 start_date="-5y", end_date="now"
             ),
             "ID Cliente": "CLI" + str(random.randint(1, qtd_clientes)).zfill(10),
-            "Nome Cliente": fk_br.unique.company(),
-            "CNPJ Cliente": fk_br.unique.cnpj(),
+            "Nome Cliente": nomes_clientes[i],
+            "CNPJ Cliente": cnpjs_clientes[i],
             "Taxa/Hora Contratada": random.randint(50, 500),
         }
         for i in range(qtd_itens)
@@ -85,10 +275,10 @@ def gerar_servicos_projeto(
     return {
         "Projeto Vinculado": projeto["ID Projeto"],
         "ID Serviço": "SERV" + str(random.randint(1, qtd_servicos)).zfill(10),
-        "Descrição Serviço": fk_en.text(max_nb_chars=60),
-        "Responsável pelo Serviço": fk_br.name(),
+        "Descrição Serviço": obter_faker("en_US").text(max_nb_chars=60),
+        "Responsável pelo Serviço": obter_faker("pt_BR").name(),
         "QTD Horas": random.randint(1, 10),
-        "Data Serviço": fk_br.date_time_between(
+        "Data Serviço": obter_faker("pt_BR").date_time_between(
             start_date=projeto["Data Criação Projeto"], end_date="now"
         ),
     }
@@ -97,7 +287,218 @@ def gerar_servicos_projeto(
 # endregion
 
 
+# region Extrato Serviços - Colunar
+# Geração em lote: cada coluna é montada de uma só vez com arrays aleatórios do NumPy,
+# e os campos textuais são amostrados dos pools, sem chamar o Faker linha a linha.
+# Usada para gerar grandes volumes de dados.
+def _datas_entre(
+    rng: np.random.Generator, inicio: np.ndarray, fim: np.datetime64
+) -> np.ndarray:
+    """
+    Sorteia, para cada data inicial, uma data uniforme entre ela e a data final.
+
+    Args:
+        rng (np.random.Generator):
+        Gerador de números aleatórios.
+
+        inicio (np.ndarray):
+        Array de datas iniciais (datetime64[us]).
+
+        fim (np.datetime64):
+        Data final comum a todas as linhas.
+
+    Returns:
+        np.ndarray:
+        Array de datas sorteadas (datetime64[us]).
+    """
+    intervalo = (fim - inicio).astype(np.int64)
+    deslocamento = (rng.random(len(inicio)) * intervalo).astype(np.int64)
+    return inicio + deslocamento.astype("timedelta64[us]")
+
+
+def gerar_dados_projeto_df(
+    qtd_itens: int = 50,
+    qtd_projetos: int = 20,
+    qtd_clientes: int = 20,
+    seed: int | None = None,
+    data_referencia: datetime | None = None,
+) -> pl.DataFrame:
+    """
+    Versão colunar de `gerar_dados_projeto`, que retorna diretamente um DataFrame.
+    Mantém as mesmas colunas e faixas de valores, com os tipos de `ESQUEMA_PROJETOS`.
+    Os códigos de projeto e cliente são chaves inteiras, formatadas somente na
+    exibição (`tools.esquemas.formatar_codigos`).
+
+    Args:
+        qtd_itens (int, optional):
+        Quantidade de itens para serem gerados. Padrão é 50.
+
+        qtd_projetos (int, optional):
+        Quantidade de projetos únicos para serem gerados. Padrão é 20.
+
+        qtd_clientes (int, optional):
+        Quantidade de clientes únicos para serem gerados. Padrão é 20.
+
+        seed (int | None, optional):
+        Semente do gerador aleatório. Padrão é None (aleatória).
+
+        data_referencia (datetime | None, optional):
+        Data usada como "agora" no sorteio das datas. Padrão é None (data atual).
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com os dados gerados.
+    """
+    rng = np.random.default_rng(seed)
+    agora = np.datetime64(data_referencia or datetime.now(), "us")
+    inicio = agora - np.timedelta64(5 * 365, "D")
+
+    data_criacao = _datas_entre(rng, np.full(qtd_itens, inicio), agora)
+
+    return pl.DataFrame(
+        {
+            "ID Projeto": rng.integers(1, qtd_projetos + 1, qtd_itens),
+            "Nome Projeto": amostrar_valores("palavra", qtd_itens, rng)
+            + " "
+            + amostrar_valores("palavra", qtd_itens, rng)
+            + " "
+            + amostrar_valores("palavra", qtd_itens, rng),
+            "Data Criação Projeto": data_criacao,
+            "ID Cliente": rng.integers(1, qtd_clientes + 1, qtd_itens),
+            "Nome Cliente": amostrar_unicos("empresa", qtd_itens, rng),
+            "CNPJ Cliente": gerar_cnpjs_unicos(qtd_itens, rng),
+            "Taxa/Hora Contratada": rng.integers(50, 501, qtd_itens),
+        }
+    ).with_columns(
+        pl.col("Nome Projeto").str.to_titlecase(),
+    ).pipe(aplicar_esquema, ESQUEMA_PROJETOS)
+
+
+def gerar_servicos_projeto_df(
+    df_projetos: pl.DataFrame,
+    qtd_linhas: int | None = None,
+    qtd_servicos: int = 20,
+    seed: int | None = None,
+    data_referencia: datetime | None = None,
+) -> pl.DataFrame:
+    """
+    Versão colunar de `gerar_servicos_projeto`, que gera os serviços de vários
+    projetos de uma só vez e retorna diretamente um DataFrame.
+    Mantém as mesmas colunas e faixas de valores, com os tipos de `ESQUEMA_SERVICOS`.
+    Os códigos de projeto e serviço são chaves inteiras, formatadas somente na
+    exibição (`tools.esquemas.formatar_codigos`).
+
+    Args:
+        df_projetos (pl.DataFrame):
+        DataFrame de projetos, no formato de `gerar_dados_projeto_df`.
+
+        qtd_linhas (int | None, optional):
+        Quantidade de serviços para serem gerados, distribuídos aleatoriamente entre
+        os projetos. Padrão é None (um serviço por projeto).
+
+        qtd_servicos (int, optional):
+        Quantidade de códigos de serviço únicos. Padrão é 20.
+
+        seed (int | None, optional):
+        Semente do gerador aleatório. Padrão é None (aleatória).
+
+        data_referencia (datetime | None, optional):
+        Data usada como "agora" no sorteio das datas. Padrão é None (data atual).
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com os dados gerados.
+    """
+    rng = np.random.default_rng(seed)
+    agora = np.datetime64(data_referencia or datetime.now(), "us")
+
+    if qtd_linhas is None:
+        qtd_linhas = df_projetos.height
+        idx_projeto = np.arange(qtd_linhas)
+    else:
+        idx_projeto = rng.integers(0, df_projetos.height, qtd_linhas)
+
+    projetos = df_projetos.select("ID Projeto", "Data Criação Projeto")[idx_projeto]
+    data_servico = _datas_entre(
+        rng,
+        projetos["Data Criação Projeto"].to_numpy().astype("datetime64[us]"),
+        agora,
+    )
+
+    return pl.DataFrame(
+        {
+            "Projeto Vinculado": projetos["ID Projeto"],
+            "ID Serviço": rng.integers(1, qtd_servicos + 1, qtd_linhas),
+            "Descrição Serviço": amostrar_valores("descricao", qtd_linhas, rng),
+            "Responsável pelo Serviço": amostrar_valores("nome", qtd_linhas, rng),
+            "QTD Horas": rng.integers(1, 11, qtd_linhas),
+            "Data Serviço": data_servico,
+        }
+    ).pipe(aplicar_esquema, ESQUEMA_SERVICOS)
+
+
+# endregion
+
+
 # region Controle Tickets
+# Endereço das fotos dos analistas gerados localmente. Usa a mesma variável de ambiente
+# de `tools.api_data.URL_RANDOM_USER`, sem importar o cliente HTTP.
+URL_FOTOS_ANALISTAS: str = os.environ.get("RANDOM_USER_URL", "https://randomuser.me")
+
+
+def gerar_dados_analistas_df(qtd: int = 10, seed: int | None = None) -> pl.DataFrame:
+    """
+    Gera analistas localmente, com as mesmas colunas dos analistas obtidos do site
+    RandomUser.me (Foto, Analista, Email Empresarial e Telefone). Usada enquanto os
+    analistas da API não estão disponíveis.
+
+    Args:
+        qtd (int, optional):
+        Quantidade de analistas para serem gerados. Padrão é 10.
+
+        seed (int | None, optional):
+        Semente do gerador aleatório. Padrão é None (aleatória).
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com os dados gerados.
+    """
+    rng = np.random.default_rng(seed)
+
+    return pl.DataFrame(
+        {
+            "Analista": amostrar_unicos("nome", qtd, rng),
+            "Genero": np.array(["men", "women"])[rng.integers(0, 2, qtd)],
+            "Numero Foto": rng.integers(0, 100, qtd),
+            "DDD": rng.integers(11, 100, qtd),
+            "Telefone": rng.integers(0, 100_000_000, qtd),
+        }
+    ).select(
+        pl.concat_str(
+            pl.lit(f"{URL_FOTOS_ANALISTAS}/api/portraits/"),
+            pl.col("Genero"),
+            pl.lit("/"),
+            pl.col("Numero Foto"),
+            pl.lit(".jpg"),
+        ).alias("Foto"),
+        pl.col("Analista"),
+        (
+            pl.col("Analista")
+            .str.normalize("NFKD")
+            .str.replace_all(r"[^A-Za-z ]", "")
+            .str.to_lowercase()
+            .str.replace_all(" ", ".")
+            + "@example.com"
+        ).alias("Email Empresarial"),
+        pl.format(
+            "({}) {}-{}",
+            pl.col("DDD"),
+            pl.col("Telefone").cast(pl.String).str.zfill(8).str.slice(0, 4),
+            pl.col("Telefone").cast(pl.String).str.zfill(8).str.slice(4),
+        ).alias("Telefone"),
+    )
+
+
 def gerar_dados_tickets(
     qtd: int = 10, df_analistas: pl.DataFrame = pl.DataFrame()
 ) -> list[dict]:
@@ -120,11 +521,16 @@ def gerar_dados_tickets(
         Retorna uma lista de dicionários com os dados gerados.
     """
     dados_tickets: list[dict] = []
+    clientes = amostrar_unicos(
+        "empresa", qtd * len(df_analistas), np.random.default_rng()
+    ).to_list()
 
     for i in range(qtd):
         for analista in df_analistas["Analista"]:
-            data_criacao = fk_br.date_time_between(start_date="-3M", end_date="now")
-            data_atualizacao = fk_br.date_time_between(
+            data_criacao = obter_faker("pt_BR").date_time_between(
+                start_date="-3M", end_date="now"
+            )
+            data_atualizacao = obter_faker("pt_BR").date_time_between(
                 start_date=data_criacao, end_date="now"
             )
             dados_tickets.append(
@@ -134,13 +540,67 @@ def gerar_dados_tickets(
                     "Data Atualização Ticket": data_atualizacao,
                     "Status Ticket": random.choice(["Pendente", "Aberto", "Concluído"]),
                     "Analista": analista,
-                    "Cliente": fk_br.unique.company(),
+                    "Cliente": clientes[len(dados_tickets)],
                 }
             )
 
     return dados_tickets
 
 
+def gerar_dados_tickets_df(
+    qtd: int = 10,
+    df_analistas: pl.DataFrame = pl.DataFrame(),
+    seed: int | None = None,
+    data_referencia: datetime | None = None,
+) -> pl.DataFrame:
+    """
+    Versão colunar de `gerar_dados_tickets`, que retorna diretamente um DataFrame.
+    Mantém as mesmas colunas e faixas de valores, com os tipos de `ESQUEMA_TICKETS`.
+
+    Args:
+        qtd (int, optional):
+        Quantidade de tickets por analista. Padrão é 10.
+
+        df_analistas (pl.DataFrame, optional):
+        DataFrame de analistas, com a coluna "Analista".
+
+        seed (int | None, optional):
+        Semente do gerador aleatório. Padrão é None (aleatória).
+
+        data_referencia (datetime | None, optional):
+        Data usada como "agora" no sorteio das datas. Padrão é None (data atual).
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com os dados gerados.
+    """
+    rng = np.random.default_rng(seed)
+    agora = np.datetime64(data_referencia or datetime.now(), "us")
+    analistas = np.tile(df_analistas["Analista"].to_numpy(), qtd)
+    qtd_linhas = len(analistas)
+
+    data_criacao = _datas_entre(
+        rng, np.full(qtd_linhas, agora - np.timedelta64(90, "D")), agora
+    )
+
+    return pl.DataFrame(
+        {
+            "ID Ticket": rng.integers(1000, 3000, qtd_linhas),
+            "Data Criação Ticket": data_criacao,
+            "Data Atualização Ticket": _datas_entre(rng, data_criacao, agora),
+            "Status Ticket": np.array(["Pendente", "Aberto", "Concluído"])[
+                rng.integers(0, 3, qtd_linhas)
+            ],
+            "Analista": pl.Series(analistas, dtype=pl.String),
+            "Cliente": amostrar_unicos("empresa", qtd_linhas, rng),
+        }
+    ).with_columns(
+        pl.concat_str(pl.lit("TKT"), pl.col("ID Ticket").cast(pl.String)).alias(
+            "ID Ticket"
+        )
+    ).pipe(aplicar_esquema, ESQUEMA_TICKETS)
+
+
 # endregion
 
 if __name__ == "__main__":
@@ -0,0 +1,316 @@
+"""
+Este script divide a geração de dados sintéticos em lotes (chunks), para gerar grandes
+volumes de dados em paralelo, usando vários processos, ou em streaming, gravando os
+lotes em arquivos Parquet sem manter todo o conjunto de dados em memória.
+
+Cada lote recebe uma semente derivada da semente principal, e o tamanho dos lotes não
+depende da quantidade de processos. Assim, a mesma semente principal gera sempre o
+mesmo conjunto de dados, independente da quantidade de processos usados.
+"""
+
+import argparse
+import multiprocessing as mp
+import numpy as np
+import polars as pl
+
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+from mockup_data.faker_data_generation import (
+    gerar_dados_projeto_df,
+    gerar_servicos_projeto_df,
+)
+
+TAMANHO_LOTE: int = 1_000_000
+
+ARQUIVO_PROJETOS: str = "projetos.parquet"
+ARQUIVO_SERVICOS: str = "servicos.parquet"
+
+
+# region Planejamento
+def planejar_lotes(
+    qtd_linhas: int, seed: int, tamanho_lote: int = TAMANHO_LOTE
+) -> list[tuple[int, int]]:
+    """
+    Divide a quantidade de linhas em lotes de tamanho fixo e deriva uma semente para
+    cada lote a partir da semente principal.
+
+    Args:
+        qtd_linhas (int):
+        Quantidade total de linhas.
+
+        seed (int):
+        Semente principal.
+
+        tamanho_lote (int, optional):
+        Quantidade de linhas por lote. Padrão é `TAMANHO_LOTE`.
+
+    Returns:
+        list[tuple[int, int]]:
+        Lista com a quantidade de linhas e a semente de cada lote.
+    """
+    qtd_lotes = -(-qtd_linhas // tamanho_lote)
+    tamanhos = [tamanho_lote] * (qtd_lotes - 1) + [
+        qtd_linhas - tamanho_lote * (qtd_lotes - 1)
+    ]
+    sementes = [
+        int(semente.generate_state(1)[0])
+        for semente in np.random.SeedSequence(seed).spawn(qtd_lotes)
+    ]
+
+    return list(zip(tamanhos, sementes)) if qtd_linhas > 0 else []
+
+
+# endregion
+
+
+# region Geração Paralela
+def _gerar_lote_servicos(
+    df_projetos: pl.DataFrame,
+    lote: tuple[int, int],
+    qtd_servicos: int,
+    data_referencia: datetime,
+) -> pl.DataFrame:
+    """
+    Gera um lote de serviços. Executada nos processos do pool.
+    """
+    qtd_linhas, seed = lote
+    return gerar_servicos_projeto_df(
+        df_projetos=df_projetos,
+        qtd_linhas=qtd_linhas,
+        qtd_servicos=qtd_servicos,
+        seed=seed,
+        data_referencia=data_referencia,
+    )
+
+
+def gerar_servicos_paralelo(
+    df_projetos: pl.DataFrame,
+    qtd_linhas: int,
+    qtd_servicos: int = 20,
+    seed: int = 0,
+    qtd_processos: int | None = None,
+    tamanho_lote: int = TAMANHO_LOTE,
+    data_referencia: datetime | None = None,
+) -> pl.DataFrame:
+    """
+    Gera serviços em paralelo, com um lote por tarefa em um pool de processos.
+    Os lotes são concatenados sem cópia (sem `rechunk`).
+
+    Args:
+        df_projetos (pl.DataFrame):
+        DataFrame de projetos, no formato de `gerar_dados_projeto_df`.
+
+        qtd_linhas (int):
+        Quantidade total de serviços para serem gerados.
+
+        qtd_servicos (int, optional):
+        Quantidade de códigos de serviço únicos. Padrão é 20.
+
+        seed (int, optional):
+        Semente principal. Padrão é 0.
+
+        qtd_processos (int | None, optional):
+        Quantidade de processos. Padrão é None (quantidade de CPUs). Com 1 processo,
+        os lotes são gerados no próprio processo.
+
+        tamanho_lote (int, optional):
+        Quantidade de linhas por lote. Padrão é `TAMANHO_LOTE`.
+
+        data_referencia (datetime | None, optional):
+        Data usada como "agora" no sorteio das datas. Padrão é None (data atual).
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com os serviços gerados.
+    """
+    lotes = planejar_lotes(qtd_linhas, seed, tamanho_lote)
+    argumentos = (
+        repeat(df_projetos),
+        lotes,
+        repeat(qtd_servicos),
+        repeat(data_referencia or datetime.now()),
+    )
+
+    if not lotes:
+        return gerar_servicos_projeto_df(df_projetos, qtd_linhas=0)
+
+    if qtd_processos == 1 or len(lotes) == 1:
+        partes = list(map(_gerar_lote_servicos, *argumentos))
+    else:
+        # "spawn" evita herdar o pool de threads do Polars via fork
+        with ProcessPoolExecutor(
+            max_workers=qtd_processos, mp_context=mp.get_context("spawn")
+        ) as executor:
+            partes = list(executor.map(_gerar_lote_servicos, *argumentos))
+
+    return pl.concat(partes, rechunk=False)
+
+
+# endregion
+
+
+# region Geração em Streaming
+def gerar_servicos_em_lotes(
+    df_projetos: pl.DataFrame,
+    qtd_linhas: int,
+    qtd_servicos: int = 20,
+    seed: int = 0,
+    tamanho_lote: int = TAMANHO_LOTE,
+    data_referencia: datetime | None = None,
+) -> Iterator[pl.DataFrame]:
+    """
+    Gera serviços lote a lote, com no máximo `tamanho_lote` linhas em memória.
+    Os lotes são os mesmos de `gerar_servicos_paralelo` para a mesma semente.
+
+    Args:
+        df_projetos (pl.DataFrame):
+        DataFrame de projetos, no formato de `gerar_dados_projeto_df`.
+
+        qtd_linhas (int):
+        Quantidade total de serviços para serem gerados.
+
+        qtd_servicos (int, optional):
+        Quantidade de códigos de serviço únicos. Padrão é 20.
+
+        seed (int, optional):
+        Semente principal. Padrão é 0.
+
+        tamanho_lote (int, optional):
+        Quantidade de linhas por lote. Padrão é `TAMANHO_LOTE`.
+
+        data_referencia (datetime | None, optional):
+        Data usada como "agora" no sorteio das datas. Padrão é None (data atual).
+
+    Yields:
+        pl.DataFrame:
+        Lote de serviços gerados.
+    """
+    data_referencia = data_referencia or datetime.now()
+
+    for lote in planejar_lotes(qtd_linhas, seed, tamanho_lote):
+        yield _gerar_lote_servicos(df_projetos, lote, qtd_servicos, data_referencia)
+
+
+def salvar_dados_parquet(
+    diretorio: str | Path,
+    qtd_itens: int = 50,
+    qtd_projetos: int = 20,
+    qtd_clientes: int = 20,
+    qtd_linhas: int = 1_000,
+    qtd_servicos: int = 20,
+    seed: int = 0,
+    tamanho_lote: int = TAMANHO_LOTE,
+    data_referencia: datetime | None = None,
+) -> Path:
+    """
+    Gera projetos e serviços e grava em arquivos Parquet no diretório informado.
+    Os serviços são gravados em streaming, um row group por lote, então a memória
+    usada é limitada pelo tamanho do lote e não pela quantidade total de linhas.
+
+    Os arquivos podem ser lidos sob demanda com `pl.scan_parquet`.
+
+    Args:
+        diretorio (str | Path):
+        Diretório onde os arquivos serão gravados.
+
+        qtd_itens (int, optional):
+        Quantidade de projetos para serem gerados. Padrão é 50.
+
+        qtd_projetos (int, optional):
+        Quantidade de códigos de projeto únicos. Padrão é 20.
+
+        qtd_clientes (int, optional):
+        Quantidade de códigos de cliente únicos. Padrão é 20.
+
+        qtd_linhas (int, optional):
+        Quantidade total de serviços para serem gerados. Padrão é 1.000.
+
+        qtd_servicos (int, optional):
+        Quantidade de códigos de serviço únicos. Padrão é 20.
+
+        seed (int, optional):
+        Semente principal. Padrão é 0.
+
+        tamanho_lote (int, optional):
+        Quantidade de linhas por lote. Padrão é `TAMANHO_LOTE`.
+
+        data_referencia (datetime | None, optional):
+        Data usada como "agora" no sorteio das datas. Padrão é None (data atual).
+
+    Returns:
+        Path:
+        Diretório onde os arquivos foram gravados.
+    """
+    import pyarrow.parquet as pq  # usado somente na gravação dos arquivos
+
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    data_referencia = data_referencia or datetime.now()
+
+    df_projetos = gerar_dados_projeto_df(
+        qtd_itens=qtd_itens,
+        qtd_projetos=qtd_projetos,
+        qtd_clientes=qtd_clientes,
+        seed=seed,
+        data_referencia=data_referencia,
+    )
+    df_projetos.write_parquet(diretorio / ARQUIVO_PROJETOS)
+
+    writer: pq.ParquetWriter | None = None
+    try:
+        for lote in gerar_servicos_em_lotes(
+            df_projetos=df_projetos,
+            qtd_linhas=qtd_linhas,
+            qtd_servicos=qtd_servicos,
+            seed=seed,
+            tamanho_lote=tamanho_lote,
+            data_referencia=data_referencia,
+        ):
+            tabela = lote.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    diretorio / ARQUIVO_SERVICOS, tabela.schema, compression="zstd"
+                )
+            writer.write_table(tabela)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        gerar_servicos_projeto_df(df_projetos, qtd_linhas=0).write_parquet(
+            diretorio / ARQUIVO_SERVICOS
+        )
+
+    return diretorio
+
+
+# endregion
+
+if __name__ == "__main__":
+    # Exemplo: python -m mockup_data.geracao_lotes ./dados --linhas 100000000
+    parser = argparse.ArgumentParser(
+        description="Gera projetos e serviços sintéticos em arquivos Parquet."
+    )
+    parser.add_argument("diretorio", type=Path)
+    parser.add_argument("--itens", type=int, default=200)
+    parser.add_argument("--projetos", type=int, default=400)
+    parser.add_argument("--clientes", type=int, default=500)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--servicos", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE)
+    args = parser.parse_args()
+
+    salvar_dados_parquet(
+        diretorio=args.diretorio,
+        qtd_itens=args.itens,
+        qtd_projetos=args.projetos,
+        qtd_clientes=args.clientes,
+        qtd_linhas=args.linhas,
+        qtd_servicos=args.servicos,
+        seed=args.seed,
+        tamanho_lote=args.tamanho_lote,
+    )
@@ -2,13 +2,262 @@
 Este script contém utilitários para acessar APIs externas e extrair dados.
 """
 
+import os
+import random
+import threading
+import time
 import requests as r
 import polars as pl
 
+from functools import lru_cache
+from io import BytesIO
+from requests.adapters import HTTPAdapter
+
+# region Cliente HTTP
+# Cliente compartilhado por todas as sessões, com pool de conexões, tempos limite,
+# novas tentativas com espera aleatória (jitter) e um disjuntor (circuit breaker) que
+# falha imediatamente depois de erros seguidos, sem bloquear a página esperando uma API
+# fora do ar.
+TIMEOUT_CONEXAO: float = 3.05
+TIMEOUT_LEITURA: float = 10.0
+TENTATIVAS: int = 3
+ESPERA_BASE: float = 0.5
+ESPERA_MAXIMA: float = 4.0
+FALHAS_DISJUNTOR: int = 5
+TEMPO_DISJUNTOR_ABERTO: float = 30.0
+TAMANHO_POOL_CONEXOES: int = 10
+
+_STATUS_NOVA_TENTATIVA: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitoAberto(r.RequestException):
+    """
+    Erro lançado quando o disjuntor está aberto e a requisição não é feita.
+    """
+
+
+class Disjuntor:
+    """
+    Disjuntor (circuit breaker): depois de `limite_falhas` falhas seguidas, as
+    requisições falham imediatamente durante `tempo_aberto` segundos. Passado esse
+    tempo, uma nova requisição é permitida; se falhar, o disjuntor abre novamente.
+
+    Args:
+        limite_falhas (int, optional):
+        Quantidade de falhas seguidas para abrir o disjuntor. Padrão é
+        `FALHAS_DISJUNTOR`.
+
+        tempo_aberto (float, optional):
+        Tempo, em segundos, que o disjuntor fica aberto. Padrão é
+        `TEMPO_DISJUNTOR_ABERTO`.
+    """
+
+    def __init__(
+        self,
+        limite_falhas: int = FALHAS_DISJUNTOR,
+        tempo_aberto: float = TEMPO_DISJUNTOR_ABERTO,
+    ):
+        self.limite_falhas: int = limite_falhas
+        self.tempo_aberto: float = tempo_aberto
+        self._falhas: int = 0
+        self._aberto_ate: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def aberto(self) -> bool:
+        """
+        Indica se o disjuntor está aberto (requisições bloqueadas).
+        """
+        with self._lock:
+            return time.monotonic() < self._aberto_ate
+
+    def verificar(self) -> None:
+        """
+        Lança `CircuitoAberto` se o disjuntor estiver aberto.
+        """
+        with self._lock:
+            restante = self._aberto_ate - time.monotonic()
+        if restante > 0:
+            raise CircuitoAberto(
+                f"Disjuntor aberto após falhas seguidas, nova tentativa em "
+                f"{restante:.1f}s"
+            )
+
+    def registrar_sucesso(self) -> None:
+        """
+        Fecha o disjuntor e zera a contagem de falhas.
+        """
+        with self._lock:
+            self._falhas = 0
+            self._aberto_ate = 0.0
+
+    def registrar_falha(self) -> None:
+        """
+        Conta uma falha e abre o disjuntor ao atingir o limite.
+        """
+        with self._lock:
+            self._falhas += 1
+            if self._falhas >= self.limite_falhas:
+                self._aberto_ate = time.monotonic() + self.tempo_aberto
+
+
+class ClienteHttp:
+    """
+    Cliente HTTP com pool de conexões (`requests.Session`), tempos limite de conexão e
+    leitura, novas tentativas com espera exponencial aleatória e disjuntor.
+
+    Args:
+        timeout (tuple[float, float], optional):
+        Tempo limite de conexão e de leitura, em segundos. Padrão é
+        (`TIMEOUT_CONEXAO`, `TIMEOUT_LEITURA`).
+
+        tentativas (int, optional):
+        Quantidade máxima de tentativas por requisição. Padrão é `TENTATIVAS`.
+
+        espera_base (float, optional):
+        Espera base, em segundos, entre as tentativas. A espera máxima dobra a cada
+        tentativa e a espera usada é sorteada entre zero e esse máximo. Padrão é
+        `ESPERA_BASE`.
+
+        espera_maxima (float, optional):
+        Limite da espera entre as tentativas, em segundos. Padrão é `ESPERA_MAXIMA`.
+
+        disjuntor (Disjuntor | None, optional):
+        Disjuntor usado pelo cliente. Padrão é None (um novo disjuntor).
+    """
+
+    def __init__(
+        self,
+        timeout: tuple[float, float] = (TIMEOUT_CONEXAO, TIMEOUT_LEITURA),
+        tentativas: int = TENTATIVAS,
+        espera_base: float = ESPERA_BASE,
+        espera_maxima: float = ESPERA_MAXIMA,
+        disjuntor: Disjuntor | None = None,
+    ):
+        self.timeout: tuple[float, float] = timeout
+        self.tentativas: int = tentativas
+        self.espera_base: float = espera_base
+        self.espera_maxima: float = espera_maxima
+        self.disjuntor: Disjuntor = disjuntor or Disjuntor()
+
+        adaptador = HTTPAdapter(
+            pool_connections=TAMANHO_POOL_CONEXOES,
+            pool_maxsize=TAMANHO_POOL_CONEXOES,
+        )
+        self.sessao: r.Session = r.Session()
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+
+    def _espera(self, tentativa: int) -> float:
+        """
+        Espera antes da próxima tentativa (full jitter).
+        """
+        return random.uniform(
+            0, min(self.espera_maxima, self.espera_base * 2**tentativa)
+        )
+
+    def get(self, url: str, **kwargs) -> r.Response:
+        """
+        Faz uma requisição GET, tentando novamente em erros de conexão, tempo limite
+        e respostas 429/5xx.
+
+        Args:
+            url (str):
+            URL da requisição.
+
+            **kwargs:
+            Argumentos repassados para `requests.Session.get`.
+
+        Returns:
+            r.Response:
+            Resposta da requisição, com status de sucesso.
+
+        Raises:
+            CircuitoAberto:
+            Se o disjuntor estiver aberto.
+
+            r.RequestException:
+            Se todas as tentativas falharem.
+        """
+        self.disjuntor.verificar()
+        kwargs.setdefault("timeout", self.timeout)
+
+        for tentativa in range(self.tentativas):
+            try:
+                resposta = self.sessao.get(url, **kwargs)
+                if resposta.status_code not in _STATUS_NOVA_TENTATIVA:
+                    resposta.raise_for_status()
+                    self.disjuntor.registrar_sucesso()
+                    return resposta
+                erro: r.RequestException = r.HTTPError(
+                    f"{resposta.status_code} para a URL: {url}", response=resposta
+                )
+            except (r.ConnectionError, r.Timeout) as e:
+                erro = e
+            except r.HTTPError:
+                # Erros 4xx (exceto 429) não são temporários: sem novas tentativas
+                self.disjuntor.registrar_sucesso()
+                raise
+
+            if tentativa < self.tentativas - 1:
+                time.sleep(self._espera(tentativa))
+
+        self.disjuntor.registrar_falha()
+        raise erro
+
+
+@lru_cache(maxsize=None)
+def obter_cliente() -> ClienteHttp:
+    """
+    Retorna o cliente HTTP do processo, compartilhado entre todas as sessões.
+    """
+    return ClienteHttp()
+
+
+# endregion
+
 # region RandomUser.me
+# Quantidade máxima de usuários por requisição aceita pela API
+MAXIMO_RESULTADOS_RANDOM_USER: int = 5_000
+
+# Endereço da API. Pode ser substituído por um servidor local (por exemplo, nos
+# benchmarks), para que a API e as fotos dos analistas não sejam acessadas pela rede.
+URL_RANDOM_USER: str = os.environ.get("RANDOM_USER_URL", "https://randomuser.me")
+
+# Campos lidos da resposta da API. Os demais campos são ignorados na leitura do JSON.
+SCHEMA_RANDOM_USER: pl.Struct = pl.Struct(
+    {
+        "name": pl.Struct({"first": pl.String, "last": pl.String}),
+        "phone": pl.String,
+        "email": pl.String,
+        "picture": pl.Struct({"large": pl.String}),
+    }
+)
+
+
+def _url_random_user(quantidade: int, seed: str | None) -> str:
+    """
+    Monta a URL da API para a quantidade de usuários e a semente. Lança `ValueError`
+    quando a quantidade está fora do intervalo aceito pela API.
+    """
+    if not 1 <= quantidade <= MAXIMO_RESULTADOS_RANDOM_USER:
+        raise ValueError(
+            f"Quantidade de usuários deve estar entre 1 e "
+            f"{MAXIMO_RESULTADOS_RANDOM_USER}: {quantidade}"
+        )
+
+    url = (
+        f"{URL_RANDOM_USER}/api?nat=br&results={quantidade}"
+        "&inc=name,phone,email,id,picture"
+    )
+    if seed is not None:
+        url += f"&seed={seed}"
+    return url
 
 
-def buscar_dados_random_user(quantidade: int = 5) -> list[dict]:
+def buscar_dados_random_user(
+    quantidade: int = 5, seed: str | None = None
+) -> list[dict]:
     """
     Busca dados de usuários aleatórios no site RandomUser.me.
     Nacionalidade: BR
@@ -23,17 +272,24 @@ def buscar_dados_random_user(quantidade: int = 5) -> list[dict]:
 
     Args:
         quantidade (int, optional):
-        Quantidade de usuários a serem buscados. Padrão é 5.
+        Quantidade de usuários a serem buscados, até
+        `MAXIMO_RESULTADOS_RANDOM_USER`. Padrão é 5.
+
+        seed (str | None, optional):
+        Semente da API, que retorna sempre os mesmos usuários para a mesma semente.
+        Padrão é None (usuários aleatórios).
 
     Returns:
         list[dict]:
         Retorna uma lista de dicionários com os dados de usuários.
-    """
-    url = f"https://randomuser.me/api?nat=br&results={quantidade}&inc=name,phone,email,id,picture"
 
+    Raises:
+        ValueError:
+        Se a quantidade estiver fora do intervalo de 1 a
+        `MAXIMO_RESULTADOS_RANDOM_USER`.
+    """
     try:
-        response = r.get(url)
-        response.raise_for_status()
+        response = obter_cliente().get(_url_random_user(quantidade, seed))
 
         data = response.json()
         return data["results"]
@@ -43,35 +299,99 @@ def buscar_dados_random_user(quantidade: int = 5) -> list[dict]:
         return []
 
 
-def processar_dados_random_user(dados: list[dict]) -> pl.DataFrame:
+def buscar_dados_random_user_df(
+    quantidade: int = 5, seed: str | None = None
+) -> pl.DataFrame:
     """
-    Processa os dados de usuários obtidos do site RandomUser.me.
+    Busca dados de usuários aleatórios no site RandomUser.me e lê a resposta
+    diretamente em um DataFrame, sem criar um dicionário por usuário.
+    Nacionalidade: BR
 
     Args:
-        dados (list[dict]):
-        Lista de dicionários com os dados de usuários.
+        quantidade (int, optional):
+        Quantidade de usuários a serem buscados, até
+        `MAXIMO_RESULTADOS_RANDOM_USER`. Padrão é 5.
+
+        seed (str | None, optional):
+        Semente da API, que retorna sempre os mesmos usuários para a mesma semente.
+        Padrão é None (usuários aleatórios).
 
     Returns:
         pl.DataFrame:
-        Retorna um DataFrame com os dados processados.
+        DataFrame no formato de `processar_dados_random_user`. Vazio se a busca
+        falhar.
+
+    Raises:
+        ValueError:
+        Se a quantidade estiver fora do intervalo de 1 a
+        `MAXIMO_RESULTADOS_RANDOM_USER`.
+    """
+    try:
+        response = obter_cliente().get(_url_random_user(quantidade, seed))
+        return processar_corpo_random_user(response.content)
+
+    except r.RequestException as e:
+        print(f"Erro ao buscar dados: {e}")
+        return processar_dados_random_user([])
+
+
+def _colunas_random_user() -> list[pl.Expr]:
+    """
+    Expressões que extraem as colunas dos usuários (lidos no formato de
+    `SCHEMA_RANDOM_USER`) e calculam o nome do analista, em uma única seleção.
     """
+    nome = pl.col("name").struct.field("first")
+    sobrenome = pl.col("name").struct.field("last")
+
+    return [
+        nome.alias("Nome"),
+        sobrenome.alias("Sobrenome"),
+        pl.col("phone").alias("Telefone"),
+        pl.col("email").alias("Email Empresarial"),
+        pl.col("picture").struct.field("large").alias("Foto"),
+        pl.concat_str(nome, sobrenome, separator=" ").alias("Analista"),
+    ]
 
-    dados_processados = []
 
-    for dado in dados:
-        dado_processado = {
-            "Nome": dado["name"]["first"],
-            "Sobrenome": dado["name"]["last"],
-            "Telefone": dado["phone"],
-            "Email Empresarial": dado["email"],
-            "Foto": dado["picture"]["large"],
-        }
+def processar_corpo_random_user(corpo: bytes) -> pl.DataFrame:
+    """
+    Processa a resposta (JSON) da API do site RandomUser.me, lida diretamente pelo
+    Polars, sem passar por objetos Python.
+
+    Args:
+        corpo (bytes):
+        Corpo da resposta da API.
 
-        dados_processados.append(dado_processado)
+    Returns:
+        pl.DataFrame:
+        Retorna um DataFrame no formato de `processar_dados_random_user`.
+    """
+    return (
+        pl.read_json(BytesIO(corpo), schema={"results": pl.List(SCHEMA_RANDOM_USER)})
+        .select(pl.col("results").explode(empty_as_null=False))
+        .unnest("results")
+        .select(_colunas_random_user())
+    )
 
-    df = pl.DataFrame(dados_processados)
 
-    return df
+def processar_dados_random_user(dados: list[dict]) -> pl.DataFrame:
+    """
+    Processa os dados de usuários obtidos do site RandomUser.me.
+
+    Args:
+        dados (list[dict]):
+        Lista de dicionários com os dados de usuários.
+
+    Returns:
+        pl.DataFrame:
+        Retorna um DataFrame com as colunas Nome, Sobrenome, Telefone,
+        Email Empresarial, Foto e Analista (nome e sobrenome).
+    """
+    return (
+        pl.DataFrame({"results": dados}, schema={"results": SCHEMA_RANDOM_USER})
+        .unnest("results")
+        .select(_colunas_random_user())
+    )
 
 
 # endregion
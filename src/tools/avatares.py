@@ -0,0 +1,215 @@
+"""
+Cache local das fotos dos analistas.
+
+As fotos são baixadas uma única vez, em paralelo, redimensionadas para o tamanho em que
+são exibidas e servidas a partir dos bytes em memória. Assim, cada nova execução da
+página (e cada novo usuário) não acessa novamente o site externo.
+
+O tamanho total do cache é limitado: ao ultrapassar o limite, as fotos acessadas há
+mais tempo são removidas (LRU). As URLs cujo download falhou (por exemplo, 404 ou tempo
+limite) também são guardadas, em uma lista limitada, e só são baixadas novamente depois
+de `TEMPO_NOVA_TENTATIVA_AVATAR` segundos.
+
+Os downloads usam um cliente HTTP próprio, com disjuntor próprio: falhas do site das
+fotos não bloqueiam as requisições à API do RandomUser.me, e vice-versa.
+"""
+
+import threading
+import time
+import streamlit as st
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image
+from tools.api_data import ClienteHttp
+
+TAMANHO_AVATAR: int = 180
+LIMITE_AVATARES_BYTES: int = 16 * 2**20
+QTD_THREADS_AVATARES: int = 8
+# Espera máxima, em segundos, por uma foto que ainda está sendo baixada. Depois dela,
+# a página exibe a foto pela URL original e o download continua em segundo plano.
+ESPERA_AVATAR: float = 0.2
+TEMPO_NOVA_TENTATIVA_AVATAR: float = 300.0
+CAPACIDADE_FALHAS_AVATARES: int = 256
+
+
+def redimensionar_avatar(conteudo: bytes, tamanho: int = TAMANHO_AVATAR) -> bytes:
+    """
+    Redimensiona a imagem para caber em um quadrado de `tamanho` pixels, mantendo a
+    proporção (imagens menores não são ampliadas), e converte para JPEG.
+
+    Args:
+        conteudo (bytes):
+        Imagem original.
+
+        tamanho (int, optional):
+        Tamanho máximo, em pixels, da largura e da altura. Padrão é `TAMANHO_AVATAR`.
+
+    Returns:
+        bytes:
+        Imagem redimensionada, em JPEG.
+    """
+    with Image.open(BytesIO(conteudo)) as imagem:
+        imagem = imagem.convert("RGB")
+        imagem.thumbnail((tamanho, tamanho))
+
+        saida = BytesIO()
+        imagem.save(saida, format="JPEG", quality=85)
+
+    return saida.getvalue()
+
+
+class CacheAvatares:
+    """
+    Cache das fotos dos analistas, compartilhado entre as sessões.
+
+    Args:
+        limite_bytes (int, optional):
+        Tamanho máximo do cache, em bytes. Padrão é `LIMITE_AVATARES_BYTES`.
+
+        tamanho (int, optional):
+        Tamanho, em pixels, das fotos. Padrão é `TAMANHO_AVATAR`.
+
+        qtd_threads (int, optional):
+        Quantidade de downloads simultâneos. Padrão é `QTD_THREADS_AVATARES`.
+
+        cliente (ClienteHttp | None, optional):
+        Cliente HTTP usado nos downloads. Padrão é None (um novo cliente, com
+        disjuntor próprio).
+
+        tempo_nova_tentativa (float, optional):
+        Tempo, em segundos, antes de baixar novamente uma foto cujo download falhou.
+        Padrão é `TEMPO_NOVA_TENTATIVA_AVATAR`.
+
+        capacidade_falhas (int, optional):
+        Quantidade máxima de falhas guardadas (LRU). Padrão é
+        `CAPACIDADE_FALHAS_AVATARES`.
+    """
+
+    def __init__(
+        self,
+        limite_bytes: int = LIMITE_AVATARES_BYTES,
+        tamanho: int = TAMANHO_AVATAR,
+        qtd_threads: int = QTD_THREADS_AVATARES,
+        cliente: ClienteHttp | None = None,
+        tempo_nova_tentativa: float = TEMPO_NOVA_TENTATIVA_AVATAR,
+        capacidade_falhas: int = CAPACIDADE_FALHAS_AVATARES,
+    ):
+        self.limite_bytes: int = limite_bytes
+        self.tamanho: int = tamanho
+        self.cliente: ClienteHttp = cliente or ClienteHttp()
+        self.tempo_nova_tentativa: float = tempo_nova_tentativa
+        self.capacidade_falhas: int = capacidade_falhas
+        self._fotos: OrderedDict[str, bytes] = OrderedDict()
+        self._pendentes: dict[str, Future] = {}
+        self._falhas: OrderedDict[str, float] = OrderedDict()
+        self._total_bytes: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=qtd_threads, thread_name_prefix="avatares"
+        )
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        Tamanho total, em bytes, das fotos em cache.
+        """
+        return self._total_bytes
+
+    def _baixar(self, url: str) -> bytes | None:
+        """
+        Baixa e redimensiona a foto, guardando-a no cache. Retorna None em caso de
+        erro, para que a página use a URL original.
+        """
+        try:
+            foto = redimensionar_avatar(self.cliente.get(url).content, self.tamanho)
+        except Exception as e:
+            print(f"Erro ao baixar foto: {e}")
+            foto = None
+
+        with self._lock:
+            self._pendentes.pop(url, None)
+            if foto is None:
+                self._falhas[url] = time.monotonic()
+                self._falhas.move_to_end(url)
+                while len(self._falhas) > self.capacidade_falhas:
+                    self._falhas.popitem(last=False)
+            else:
+                self._falhas.pop(url, None)
+            if foto is not None and url not in self._fotos:
+                self._fotos[url] = foto
+                self._total_bytes += len(foto)
+                while self._total_bytes > self.limite_bytes and len(self._fotos) > 1:
+                    _, removida = self._fotos.popitem(last=False)
+                    self._total_bytes -= len(removida)
+
+        return foto
+
+    def _agendar(self, url: str) -> Future | None:
+        """
+        Agenda o download da foto, caso ainda não esteja em cache nem em andamento e
+        não tenha falhado recentemente. Deve ser chamada com o lock adquirido.
+        """
+        if url in self._fotos:
+            return None
+        falha = self._falhas.get(url)
+        if falha is not None:
+            if time.monotonic() - falha < self.tempo_nova_tentativa:
+                return None
+            del self._falhas[url]
+        if url not in self._pendentes:
+            self._pendentes[url] = self._executor.submit(self._baixar, url)
+        return self._pendentes[url]
+
+    def pre_carregar(self, urls: Iterable[str]) -> None:
+        """
+        Inicia, em segundo plano, o download das fotos que ainda não estão em cache.
+
+        Args:
+            urls (Iterable[str]):
+            URLs das fotos.
+        """
+        with self._lock:
+            for url in urls:
+                self._agendar(url)
+
+    def obter(self, url: str, espera: float = ESPERA_AVATAR) -> bytes | None:
+        """
+        Retorna a foto redimensionada. Caso ainda não esteja em cache, agenda o
+        download e espera por ele no máximo `espera` segundos.
+
+        Args:
+            url (str):
+            URL da foto.
+
+            espera (float, optional):
+            Espera máxima, em segundos, pelo download. Padrão é `ESPERA_AVATAR`.
+
+        Returns:
+            bytes | None:
+            Foto em JPEG, ou None se ainda não foi baixada ou se o download falhou
+            recentemente (a página usa a URL original).
+        """
+        with self._lock:
+            foto = self._fotos.get(url)
+            if foto is not None:
+                self._fotos.move_to_end(url)
+                return foto
+            pendente = self._agendar(url)
+
+        if pendente is None:
+            return self._fotos.get(url)
+        try:
+            return pendente.result(timeout=espera)
+        except TimeoutError:
+            return None
+
+
+@st.cache_resource
+def obter_cache_avatares() -> CacheAvatares:
+    """
+    Retorna o cache de fotos do processo, compartilhado entre todas as sessões.
+    """
+    return CacheAvatares()
@@ -0,0 +1,243 @@
+"""
+Cache em disco para os conjuntos de dados gerados pelas páginas do projeto.
+
+Cada conjunto de dados é identificado por um hash do seu nome, dos parâmetros de
+geração e da semente, e é gravado como arquivos Arrow IPC (um por tabela). Na leitura,
+os arquivos são mapeados em memória (memory map), evitando gerar os dados novamente a
+cada nova sessão.
+
+O tamanho total do cache é limitado: ao ultrapassar o limite, os conjuntos de dados
+acessados há mais tempo são removidos (LRU).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import polars as pl
+
+from collections.abc import Callable
+from pathlib import Path
+
+DIRETORIO_CACHE: Path = Path(
+    os.environ.get(
+        "PORTFOLIO_CACHE_DIR", Path(tempfile.gettempdir()) / "portfolio_cache"
+    )
+)
+LIMITE_CACHE_BYTES: int = (
+    int(os.environ.get("PORTFOLIO_CACHE_LIMITE_MB", 1_024)) * 2**20
+)
+
+_ARQUIVO_COMPLETO: str = ".completo"
+
+
+def chave_dataset(nome: str, parametros: dict, seed: int) -> str:
+    """
+    Calcula a chave de um conjunto de dados a partir do nome, dos parâmetros de
+    geração e da semente.
+
+    Args:
+        nome (str):
+        Nome do conjunto de dados.
+
+        parametros (dict):
+        Parâmetros usados na geração dos dados.
+
+        seed (int):
+        Semente usada na geração dos dados.
+
+    Returns:
+        str:
+        Chave no formato "<nome>-<hash>".
+    """
+    conteudo = json.dumps(
+        {"nome": nome, "parametros": parametros, "seed": seed},
+        sort_keys=True,
+        default=str,
+    )
+    return f"{nome}-{hashlib.sha256(conteudo.encode()).hexdigest()[:16]}"
+
+
+def _ler_dataset(pasta: Path) -> dict[str, pl.DataFrame]:
+    """
+    Lê as tabelas de um conjunto de dados do cache, mapeadas em memória.
+    """
+    os.utime(pasta)  # marca o último acesso, usado pela política LRU
+    return {
+        arquivo.stem: pl.read_ipc(arquivo, memory_map=True)
+        for arquivo in sorted(pasta.glob("*.arrow"))
+    }
+
+
+def _tamanho_pasta(pasta: Path) -> int:
+    """
+    Retorna o tamanho total, em bytes, dos arquivos de uma pasta.
+    """
+    return sum(arquivo.stat().st_size for arquivo in pasta.iterdir())
+
+
+def aplicar_limite(
+    diretorio: Path = DIRETORIO_CACHE, limite_bytes: int = LIMITE_CACHE_BYTES
+) -> list[str]:
+    """
+    Remove os conjuntos de dados acessados há mais tempo até que o tamanho total do
+    cache fique dentro do limite.
+
+    Args:
+        diretorio (Path, optional):
+        Diretório do cache. Padrão é `DIRETORIO_CACHE`.
+
+        limite_bytes (int, optional):
+        Tamanho máximo do cache, em bytes. Padrão é `LIMITE_CACHE_BYTES`.
+
+    Returns:
+        list[str]:
+        Chaves dos conjuntos de dados removidos.
+    """
+    if not diretorio.exists():
+        return []
+
+    pastas = sorted(
+        (
+            pasta
+            for pasta in diretorio.iterdir()
+            if (pasta / _ARQUIVO_COMPLETO).exists()
+        ),
+        key=lambda pasta: pasta.stat().st_mtime,
+    )
+    tamanhos = {pasta: _tamanho_pasta(pasta) for pasta in pastas}
+    total = sum(tamanhos.values())
+
+    removidas: list[str] = []
+    for pasta in pastas:
+        if total <= limite_bytes:
+            break
+        shutil.rmtree(pasta, ignore_errors=True)
+        total -= tamanhos[pasta]
+        removidas.append(pasta.name)
+
+    return removidas
+
+
+def invalidar(
+    nome: str | None = None,
+    chave: str | None = None,
+    diretorio: Path = DIRETORIO_CACHE,
+) -> list[str]:
+    """
+    Remove conjuntos de dados do cache. Sem argumentos, limpa todo o cache.
+
+    Args:
+        nome (str | None, optional):
+        Remove todos os conjuntos de dados com este nome. Padrão é None.
+
+        chave (str | None, optional):
+        Remove somente o conjunto de dados com esta chave. Padrão é None.
+
+        diretorio (Path, optional):
+        Diretório do cache. Padrão é `DIRETORIO_CACHE`.
+
+    Returns:
+        list[str]:
+        Chaves dos conjuntos de dados removidos.
+    """
+    if not diretorio.exists():
+        return []
+
+    removidas: list[str] = []
+    for pasta in diretorio.iterdir():
+        if chave is not None and pasta.name != chave:
+            continue
+        if nome is not None and not pasta.name.startswith(f"{nome}-"):
+            continue
+        shutil.rmtree(pasta, ignore_errors=True)
+        removidas.append(pasta.name)
+
+    return removidas
+
+
+def em_cache(
+    nome: str, parametros: dict, seed: int, diretorio: Path = DIRETORIO_CACHE
+) -> bool:
+    """
+    Indica se o conjunto de dados já está gravado no cache.
+
+    Args:
+        nome (str):
+        Nome do conjunto de dados.
+
+        parametros (dict):
+        Parâmetros usados na geração dos dados.
+
+        seed (int):
+        Semente usada na geração dos dados.
+
+        diretorio (Path, optional):
+        Diretório do cache. Padrão é `DIRETORIO_CACHE`.
+
+    Returns:
+        bool:
+        True se o conjunto de dados está no cache.
+    """
+    pasta = diretorio / chave_dataset(nome, parametros, seed)
+    return (pasta / _ARQUIVO_COMPLETO).exists()
+
+
+def carregar_ou_gerar(
+    nome: str,
+    parametros: dict,
+    seed: int,
+    gerador: Callable[[], dict[str, pl.DataFrame]],
+    diretorio: Path = DIRETORIO_CACHE,
+    limite_bytes: int = LIMITE_CACHE_BYTES,
+) -> dict[str, pl.DataFrame]:
+    """
+    Retorna o conjunto de dados do cache, ou gera, grava e retorna caso não exista.
+
+    Args:
+        nome (str):
+        Nome do conjunto de dados.
+
+        parametros (dict):
+        Parâmetros usados na geração dos dados. Fazem parte da chave do cache.
+
+        seed (int):
+        Semente usada na geração dos dados. Faz parte da chave do cache.
+
+        gerador (Callable[[], dict[str, pl.DataFrame]]):
+        Função que gera os dados, retornando um dicionário com o nome e o DataFrame
+        de cada tabela.
+
+        diretorio (Path, optional):
+        Diretório do cache. Padrão é `DIRETORIO_CACHE`.
+
+        limite_bytes (int, optional):
+        Tamanho máximo do cache, em bytes. Padrão é `LIMITE_CACHE_BYTES`.
+
+    Returns:
+        dict[str, pl.DataFrame]:
+        Dicionário com o nome e o DataFrame de cada tabela.
+    """
+    pasta = diretorio / chave_dataset(nome, parametros, seed)
+    if em_cache(nome, parametros, seed, diretorio):
+        return _ler_dataset(pasta)
+
+    dados = gerador()
+
+    # Grava em uma pasta temporária e renomeia ao final, para que outra sessão
+    # gerando o mesmo conjunto de dados nunca leia arquivos incompletos.
+    diretorio.mkdir(parents=True, exist_ok=True)
+    temporaria = Path(tempfile.mkdtemp(dir=diretorio, prefix=".tmp-"))
+    for tabela, df in dados.items():
+        df.write_ipc(temporaria / f"{tabela}.arrow", compression="uncompressed")
+    (temporaria / _ARQUIVO_COMPLETO).touch()
+
+    try:
+        temporaria.rename(pasta)
+    except OSError:
+        shutil.rmtree(temporaria, ignore_errors=True)
+
+    aplicar_limite(diretorio, limite_bytes)
+
+    return _ler_dataset(pasta) if pasta.exists() else dados
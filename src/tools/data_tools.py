@@ -3,27 +3,41 @@ Arquivo para manter funções e itens para serem usados em outras partes do cód
 com o objetivo de deixá-lo mais desacoplado e reutilizável.
 """
 
-import xlsxwriter
 import polars as pl
+from collections.abc import Callable
 from io import BytesIO
+from tempfile import TemporaryFile
 
+# Acima desta quantidade de linhas, o xlsx é gerado em streaming
+LIMITE_LINHAS_XLSX_MEMORIA: int = 100_000
 
-def salvar_xlsx(df: pl.LazyFrame):
+
+def salvar_xlsx(df: pl.DataFrame, streaming: bool | None = None) -> BytesIO:
     """
     Função para salvar um dataframe em formato xlsx.
     Formatação do arquivo específico para o extrato de serviços por projeto.
 
     Args:
-        df (pl.LazyFrame):
+        df (pl.DataFrame):
         Dataframe a ser salvo.
 
+        streaming (bool | None, optional):
+        Gera o arquivo com `salvar_xlsx_streaming`. Padrão é None (somente quando o
+        dataframe tem mais de `LIMITE_LINHAS_XLSX_MEMORIA` linhas).
+
     Returns:
         BytesIO:
         Arquivo em formato xlsx salvo em um objeto BytesIO.
     """
+    if streaming is None:
+        streaming = df.height > LIMITE_LINHAS_XLSX_MEMORIA
+    if streaming:
+        return salvar_xlsx_streaming(df)
 
     outuput = BytesIO()
 
+    import xlsxwriter  # importado somente quando o arquivo é gerado
+
     with xlsxwriter.Workbook(outuput) as wb:
         ws = wb.add_worksheet("extrato")
 
@@ -50,3 +64,238 @@ def salvar_xlsx(df: pl.LazyFrame):
     outuput.seek(0)
 
     return outuput
+
+
+def _larguras_colunas(df: pl.DataFrame, largura_maxima: int = 60) -> list[int]:
+    """
+    Calcula a largura de cada coluna a partir do maior texto da coluna (ou do
+    cabeçalho), em uma única consulta vetorizada, sem percorrer as células.
+    """
+    tamanhos = df.select(
+        (
+            pl.col(coluna).dt.to_string("%Y-%m-%d %H:%M:%S")
+            if df.schema[coluna].is_temporal()
+            else pl.col(coluna).cast(pl.String)
+        )
+        .str.len_chars()
+        .max()
+        for coluna in df.columns
+    ).row(0)
+
+    return [
+        min(max(len(coluna), tamanho or 0) + 2, largura_maxima)
+        for coluna, tamanho in zip(df.columns, tamanhos)
+    ]
+
+
+def salvar_xlsx_streaming(
+    df: pl.DataFrame,
+    tamanho_lote: int = 50_000,
+    colunas_total: tuple[str, ...] = ("QTD Horas", "Custo Serviço"),
+) -> BytesIO:
+    """
+    Versão de `salvar_xlsx` para dataframes grandes, com uso de memória constante.
+    Usa o modo `constant_memory` do xlsxwriter: as linhas são escritas em lotes e
+    descarregadas para o disco, e o arquivo é montado em um arquivo temporário. Somente
+    o arquivo final, já compactado, é lido para a memória, no mesmo tipo retornado
+    pelos outros formatos (aceito por `st.download_button`).
+
+    Mantém o título, o formato do cabeçalho e a linha de totais. Como o modo
+    `constant_memory` não suporta tabelas, o cabeçalho recebe um filtro automático no
+    lugar do estilo de tabela, e a largura das colunas vem do tamanho dos textos.
+
+    Args:
+        df (pl.DataFrame):
+        Dataframe a ser salvo.
+
+        tamanho_lote (int, optional):
+        Quantidade de linhas lidas do dataframe por vez. Padrão é 50.000.
+
+        colunas_total (tuple[str, ...], optional):
+        Colunas somadas na linha de totais. Padrão é ("QTD Horas", "Custo Serviço").
+
+    Returns:
+        BytesIO:
+        Arquivo em formato xlsx salvo em um objeto BytesIO.
+    """
+
+    import xlsxwriter  # importado somente quando o arquivo é gerado
+
+    arquivo = TemporaryFile()
+    linha_cabecalho, coluna_inicial = 3, 1  # célula B4
+
+    with xlsxwriter.Workbook(arquivo, {"constant_memory": True}) as wb:
+        ws = wb.add_worksheet("extrato")
+        ws.hide_gridlines(2)
+
+        title_bold = wb.add_format({"bold": True, "font_size": 30})
+        header_format = wb.add_format(
+            {"bold": True, "font_color": "white", "bg_color": "#0B092C"}
+        )
+        total_format = wb.add_format({"bold": True, "top": 1})
+        formatos = [
+            wb.add_format(
+                {"num_format": "yyyy-mm-dd hh:mm:ss"}
+                if dtype.is_temporal()
+                else {"num_format": "#,##0"}
+                if dtype.is_integer()
+                else {"num_format": "#,##0.00"}
+                if dtype.is_float()
+                else {}
+            )
+            for dtype in df.dtypes
+        ]
+
+        ws.set_column("A:A", 3)
+        for posicao, largura in enumerate(_larguras_colunas(df)):
+            ws.set_column(coluna_inicial + posicao, coluna_inicial + posicao, largura)
+
+        ws.write("B2", "Extrato dos Serviços por Projeto", title_bold)
+        ws.write_row(linha_cabecalho, coluna_inicial, df.columns, header_format)
+
+        # Datas convertidas para o número de série do Excel de forma vetorizada, e
+        # cada coluna escrita com o método do seu tipo, sem a detecção de tipo de
+        # `ws.write` a cada célula.
+        df_excel = df.with_columns(
+            (
+                (pl.col(coluna) - pl.datetime(1899, 12, 30)).dt.total_microseconds()
+                / 86_400_000_000
+            )
+            for coluna, dtype in df.schema.items()
+            if dtype.is_temporal()
+        )
+        escritores = [
+            ws.write_number if dtype.is_numeric() else ws.write_string
+            for dtype in df_excel.dtypes
+        ]
+        colunas = [
+            (coluna_inicial + posicao, escritores[posicao], formatos[posicao])
+            for posicao in range(df.width)
+        ]
+
+        linha = linha_cabecalho
+        for lote in df_excel.iter_slices(tamanho_lote):
+            for valores in lote.iter_rows():
+                linha += 1
+                for (coluna, escrever, formato), valor in zip(colunas, valores):
+                    if valor is not None:
+                        escrever(linha, coluna, valor, formato)
+
+        # Linha de totais, no mesmo formato da tabela gerada por `salvar_xlsx`
+        linha_total = linha + 1
+        ws.write(linha_total, coluna_inicial, "Total", total_format)
+        for posicao, coluna in enumerate(df.columns[1:], start=1):
+            if coluna in colunas_total:
+                celula_inicial = xlsxwriter.utility.xl_rowcol_to_cell(
+                    linha_cabecalho + 1, coluna_inicial + posicao
+                )
+                celula_final = xlsxwriter.utility.xl_rowcol_to_cell(
+                    linha, coluna_inicial + posicao
+                )
+                ws.write_formula(
+                    linha_total,
+                    coluna_inicial + posicao,
+                    f"=SUBTOTAL(109,{celula_inicial}:{celula_final})",
+                    total_format,
+                )
+            else:
+                ws.write_blank(
+                    linha_total, coluna_inicial + posicao, None, total_format
+                )
+
+        ws.autofilter(
+            linha_cabecalho,
+            coluna_inicial,
+            max(linha, linha_cabecalho),
+            coluna_inicial + df.width - 1,
+        )
+
+    with arquivo:
+        arquivo.seek(0)
+        output = BytesIO(arquivo.read())
+
+    return output
+
+
+# region Outros Formatos
+# Formatos gravados diretamente a partir dos dados em Arrow do Polars, sem converter
+# os valores para objetos Python.
+COMPRESSOES_PARQUET: tuple[str, ...] = ("zstd", "snappy", "lz4", "gzip", "uncompressed")
+
+
+def salvar_parquet(df: pl.DataFrame, compressao: str = "zstd") -> BytesIO:
+    """
+    Função para salvar um dataframe em formato Parquet.
+
+    Args:
+        df (pl.DataFrame):
+        Dataframe a ser salvo.
+
+        compressao (str, optional):
+        Compressão usada, uma de `COMPRESSOES_PARQUET`. Padrão é "zstd".
+
+    Returns:
+        BytesIO:
+        Arquivo em formato Parquet salvo em um objeto BytesIO.
+    """
+    output = BytesIO()
+    df.write_parquet(output, compression=compressao)
+    output.seek(0)
+
+    return output
+
+
+def salvar_csv(df: pl.DataFrame) -> BytesIO:
+    """
+    Função para salvar um dataframe em formato CSV (UTF-8, separado por vírgula).
+
+    Args:
+        df (pl.DataFrame):
+        Dataframe a ser salvo.
+
+    Returns:
+        BytesIO:
+        Arquivo em formato CSV salvo em um objeto BytesIO.
+    """
+    output = BytesIO()
+    df.write_csv(output)
+    output.seek(0)
+
+    return output
+
+
+def salvar_ipc(df: pl.DataFrame, compressao: str = "uncompressed") -> BytesIO:
+    """
+    Função para salvar um dataframe em formato Arrow IPC (Feather v2).
+
+    Args:
+        df (pl.DataFrame):
+        Dataframe a ser salvo.
+
+        compressao (str, optional):
+        Compressão usada: "uncompressed", "lz4" ou "zstd". Padrão é "uncompressed".
+
+    Returns:
+        BytesIO:
+        Arquivo em formato Arrow IPC salvo em um objeto BytesIO.
+    """
+    output = BytesIO()
+    df.write_ipc(output, compression=compressao)
+    output.seek(0)
+
+    return output
+
+
+# Formatos oferecidos para exportação: função, extensão do arquivo e tipo MIME
+FORMATOS_EXPORTACAO: dict[str, tuple[Callable[..., BytesIO], str, str]] = {
+    "Excel": (
+        salvar_xlsx,
+        "xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+    "Parquet": (salvar_parquet, "parquet", "application/vnd.apache.parquet"),
+    "CSV": (salvar_csv, "csv", "text/csv"),
+    "Arrow IPC": (salvar_ipc, "arrow", "application/vnd.apache.arrow.file"),
+}
+
+# endregion
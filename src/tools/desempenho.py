@@ -0,0 +1,262 @@
+"""
+Medição do desempenho das páginas, por região e por execução.
+
+Cada região da página (Gerar Dados, Transformar Dados, Filtros, App...) começa com
+`MedidorDesempenho.iniciar_regiao`, que registra o tempo decorrido até o início da
+próxima região, a quantidade de consultas do Polars executadas com `coletar` e
+`coletar_todos`, e a quantidade de linhas informada pela página. As medições das
+últimas execuções ficam no estado da sessão e são exibidas no painel "Performance" da
+barra lateral.
+
+O Streamlit é importado somente na exibição do painel, para que as funções de dados
+possam contar as suas consultas sem importá-lo.
+"""
+
+import threading
+import time
+import polars as pl
+
+from collections import deque
+
+HISTORICO_DESEMPENHO: int = 20
+
+# Regiões em andamento na thread atual. Cada sessão do Streamlit executa a página em
+# uma thread própria, e as threads em segundo plano não são contabilizadas.
+_local: threading.local = threading.local()
+
+
+# region Contador de Consultas
+def _regioes_ativas() -> list["MedicaoRegiao"]:
+    """
+    Regiões em andamento na thread atual. Remove as regiões já encerradas, inclusive
+    as de execuções interrompidas por `st.rerun`.
+    """
+    _local.regioes = [
+        medicao for medicao in getattr(_local, "regioes", []) if not medicao.encerrada
+    ]
+    return _local.regioes
+
+
+def coletar(consulta: pl.LazyFrame) -> pl.DataFrame:
+    """
+    Executa a consulta (`collect`) e a conta nas regiões em andamento.
+
+    Args:
+        consulta (pl.LazyFrame):
+        Consulta a ser executada.
+
+    Returns:
+        pl.DataFrame:
+        Resultado da consulta.
+    """
+    for medicao in _regioes_ativas():
+        medicao.collects += 1
+    return consulta.collect()
+
+
+def coletar_todos(consultas: list[pl.LazyFrame]) -> list[pl.DataFrame]:
+    """
+    Executa as consultas em paralelo (`pl.collect_all`), contadas como uma única
+    execução nas regiões em andamento.
+
+    Args:
+        consultas (list[pl.LazyFrame]):
+        Consultas a serem executadas.
+
+    Returns:
+        list[pl.DataFrame]:
+        Resultado de cada consulta.
+    """
+    for medicao in _regioes_ativas():
+        medicao.collects += 1
+    return pl.collect_all(consultas)
+
+
+# endregion
+
+
+# region Medidor
+class MedicaoRegiao:
+    """
+    Medição de uma região em uma execução da página.
+
+    Args:
+        nome (str):
+        Nome da região.
+    """
+
+    def __init__(self, nome: str):
+        self.nome: str = nome
+        self.tempo_ms: float = 0.0
+        self.collects: int = 0
+        self.linhas: int = 0
+        self.encerrada: bool = False
+
+    def registrar_linhas(self, dados: pl.DataFrame | int) -> None:
+        """
+        Soma as linhas processadas na região.
+
+        Args:
+            dados (pl.DataFrame | int):
+            DataFrame processado ou quantidade de linhas.
+        """
+        self.linhas += dados if isinstance(dados, int) else dados.height
+
+
+class MedidorDesempenho:
+    """
+    Medições das regiões de uma página, nas últimas execuções de uma sessão.
+
+    Args:
+        pagina (str):
+        Nome da página.
+
+        historico (int, optional):
+        Quantidade de execuções mantidas. Padrão é `HISTORICO_DESEMPENHO`.
+    """
+
+    def __init__(self, pagina: str, historico: int = HISTORICO_DESEMPENHO):
+        self.pagina: str = pagina
+        self.execucoes: deque[list[MedicaoRegiao]] = deque(maxlen=historico)
+        self.total_execucoes: int = 0
+        self._atual: MedicaoRegiao | None = None
+        self._inicio: float = 0.0
+
+    def nova_execucao(self) -> None:
+        """
+        Inicia as medições de uma nova execução da página. A região interrompida na
+        execução anterior (por exemplo, por `st.rerun`) é encerrada neste momento.
+        """
+        self.encerrar_regiao()
+        self.execucoes.append([])
+        self.total_execucoes += 1
+
+    def iniciar_regiao(self, nome: str) -> MedicaoRegiao:
+        """
+        Encerra a região em andamento e inicia a medição de uma nova região, que vai
+        até o início da próxima região ou até `encerrar_regiao`.
+
+        Args:
+            nome (str):
+            Nome da região.
+
+        Returns:
+            MedicaoRegiao:
+            Medição da região, para que a página informe as linhas processadas.
+        """
+        self.encerrar_regiao()
+        if not self.execucoes:
+            self.nova_execucao()
+
+        medicao = MedicaoRegiao(nome)
+        self.execucoes[-1].append(medicao)
+        _regioes_ativas().append(medicao)
+        self._atual = medicao
+        self._inicio = time.perf_counter()
+        return medicao
+
+    def encerrar_regiao(self) -> None:
+        """
+        Encerra a região em andamento, registrando o tempo decorrido.
+        """
+        if self._atual is None:
+            return
+
+        self._atual.tempo_ms = (time.perf_counter() - self._inicio) * 1_000
+        self._atual.encerrada = True
+        self._atual = None
+
+    def tabela(self) -> pl.DataFrame:
+        """
+        Retorna as medições de todas as execuções do histórico.
+
+        Returns:
+            pl.DataFrame:
+            DataFrame com as colunas "Execução", "Região", "Tempo (ms)", "Collects" e
+            "Linhas".
+        """
+        primeira = self.total_execucoes - len(self.execucoes) + 1
+        return pl.DataFrame(
+            [
+                (
+                    execucao,
+                    medicao.nome,
+                    medicao.tempo_ms,
+                    medicao.collects,
+                    medicao.linhas,
+                )
+                for execucao, medicoes in enumerate(self.execucoes, start=primeira)
+                for medicao in medicoes
+            ],
+            schema={
+                "Execução": pl.Int64,
+                "Região": pl.String,
+                "Tempo (ms)": pl.Float64,
+                "Collects": pl.Int64,
+                "Linhas": pl.Int64,
+            },
+            orient="row",
+        )
+
+    def exibir_painel(self) -> None:
+        """
+        Exibe, na barra lateral, o painel "Performance": as medições da execução atual
+        e o tempo de cada região nas últimas execuções. O painel é opcional e fica
+        oculto até ser ativado. Encerra a última região da página.
+        """
+        import streamlit as st
+
+        self.encerrar_regiao()
+        with st.sidebar:
+            if not st.toggle("Performance", key=f"desempenho_{self.pagina}"):
+                return
+
+            df_medicoes = self.tabela()
+            df_atual = df_medicoes.filter(
+                pl.col("Execução") == self.total_execucoes
+            ).drop("Execução")
+
+            st.caption(
+                f"Execução {self.total_execucoes}: "
+                f"{df_atual['Tempo (ms)'].sum():,.1f} ms"
+            )
+            st.dataframe(
+                df_atual,
+                hide_index=True,
+                column_config={
+                    "Tempo (ms)": st.column_config.NumberColumn(format="%.1f")
+                },
+            )
+            st.bar_chart(
+                df_medicoes,
+                x="Execução",
+                y="Tempo (ms)",
+                color="Região",
+                height=220,
+            )
+
+
+def iniciar_desempenho(pagina: str) -> MedidorDesempenho:
+    """
+    Retorna o medidor da página na sessão atual e inicia as medições de uma nova
+    execução. Deve ser chamada no início da página.
+
+    Args:
+        pagina (str):
+        Nome da página.
+
+    Returns:
+        MedidorDesempenho:
+        Medidor da página.
+    """
+    from streamlit import session_state as ss
+
+    chave = f"medidor_desempenho_{pagina}"
+    if chave not in ss:
+        ss[chave] = MedidorDesempenho(pagina)
+
+    ss[chave].nova_execucao()
+    return ss[chave]
+
+
+# endregion
@@ -0,0 +1,161 @@
+"""
+Política de tipos das tabelas geradas (projetos, serviços e tickets).
+
+Colunas textuais com poucos valores distintos são guardadas como `pl.Enum` (conjunto
+fixo de valores, como o status do ticket) ou `pl.Categorical`, em vez de repetir o
+texto em todas as linhas. Cada linha passa a guardar somente um índice inteiro, o que
+reduz o uso de memória e acelera os filtros `is_in`, os joins e os agrupamentos.
+
+Desde o Polars 1.32, todas as colunas `pl.Categorical` usam o mesmo dicionário global
+de textos, sem a necessidade de `pl.StringCache`. Esse dicionário não diminui ao longo
+do processo, por isso a política inclui somente colunas com vocabulário limitado
+(nomes e descrições sorteados de listas fixas), e não colunas com um valor por linha,
+como o CNPJ, o nome do cliente do projeto ou o cliente do ticket. Nessas colunas, o
+`pl.Categorical` ocupa mais memória que o texto (ver `benchmarks.bench_esquema`).
+
+Os códigos de projeto, cliente e serviço são chaves inteiras (`pl.UInt32`), usadas nos
+joins e filtros. O código formatado (por exemplo, PROJ0000000012) é gerado somente na
+exibição, com `formatar_codigos`.
+"""
+
+import polars as pl
+
+from tools.tickets_dados import STATUS_TICKET
+
+# Versão da política de tipos. Incluída nos parâmetros dos conjuntos de dados para que
+# os dados gravados no cache em disco com outra política não sejam reaproveitados.
+VERSAO_ESQUEMA: int = 3
+
+ESQUEMA_PROJETOS: dict[str, pl.DataType] = {
+    "ID Projeto": pl.UInt32(),
+    "ID Cliente": pl.UInt32(),
+}
+ESQUEMA_SERVICOS: dict[str, pl.DataType] = {
+    "Projeto Vinculado": pl.UInt32(),
+    "ID Serviço": pl.UInt32(),
+    "Descrição Serviço": pl.Categorical(),
+    "Responsável pelo Serviço": pl.Categorical(),
+}
+ESQUEMA_TICKETS: dict[str, pl.DataType] = {
+    "Status Ticket": pl.Enum(STATUS_TICKET),
+    "Analista": pl.Categorical(),
+}
+
+# Prefixo do código formatado de cada coluna de chave inteira
+PREFIXOS_CODIGO: dict[str, str] = {
+    "ID Projeto": "PROJ",
+    "Projeto Vinculado": "PROJ",
+    "ID Cliente": "CLI",
+    "ID Serviço": "SERV",
+}
+
+
+def aplicar_esquema(df: pl.DataFrame, esquema: dict[str, pl.DataType]) -> pl.DataFrame:
+    """
+    Converte as colunas do DataFrame para os tipos da política. Colunas que não estão
+    no DataFrame são ignoradas.
+
+    Args:
+        df (pl.DataFrame):
+        Dados a serem convertidos.
+
+        esquema (dict[str, pl.DataType]):
+        Tipo de cada coluna, como `ESQUEMA_PROJETOS`.
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com as colunas convertidas.
+    """
+    return df.with_columns(
+        pl.col(coluna).cast(tipo) for coluna, tipo in esquema.items() if coluna in df
+    )
+
+
+def formatar_codigo(chave: int, coluna: str) -> str:
+    """
+    Formata uma chave inteira da coluna como código com prefixo e zeros à esquerda.
+    Exemplo: 12 em "ID Projeto" -> PROJ0000000012.
+    """
+    return f"{PREFIXOS_CODIGO[coluna]}{chave:010d}"
+
+
+def formatar_codigos(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Converte as colunas de chave inteira (`PREFIXOS_CODIGO`) para os códigos
+    formatados. Usada somente na exibição: tabelas, gráficos e arquivos exportados.
+
+    Args:
+        df (pl.DataFrame):
+        Dados com as chaves inteiras.
+
+    Returns:
+        pl.DataFrame:
+        Dados com os códigos formatados.
+    """
+    return df.with_columns(
+        pl.concat_str(
+            pl.lit(prefixo), pl.col(coluna).cast(pl.String).str.zfill(10)
+        ).alias(coluna)
+        for coluna, prefixo in PREFIXOS_CODIGO.items()
+        if coluna in df
+    )
+
+
+def remover_esquema(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Converte as colunas `pl.Enum` e `pl.Categorical` de volta para texto, e as chaves
+    inteiras para os códigos formatados. Usada como referência ("antes") no relatório
+    de memória.
+    """
+    return formatar_codigos(df).with_columns(
+        pl.col(pl.Categorical, pl.Enum).cast(pl.String),
+    )
+
+
+def tamanho_coluna(serie: pl.Series) -> float:
+    """
+    Tamanho estimado da coluna, em MB. Para `pl.Enum` e `pl.Categorical`, soma aos
+    índices o tamanho dos textos distintos da coluna no dicionário, que não são
+    contados por `estimated_size`.
+    """
+    tamanho = serie.estimated_size("mb")
+    if isinstance(serie.dtype, (pl.Categorical, pl.Enum)):
+        tamanho += serie.unique().cast(pl.String).estimated_size("mb")
+    return tamanho
+
+
+def relatorio_memoria(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Compara o tamanho estimado em memória de cada coluna com os tipos da política
+    (depois) e com as colunas textuais (antes).
+
+    Args:
+        df (pl.DataFrame):
+        Dados já convertidos com `aplicar_esquema`.
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com as colunas "Coluna", "Tipo", "Antes (MB)", "Depois (MB)" e
+        "Redução (%)", incluindo uma linha com o total.
+    """
+    antes = remover_esquema(df)
+    relatorio = pl.DataFrame(
+        {
+            "Coluna": df.columns,
+            "Tipo": [str(tipo) for tipo in df.dtypes],
+            "Antes (MB)": [tamanho_coluna(antes[coluna]) for coluna in df.columns],
+            "Depois (MB)": [tamanho_coluna(df[coluna]) for coluna in df.columns],
+        }
+    )
+    total = relatorio.select(
+        pl.lit("Total").alias("Coluna"),
+        pl.lit("").alias("Tipo"),
+        pl.col("Antes (MB)").sum(),
+        pl.col("Depois (MB)").sum(),
+    )
+
+    return pl.concat([relatorio, total]).with_columns(
+        (100 * (1 - pl.col("Depois (MB)") / pl.col("Antes (MB)")))
+        .fill_nan(0)
+        .alias("Redução (%)")
+    )
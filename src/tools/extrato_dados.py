@@ -0,0 +1,266 @@
+"""
+Transformações dos dados do Extrato de Serviços, separadas da página para que possam
+ser reutilizadas e materializadas uma única vez por conjunto de dados.
+"""
+
+import polars as pl
+
+from datetime import date, datetime
+from tools.desempenho import coletar, coletar_todos
+from typing import NamedTuple
+
+
+def enriquecer_servicos(
+    df_servicos: pl.LazyFrame, df_projetos: pl.LazyFrame
+) -> pl.LazyFrame:
+    """
+    Relaciona os serviços aos seus projetos e calcula o custo de cada serviço
+    (QTD Horas x Taxa/Hora Contratada), ordenando por projeto e data do serviço.
+
+    Args:
+        df_servicos (pl.LazyFrame):
+        Serviços, no formato de `gerar_servicos_projeto_df`.
+
+        df_projetos (pl.LazyFrame):
+        Projetos, no formato de `gerar_dados_projeto_df`.
+
+    Returns:
+        pl.LazyFrame:
+        Plano com os serviços enriquecidos.
+    """
+    return (
+        df_servicos.join(
+            other=df_projetos,
+            left_on="Projeto Vinculado",
+            right_on="ID Projeto",
+            how="inner",
+        )
+        .with_columns(
+            (pl.col("QTD Horas") * pl.col("Taxa/Hora Contratada")).alias(
+                "Custo Serviço"
+            )
+        )
+        .sort(
+            by=["Projeto Vinculado", "Data Serviço"],
+            descending=[False, False],
+        )
+    )
+
+
+# Colunas com filtro de seleção na barra lateral
+COLUNAS_FILTRO: tuple[str, ...] = (
+    "Projeto Vinculado",
+    "Nome Projeto",
+    "ID Serviço",
+    "Descrição Serviço",
+    "ID Cliente",
+    "Nome Cliente",
+    "Responsável pelo Serviço",
+)
+
+
+def indexar_opcoes_filtro(
+    df: pl.LazyFrame, colunas: tuple[str, ...] = COLUNAS_FILTRO
+) -> dict[str, pl.Series]:
+    """
+    Calcula, em uma única consulta, os valores únicos e ordenados de cada coluna de
+    filtro. As opções dos filtros são lidas deste índice, sem consultar os dados
+    novamente a cada interação. As colunas de chave inteira mantêm os inteiros, que
+    são formatados somente na exibição das opções.
+
+    Args:
+        df (pl.LazyFrame):
+        Serviços enriquecidos, no formato de `enriquecer_servicos`.
+
+        colunas (tuple[str, ...], optional):
+        Colunas a serem indexadas. Padrão é `COLUNAS_FILTRO`.
+
+    Returns:
+        dict[str, pl.Series]:
+        Dicionário com os valores de cada coluna.
+    """
+    # Colunas `pl.Categorical` são convertidas para texto, para que as opções fiquem
+    # em ordem alfabética
+    esquema = df.collect_schema()
+    valores = coletar(
+        df.select(
+            pl.col(coluna)
+            .drop_nulls()
+            .unique()
+            .cast(pl.String if esquema[coluna] == pl.Categorical else esquema[coluna])
+            .sort()
+            .implode()
+            for coluna in colunas
+        )
+    )
+
+    return {coluna: valores[coluna][0] for coluna in colunas}
+
+
+# region Cubo Mensal
+# Os gráficos e os totais são calculados a partir de um cubo pré-agregado por mês do
+# serviço, mês de criação do projeto, projeto e cliente, em vez de percorrer todos os
+# serviços a cada interação.
+DIMENSOES_CUBO: tuple[str, ...] = (
+    "Mês Serviço",
+    "Mês Criação Projeto",
+    "Projeto Vinculado",
+    "Nome Projeto",
+    "ID Cliente",
+    "Nome Cliente",
+    "CNPJ Cliente",
+)
+
+
+class CuboMensal(NamedTuple):
+    """
+    Cubo pré-agregado dos serviços, com as datas mínima e máxima dos serviços
+    agregados (usadas para saber se um filtro de datas pode ser atendido pelo cubo).
+    """
+
+    dados: pl.DataFrame
+    data_minima: datetime | None
+    data_maxima: datetime | None
+
+
+def construir_cubo_mensal(df: pl.LazyFrame) -> CuboMensal:
+    """
+    Agrega os serviços por mês e pelas dimensões de projeto e cliente, somando o custo,
+    as horas e a quantidade de serviços.
+
+    Args:
+        df (pl.LazyFrame):
+        Serviços enriquecidos, no formato de `enriquecer_servicos`.
+
+    Returns:
+        CuboMensal:
+        Cubo com as colunas de `DIMENSOES_CUBO`, "Custo Serviço", "QTD Horas" e
+        "Qtd Serviços".
+    """
+    dados, limites = coletar_todos(
+        [
+            df.group_by(
+                pl.col("Data Serviço").dt.truncate("1mo").alias("Mês Serviço"),
+                pl.col("Data Criação Projeto")
+                .dt.truncate("1mo")
+                .alias("Mês Criação Projeto"),
+                *DIMENSOES_CUBO[2:],
+            ).agg(
+                pl.col("Custo Serviço").sum(),
+                pl.col("QTD Horas").sum(),
+                pl.len().alias("Qtd Serviços"),
+            ),
+            df.select(
+                pl.col("Data Serviço").min().alias("min"),
+                pl.col("Data Serviço").max().alias("max"),
+            ),
+        ]
+    )
+
+    return CuboMensal(dados, limites["min"][0], limites["max"][0])
+
+
+def filtrar_cubo(
+    cubo: CuboMensal,
+    intervalo: tuple[date, date],
+    selecoes: dict[str, list],
+) -> pl.DataFrame | None:
+    """
+    Aplica os filtros ao cubo, quando possível. O cubo só atende filtros de colunas
+    que são dimensões do cubo, e um intervalo de datas que comece no primeiro dia de
+    um mês (ou antes do primeiro serviço) e termine depois do último serviço.
+
+    Args:
+        cubo (CuboMensal):
+        Cubo construído por `construir_cubo_mensal`.
+
+        intervalo (tuple[date, date]):
+        Data inicial e final do filtro de "Data Serviço".
+
+        selecoes (dict[str, list]):
+        Valores selecionados de cada coluna. Seleções vazias não filtram.
+
+    Returns:
+        pl.DataFrame | None:
+        Linhas do cubo que atendem aos filtros, ou None se os filtros não puderem ser
+        atendidos pelo cubo.
+    """
+    if cubo.data_minima is None:
+        return cubo.dados
+
+    inicio, fim = (datetime.combine(data, datetime.min.time()) for data in intervalo)
+    if any(
+        valores and coluna not in DIMENSOES_CUBO for coluna, valores in selecoes.items()
+    ):
+        return None
+    if fim < cubo.data_maxima or (inicio > cubo.data_minima and inicio.day != 1):
+        return None
+
+    # O mês do início é incluído inteiro: o início é o primeiro dia do mês, ou é
+    # anterior ao primeiro serviço (e então não há serviços do mês antes dele)
+    filtro = pl.col("Mês Serviço") >= inicio.replace(day=1)
+    for coluna, valores in selecoes.items():
+        if valores:
+            filtro &= pl.col(coluna).is_in(valores)
+
+    return cubo.dados.filter(filtro)
+
+
+def totais_cubo(cubo: pl.DataFrame) -> tuple[float, int, int]:
+    """
+    Retorna o custo total, o total de horas e a quantidade de serviços do cubo.
+    """
+    return cubo.select(
+        pl.col("Custo Serviço").sum(),
+        pl.col("QTD Horas").sum(),
+        pl.col("Qtd Serviços").sum(),
+    ).row(0)
+
+
+def custo_por_periodo(cubo: pl.DataFrame) -> pl.DataFrame:
+    """
+    Custo total dos serviços por mês.
+    """
+    return (
+        cubo.group_by(pl.col("Mês Serviço").alias("Data Serviço"))
+        .agg(pl.col("Custo Serviço").sum())
+        .sort("Data Serviço")
+    )
+
+
+def custo_por_cliente(cubo: pl.DataFrame) -> pl.DataFrame:
+    """
+    Custo total dos serviços por cliente e projeto.
+    """
+    return cubo.group_by(
+        ["Nome Cliente", "ID Cliente", "CNPJ Cliente", "Projeto Vinculado"]
+    ).agg(pl.col("Custo Serviço").sum())
+
+
+def projetos_por_periodo(cubo: pl.DataFrame) -> pl.DataFrame:
+    """
+    Quantidade de projetos distintos por mês de criação.
+    """
+    return (
+        cubo.group_by(pl.col("Mês Criação Projeto").alias("Data Criação Projeto"))
+        .agg(pl.col("Projeto Vinculado").n_unique().alias("Quantidade"))
+        .sort("Data Criação Projeto")
+    )
+
+
+def projetos_por_valor(cubo: pl.DataFrame) -> pl.DataFrame:
+    """
+    Custo total dos serviços por projeto.
+    """
+    return cubo.group_by(
+        [
+            "Projeto Vinculado",
+            "Nome Projeto",
+            "Nome Cliente",
+            "ID Cliente",
+            "CNPJ Cliente",
+        ]
+    ).agg(pl.col("Custo Serviço").sum())
+
+
+# endregion
@@ -0,0 +1,137 @@
+"""
+Motor de filtros com cache de máscaras booleanas.
+
+Cada predicado ativo (um intervalo de datas ou uma seleção de valores em uma coluna)
+gera uma máscara booleana, guardada em cache pela coluna e pelos valores selecionados.
+O resultado é a combinação (AND) vetorizada das máscaras. Assim, quando somente um
+filtro é alterado, apenas a máscara daquela coluna é recalculada.
+"""
+
+import operator
+import threading
+import polars as pl
+
+from collections import OrderedDict
+from datetime import date
+from functools import reduce
+
+CAPACIDADE_MASCARAS: int = 64
+
+
+def _predicados(
+    intervalos: dict[str, tuple[date, date]], selecoes: dict[str, list]
+) -> list[tuple[tuple, pl.Expr]]:
+    """
+    Monta a chave e a expressão de cada predicado ativo. Seleções vazias são ignoradas.
+    """
+    predicados: list[tuple[tuple, pl.Expr]] = [
+        (
+            ("intervalo", coluna, inicio, fim),
+            pl.col(coluna).is_between(inicio, fim),
+        )
+        for coluna, (inicio, fim) in intervalos.items()
+    ]
+    predicados += [
+        (
+            ("valores", coluna, frozenset(valores)),
+            pl.col(coluna).is_in(list(valores)),
+        )
+        for coluna, valores in selecoes.items()
+        if valores
+    ]
+    return predicados
+
+
+def filtrar_lazy(
+    df: pl.LazyFrame,
+    intervalos: dict[str, tuple[date, date]],
+    selecoes: dict[str, list],
+) -> pl.LazyFrame:
+    """
+    Aplica os mesmos predicados de `MotorFiltros` a um LazyFrame, sem cache. Usada
+    quando os dados não estão em memória (por exemplo, lidos com `pl.scan_parquet`).
+
+    Args:
+        df (pl.LazyFrame):
+        Dados a serem filtrados.
+
+        intervalos (dict[str, tuple[date, date]]):
+        Intervalo (início e fim, inclusivos) de cada coluna de data.
+
+        selecoes (dict[str, list]):
+        Valores selecionados de cada coluna. Seleções vazias não filtram.
+
+    Returns:
+        pl.LazyFrame:
+        Plano com os dados filtrados.
+    """
+    for _, expressao in _predicados(intervalos, selecoes):
+        df = df.filter(expressao)
+    return df
+
+
+class MotorFiltros:
+    """
+    Filtra um DataFrame em memória combinando máscaras booleanas em cache.
+    Pode ser compartilhado entre sessões.
+
+    Args:
+        df (pl.DataFrame):
+        Dados a serem filtrados.
+
+        capacidade (int, optional):
+        Quantidade máxima de máscaras em cache (LRU). Padrão é `CAPACIDADE_MASCARAS`.
+    """
+
+    def __init__(self, df: pl.DataFrame, capacidade: int = CAPACIDADE_MASCARAS):
+        self.df: pl.DataFrame = df
+        self.capacidade: int = capacidade
+        self._mascaras: OrderedDict[tuple, pl.Series] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _mascara(self, chave: tuple, expressao: pl.Expr) -> pl.Series:
+        """
+        Retorna a máscara do predicado, calculando-a somente se não estiver em cache.
+        """
+        with self._lock:
+            mascara = self._mascaras.get(chave)
+            if mascara is not None:
+                self._mascaras.move_to_end(chave)
+                return mascara
+
+        mascara = self.df.select(expressao).to_series()
+
+        with self._lock:
+            self._mascaras[chave] = mascara
+            while len(self._mascaras) > self.capacidade:
+                self._mascaras.popitem(last=False)
+
+        return mascara
+
+    def filtrar(
+        self,
+        intervalos: dict[str, tuple[date, date]],
+        selecoes: dict[str, list],
+    ) -> pl.DataFrame:
+        """
+        Retorna as linhas que atendem a todos os predicados ativos.
+
+        Args:
+            intervalos (dict[str, tuple[date, date]]):
+            Intervalo (início e fim, inclusivos) de cada coluna de data.
+
+            selecoes (dict[str, list]):
+            Valores selecionados de cada coluna. Seleções vazias não filtram.
+
+        Returns:
+            pl.DataFrame:
+            Dados filtrados.
+        """
+        mascaras = [
+            self._mascara(chave, expressao)
+            for chave, expressao in _predicados(intervalos, selecoes)
+        ]
+        if not mascaras:
+            return self.df
+
+        return self.df.filter(reduce(operator.and_, mascaras))
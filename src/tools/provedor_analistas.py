@@ -0,0 +1,173 @@
+"""
+Provedor dos analistas do Controle de Tickets.
+
+Os analistas são obtidos do site RandomUser.me em segundo plano. Enquanto a resposta
+não chega (ou quando a API falha), a página usa analistas gerados localmente com o
+Faker, com as mesmas colunas. Assim, a primeira exibição da página não depende da rede.
+"""
+
+import threading
+import time
+import polars as pl
+import streamlit as st
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from mockup_data.faker_data_generation import gerar_dados_analistas_df
+from tools.api_data import buscar_dados_random_user_df
+
+COLUNAS_ANALISTAS: list[str] = ["Foto", "Analista", "Email Empresarial", "Telefone"]
+TEMPO_NOVA_BUSCA: float = 60.0
+CAPACIDADE_ANALISTAS: int = 16
+
+
+def buscar_analistas_remotos(qtd: int, seed: int) -> pl.DataFrame:
+    """
+    Busca os analistas no site RandomUser.me. A mesma semente retorna sempre os
+    mesmos analistas.
+
+    Args:
+        qtd (int):
+        Quantidade de analistas.
+
+        seed (int):
+        Semente enviada à API.
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com as colunas de `COLUNAS_ANALISTAS`. Vazio se a busca falhar.
+    """
+    return buscar_dados_random_user_df(qtd, seed=f"portfolio-{seed}").select(
+        COLUNAS_ANALISTAS
+    )
+
+
+def gerar_analistas_locais(qtd: int, seed: int) -> pl.DataFrame:
+    """
+    Gera os analistas localmente, sem acessar a rede.
+
+    Args:
+        qtd (int):
+        Quantidade de analistas.
+
+        seed (int):
+        Semente do gerador aleatório.
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com as colunas de `COLUNAS_ANALISTAS`.
+    """
+    return gerar_dados_analistas_df(qtd=qtd, seed=seed).select(COLUNAS_ANALISTAS)
+
+
+class ProvedorAnalistas:
+    """
+    Busca os analistas remotos em segundo plano, uma única vez por quantidade e
+    semente, e guarda o resultado para todas as sessões. Cada clique em "Gerar Novos
+    Dados" usa uma nova semente, por isso os resultados e as falhas guardados são
+    limitados às sementes usadas mais recentemente (LRU).
+
+    Args:
+        tempo_nova_busca (float, optional):
+        Tempo, em segundos, antes de buscar novamente depois de uma falha. Padrão é
+        `TEMPO_NOVA_BUSCA`.
+
+        capacidade (int, optional):
+        Quantidade máxima de resultados e de falhas guardados. Padrão é
+        `CAPACIDADE_ANALISTAS`.
+    """
+
+    def __init__(
+        self,
+        tempo_nova_busca: float = TEMPO_NOVA_BUSCA,
+        capacidade: int = CAPACIDADE_ANALISTAS,
+    ):
+        self.tempo_nova_busca: float = tempo_nova_busca
+        self.capacidade: int = capacidade
+        self._remotos: OrderedDict[tuple[int, int], pl.DataFrame] = OrderedDict()
+        self._buscas: dict[tuple[int, int], Future] = {}
+        self._falhas: OrderedDict[tuple[int, int], float] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="analistas"
+        )
+
+    def _buscar(self, chave: tuple[int, int]) -> None:
+        """
+        Busca os analistas remotos. Executada em segundo plano.
+        """
+        try:
+            df = buscar_analistas_remotos(*chave)
+        except Exception as e:
+            print(f"Erro ao buscar analistas: {e}")
+            df = pl.DataFrame()
+
+        with self._lock:
+            self._buscas.pop(chave, None)
+            if df.height == chave[0]:
+                self._falhas.pop(chave, None)
+                self._guardar(self._remotos, chave, df)
+            else:
+                self._guardar(self._falhas, chave, time.monotonic())
+
+    def _guardar(
+        self,
+        entradas: OrderedDict[tuple[int, int], pl.DataFrame | float],
+        chave: tuple[int, int],
+        valor: pl.DataFrame | float,
+    ) -> None:
+        """
+        Guarda o valor como o mais recente, removendo os mais antigos acima da
+        capacidade. Deve ser chamada com o lock adquirido.
+        """
+        entradas[chave] = valor
+        entradas.move_to_end(chave)
+        while len(entradas) > self.capacidade:
+            entradas.popitem(last=False)
+
+    def remotos(self, qtd: int, seed: int) -> pl.DataFrame | None:
+        """
+        Retorna os analistas remotos, caso já tenham sido obtidos. Caso contrário,
+        inicia a busca em segundo plano (se ainda não estiver em andamento) e retorna
+        None, sem esperar pela resposta.
+
+        Args:
+            qtd (int):
+            Quantidade de analistas.
+
+            seed (int):
+            Semente enviada à API.
+
+        Returns:
+            pl.DataFrame | None:
+            Analistas remotos, ou None se ainda não estiverem disponíveis.
+        """
+        chave = (qtd, seed)
+        with self._lock:
+            if chave in self._remotos:
+                self._remotos.move_to_end(chave)
+                return self._remotos[chave]
+
+            falha = self._falhas.get(chave)
+            recente = falha is not None and (
+                time.monotonic() - falha < self.tempo_nova_busca
+            )
+            if chave not in self._buscas and not recente:
+                self._buscas[chave] = self._executor.submit(self._buscar, chave)
+
+        return None
+
+    def em_andamento(self, qtd: int, seed: int) -> bool:
+        """
+        Indica se a busca dos analistas remotos está em andamento.
+        """
+        with self._lock:
+            return (qtd, seed) in self._buscas
+
+
+@st.cache_resource
+def obter_provedor_analistas() -> ProvedorAnalistas:
+    """
+    Retorna o provedor de analistas do processo, compartilhado entre todas as sessões.
+    """
+    return ProvedorAnalistas()
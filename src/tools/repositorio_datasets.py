@@ -0,0 +1,202 @@
+"""
+Repositório compartilhado de conjuntos de dados, único por processo do servidor.
+
+Em vez de cada sessão do Streamlit manter a sua própria cópia dos dados, as sessões
+guardam apenas um `HandleDataset`, que aponta para uma entrada do repositório. Sessões
+que usam os mesmos parâmetros e a mesma semente compartilham a mesma entrada.
+
+As referências são contadas pelos handles vivos (referências fracas): quando uma
+sessão termina ou troca de conjunto de dados, o handle antigo é descartado. Entradas
+sem nenhuma referência são removidas por ordem de último acesso (LRU) quando o
+repositório ultrapassa a sua capacidade.
+"""
+
+import threading
+import weakref
+import polars as pl
+import streamlit as st
+
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+from tools.cache_datasets import carregar_ou_gerar, chave_dataset
+
+CAPACIDADE_REPOSITORIO: int = 8
+
+
+class _EntradaDataset:
+    """
+    Entrada do repositório: os dados de um conjunto, os artefatos derivados deles e os
+    handles que o referenciam.
+    """
+
+    def __init__(self, chave: str):
+        self.chave: str = chave
+        self.dados: dict[str, pl.DataFrame] | None = None
+        self.artefatos: dict[str, Any] = {}
+        self.versoes_artefatos: dict[str, Any] = {}
+        self.handles: weakref.WeakSet = weakref.WeakSet()
+        self.lock: threading.RLock = threading.RLock()
+
+
+class HandleDataset:
+    """
+    Referência de uma sessão a um conjunto de dados do repositório.
+    Enquanto existir, impede que a entrada seja removida do repositório.
+    """
+
+    def __init__(self, entrada: _EntradaDataset):
+        self._entrada: _EntradaDataset = entrada
+        entrada.handles.add(self)
+
+    @property
+    def chave(self) -> str:
+        """
+        Chave (versão) do conjunto de dados.
+        """
+        return self._entrada.chave
+
+    @property
+    def dados(self) -> dict[str, pl.DataFrame]:
+        """
+        Tabelas do conjunto de dados, compartilhadas entre as sessões.
+        """
+        return self._entrada.dados
+
+    def materializar(
+        self,
+        nome: str,
+        funcao: Callable[[dict[str, pl.DataFrame]], Any],
+        versao: Any = None,
+    ) -> Any:
+        """
+        Retorna um artefato derivado do conjunto de dados (por exemplo, o resultado de
+        um join), calculado uma única vez por conjunto de dados e compartilhado entre
+        as sessões. O artefato é removido junto com a entrada do repositório.
+
+        Args:
+            nome (str):
+            Nome do artefato.
+
+            funcao (Callable[[dict[str, pl.DataFrame]], Any]):
+            Função que calcula o artefato a partir das tabelas do conjunto de dados.
+
+            versao (Any, optional):
+            Versão do artefato (por exemplo, a data de referência). Quando difere da
+            versão guardada, o artefato é recalculado e substitui o anterior, mantendo
+            uma única cópia. Padrão é None.
+
+        Returns:
+            Any:
+            Artefato calculado.
+        """
+        entrada = self._entrada
+        with entrada.lock:
+            if (
+                nome not in entrada.artefatos
+                or entrada.versoes_artefatos.get(nome) != versao
+            ):
+                entrada.artefatos[nome] = funcao(entrada.dados)
+                entrada.versoes_artefatos[nome] = versao
+            return entrada.artefatos[nome]
+
+
+class RepositorioDatasets:
+    """
+    Repositório de conjuntos de dados compartilhados entre as sessões.
+
+    Args:
+        capacidade (int, optional):
+        Quantidade de entradas mantidas sem referência antes de remover as mais
+        antigas. Padrão é `CAPACIDADE_REPOSITORIO`.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_REPOSITORIO):
+        self.capacidade: int = capacidade
+        self._entradas: OrderedDict[str, _EntradaDataset] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def obter(
+        self,
+        nome: str,
+        parametros: dict,
+        seed: int,
+        gerador: Callable[[], dict[str, pl.DataFrame]],
+    ) -> HandleDataset:
+        """
+        Retorna um handle para o conjunto de dados. Caso ainda não esteja no
+        repositório, os dados são lidos do cache em disco ou gerados.
+
+        Args:
+            nome (str):
+            Nome do conjunto de dados.
+
+            parametros (dict):
+            Parâmetros usados na geração dos dados.
+
+            seed (int):
+            Semente usada na geração dos dados.
+
+            gerador (Callable[[], dict[str, pl.DataFrame]]):
+            Função que gera os dados, usada quando não estão em nenhum cache.
+
+        Returns:
+            HandleDataset:
+            Handle para o conjunto de dados.
+        """
+        chave = chave_dataset(nome, parametros, seed)
+
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                entrada = self._entradas[chave] = _EntradaDataset(chave)
+            self._entradas.move_to_end(chave)
+
+        # O lock da entrada faz com que sessões simultâneas esperem pela mesma
+        # geração, em vez de gerarem os mesmos dados em paralelo.
+        with entrada.lock:
+            if entrada.dados is None:
+                try:
+                    entrada.dados = carregar_ou_gerar(nome, parametros, seed, gerador)
+                except Exception:
+                    with self._lock:
+                        self._entradas.pop(chave, None)
+                    raise
+            handle = HandleDataset(entrada)
+
+        self._liberar()
+
+        return handle
+
+    def _liberar(self) -> None:
+        """
+        Remove as entradas sem referência mais antigas enquanto o repositório estiver
+        acima da capacidade.
+        """
+        with self._lock:
+            excedente = len(self._entradas) - self.capacidade
+            for chave in list(self._entradas):
+                if excedente <= 0:
+                    break
+                entrada = self._entradas[chave]
+                if entrada.dados is not None and not len(entrada.handles):
+                    del self._entradas[chave]
+                    excedente -= 1
+
+    def estatisticas(self) -> dict[str, int]:
+        """
+        Retorna a quantidade de referências de cada entrada do repositório.
+        """
+        with self._lock:
+            return {
+                chave: len(entrada.handles) for chave, entrada in self._entradas.items()
+            }
+
+
+@st.cache_resource
+def obter_repositorio() -> RepositorioDatasets:
+    """
+    Retorna o repositório de conjuntos de dados do processo, compartilhado entre todas
+    as sessões.
+    """
+    return RepositorioDatasets()
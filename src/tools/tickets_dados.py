@@ -0,0 +1,186 @@
+"""
+Transformações dos dados do Controle de Tickets, separadas da página para que possam
+ser reutilizadas e materializadas uma única vez por conjunto de dados.
+"""
+
+import polars as pl
+
+from datetime import datetime
+from typing import NamedTuple
+
+STATUS_TICKET: tuple[str, ...] = ("Aberto", "Pendente", "Concluído")
+STATUS_EM_ATENDIMENTO: tuple[str, ...] = ("Aberto", "Pendente")
+DIAS_ALERTA: int = 15
+
+
+# region Gráficos
+# Os gráficos recebem os dados já agregados, em vez de todos os tickets. Assim, a
+# quantidade de linhas enviadas ao navegador não cresce com a quantidade de tickets.
+def tickets_por_mes_status(df_tickets: pl.DataFrame) -> pl.DataFrame:
+    """
+    Quantidade de tickets por mês de criação e status.
+
+    Args:
+        df_tickets (pl.DataFrame):
+        Tickets, no formato de `gerar_dados_tickets_df`.
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com as colunas "Data Criação Ticket" (primeiro dia do mês),
+        "Status Ticket" e "Quantidade".
+    """
+    return (
+        df_tickets.group_by(
+            pl.col("Data Criação Ticket").dt.truncate("1mo"), "Status Ticket"
+        )
+        .agg(pl.len().alias("Quantidade"))
+        .sort("Data Criação Ticket", "Status Ticket")
+    )
+
+
+def tickets_por_analista_status(df_tickets: pl.DataFrame) -> pl.DataFrame:
+    """
+    Quantidade de tickets por analista e status.
+
+    Args:
+        df_tickets (pl.DataFrame):
+        Tickets, no formato de `gerar_dados_tickets_df`.
+
+    Returns:
+        pl.DataFrame:
+        DataFrame com as colunas "Analista", "Status Ticket" e "Quantidade".
+    """
+    return (
+        df_tickets.group_by("Analista", "Status Ticket")
+        .agg(pl.len().alias("Quantidade"))
+        .sort("Analista", "Status Ticket")
+    )
+
+
+# endregion
+
+
+# region Partições
+# Os tickets e os dados de cada analista são separados uma única vez por conjunto de
+# dados. A sessão de cada analista é montada com uma busca no dicionário, em vez de
+# filtrar todos os tickets para cada analista selecionado.
+def particionar(df: pl.DataFrame, coluna: str) -> dict[str, pl.DataFrame]:
+    """
+    Separa o DataFrame em um DataFrame para cada valor da coluna.
+
+    Args:
+        df (pl.DataFrame):
+        Dados a serem separados.
+
+        coluna (str):
+        Coluna usada na separação.
+
+    Returns:
+        dict[str, pl.DataFrame]:
+        Dicionário com o valor da coluna e as linhas correspondentes.
+    """
+    return {
+        chave: particao
+        for (chave,), particao in df.partition_by(
+            coluna, as_dict=True, maintain_order=True
+        ).items()
+    }
+
+
+def indexar_analistas(df_analistas: pl.DataFrame) -> dict[str, dict]:
+    """
+    Indexa os dados de cada analista pelo nome. Para nomes repetidos, é mantido o
+    primeiro analista.
+
+    Args:
+        df_analistas (pl.DataFrame):
+        Analistas, com a coluna "Analista".
+
+    Returns:
+        dict[str, dict]:
+        Dicionário com o nome e os dados (Foto, Email Empresarial, Telefone) de cada
+        analista.
+    """
+    return df_analistas.unique(
+        "Analista", keep="first", maintain_order=True
+    ).rows_by_key("Analista", named=True, unique=True)
+
+
+# endregion
+
+
+# region Indicadores
+# Todos os indicadores (tickets por status, em atendimento e em atendimento há mais de
+# `DIAS_ALERTA` dias) são calculados em uma única agregação por analista, com uma única
+# data de referência. O resumo e a sessão de cada analista leem o mesmo resultado.
+class IndicadoresTickets(NamedTuple):
+    """
+    Indicadores dos tickets por analista e totais, calculados na mesma data de
+    referência.
+    """
+
+    tabela: pl.DataFrame
+    por_analista: dict[str, dict]
+    totais: dict[str, int]
+    data_referencia: datetime
+
+
+def em_atendimento() -> pl.Expr:
+    """
+    Expressão que indica se o ticket está em atendimento (aberto ou pendente).
+    """
+    return pl.col("Status Ticket").is_in(STATUS_EM_ATENDIMENTO)
+
+
+def em_atendimento_ha_mais_de(
+    data_referencia: datetime, dias: int = DIAS_ALERTA
+) -> pl.Expr:
+    """
+    Expressão que indica se o ticket está em atendimento há mais de `dias` dias na
+    data de referência.
+    """
+    return em_atendimento() & (
+        (pl.lit(data_referencia) - pl.col("Data Criação Ticket")).dt.total_days() > dias
+    )
+
+
+def calcular_indicadores(
+    df_tickets: pl.DataFrame, data_referencia: datetime
+) -> IndicadoresTickets:
+    """
+    Calcula os indicadores dos tickets de todos os analistas em uma única agregação.
+
+    Args:
+        df_tickets (pl.DataFrame):
+        Tickets, no formato de `gerar_dados_tickets_df`.
+
+        data_referencia (datetime):
+        Data usada como "agora" no cálculo dos dias em atendimento.
+
+    Returns:
+        IndicadoresTickets:
+        Tabela com uma linha por analista e as colunas de `STATUS_TICKET`,
+        "Em Atendimento" e "Mais de 15 Dias", a mesma tabela indexada pelo nome do
+        analista, os totais de cada coluna e a data de referência.
+    """
+    tabela = df_tickets.group_by("Analista").agg(
+        *[
+            (pl.col("Status Ticket") == status).sum().alias(status)
+            for status in STATUS_TICKET
+        ],
+        em_atendimento().sum().alias("Em Atendimento"),
+        em_atendimento_ha_mais_de(data_referencia)
+        .sum()
+        .alias(f"Mais de {DIAS_ALERTA} Dias"),
+    )
+    totais = tabela.drop("Analista").sum().row(0, named=True)
+
+    return IndicadoresTickets(
+        tabela=tabela,
+        por_analista=tabela.rows_by_key("Analista", named=True, unique=True),
+        totais=totais,
+        data_referencia=data_referencia,
+    )
+
+
+# endregion
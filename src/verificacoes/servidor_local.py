@@ -0,0 +1,182 @@
+"""
+Servidor HTTP local que substitui os sites externos (RandomUser.me e as fotos dos
+analistas) nas verificações e nos benchmarks, sem acesso à rede.
+
+Rotas:
+- /api: usuários no formato da API do RandomUser.me (parâmetro `results`), com fotos
+  apontando para este servidor;
+- /fotos/<n>.png: foto PNG de `TAMANHO_FOTO` pixels, com cor derivada de `n`;
+- /api/portraits/<genero>/<n>.jpg: a mesma foto de /fotos/<n>.png, no caminho das
+  fotos dos analistas gerados localmente (`gerar_dados_analistas_df`);
+- demais caminhos: 404.
+
+Falhas podem ser injetadas: as próximas `falhas` requisições recebem 503, e todas as
+respostas podem ser atrasadas em `atraso` segundos.
+"""
+
+import json
+import threading
+import time
+import traceback
+
+from collections import Counter
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from PIL import Image
+from urllib.parse import parse_qs, urlsplit
+
+TAMANHO_FOTO: int = 512
+
+
+def gerar_foto(numero: int, tamanho: int = TAMANHO_FOTO) -> bytes:
+    """
+    Gera uma foto PNG quadrada, com cor derivada do número.
+    """
+    cor = (numero * 37 % 256, numero * 91 % 256, numero * 173 % 256)
+    saida = BytesIO()
+    Image.new("RGB", (tamanho, tamanho), cor).save(saida, format="PNG")
+    return saida.getvalue()
+
+
+class ServidorLocal:
+    """
+    Servidor HTTP local, executado em uma thread em segundo plano. Usado como
+    gerenciador de contexto (`with ServidorLocal() as servidor:`).
+
+    Args:
+        atraso (float, optional):
+        Espera, em segundos, antes de cada resposta. Padrão é 0.
+    """
+
+    def __init__(self, atraso: float = 0.0):
+        self.atraso: float = atraso
+        self.falhas: int = 0
+        self.requisicoes: Counter[str] = Counter()
+        self._lock: threading.Lock = threading.Lock()
+        self._fotos: dict[int, bytes] = {}
+        self._servidor: ThreadingHTTPServer = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self._criar_handler()
+        )
+        self._servidor.daemon_threads = True
+        self._thread: threading.Thread = threading.Thread(
+            target=self._servidor.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        """
+        URL base do servidor, sem barra no final.
+        """
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def url_foto(self, numero: int) -> str:
+        """
+        URL da foto de número `numero`.
+        """
+        return f"{self.url}/fotos/{numero}.png"
+
+    def injetar_falhas(self, quantidade: int) -> None:
+        """
+        Faz com que as próximas `quantidade` requisições recebam 503.
+        """
+        with self._lock:
+            self.falhas = quantidade
+
+    def __enter__(self) -> "ServidorLocal":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def _responder(self, caminho: str, parametros: dict) -> tuple[int, str, bytes]:
+        """
+        Status, tipo e corpo da resposta de uma requisição GET.
+        """
+        with self._lock:
+            self.requisicoes[caminho] += 1
+            if self.falhas > 0:
+                self.falhas -= 1
+                return 503, "text/plain", b"Servico indisponivel"
+
+        if caminho == "/api":
+            quantidade = int(parametros.get("results", ["1"])[0])
+            usuarios = [
+                {
+                    "name": {"first": f"Analista{n}", "last": "Local"},
+                    "phone": f"(11) 9{n:04d}-0000",
+                    "email": f"analista{n}@exemplo.com",
+                    "picture": {"large": self.url_foto(n)},
+                }
+                for n in range(quantidade)
+            ]
+            return 200, "application/json", json.dumps({"results": usuarios}).encode()
+
+        if caminho.startswith("/api/portraits/") and caminho.endswith(".jpg"):
+            numero = caminho.rsplit("/", 1)[-1].removesuffix(".jpg")
+            caminho = f"/fotos/{numero}.png"
+
+        if caminho.startswith("/fotos/") and caminho.endswith(".png"):
+            numero = int(caminho.removeprefix("/fotos/").removesuffix(".png"))
+            with self._lock:
+                if numero not in self._fotos:
+                    self._fotos[numero] = gerar_foto(numero)
+                foto = self._fotos[numero]
+            return 200, "image/png", foto
+
+        return 404, "text/plain", b"Nao encontrado"
+
+    def _criar_handler(self) -> type[BaseHTTPRequestHandler]:
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                if servidor.atraso:
+                    time.sleep(servidor.atraso)
+                status, tipo, corpo = servidor._responder(
+                    url.path, parse_qs(url.query)
+                )
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", tipo)
+                    self.send_header("Content-Length", str(len(corpo)))
+                    self.end_headers()
+                    self.wfile.write(corpo)
+                except (BrokenPipeError, ConnectionResetError):
+                    # O cliente desistiu da requisição (tempo limite de leitura)
+                    pass
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+
+def executar_verificacoes(verificacoes: list[Callable[[ServidorLocal], None]]) -> int:
+    """
+    Executa cada verificação com um novo servidor local, exibindo o resultado de cada
+    uma.
+
+    Args:
+        verificacoes (list[Callable[[ServidorLocal], None]]):
+        Funções de verificação, que lançam uma exceção quando falham.
+
+    Returns:
+        int:
+        Quantidade de verificações que falharam.
+    """
+    falhas = 0
+    for verificacao in verificacoes:
+        with ServidorLocal() as servidor:
+            try:
+                verificacao(servidor)
+                print(f"ok     {verificacao.__name__}")
+            except Exception:
+                falhas += 1
+                print(f"FALHOU {verificacao.__name__}")
+                traceback.print_exc()
+    return falhas
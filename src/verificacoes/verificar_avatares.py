@@ -0,0 +1,166 @@
+"""
+Verificação do cache de fotos dos analistas (`tools.avatares.CacheAvatares`) contra um
+servidor local, sem acesso à rede.
+
+Verifica o download em paralelo, o redimensionamento para `TAMANHO_AVATAR` pixels, a
+remoção por tamanho em bytes (LRU), o erro 404, as falhas recentes que não são baixadas
+novamente, a espera limitada por fotos ainda não baixadas e o disjuntor próprio do
+cache. O script termina com código de saída 1 quando alguma verificação falha.
+
+Uso (a partir da pasta src):
+    python -m verificacoes.verificar_avatares
+"""
+
+import sys
+import time
+
+from collections.abc import Callable
+from io import BytesIO
+from PIL import Image
+from tools.api_data import ClienteHttp, obter_cliente
+from tools.avatares import TAMANHO_AVATAR, CacheAvatares, redimensionar_avatar
+from verificacoes.servidor_local import (
+    ServidorLocal,
+    executar_verificacoes,
+    gerar_foto,
+)
+
+QTD_FOTOS: int = 8
+
+
+def _cache(**kwargs) -> CacheAvatares:
+    """
+    Cache com um cliente sem esperas entre as tentativas.
+    """
+    return CacheAvatares(cliente=ClienteHttp(espera_base=0.0), **kwargs)
+
+
+def verificar_pre_carregamento(servidor: ServidorLocal) -> None:
+    """
+    As fotos são baixadas em paralelo, uma única vez cada, mesmo quando são pedidas
+    durante o pré-carregamento.
+    """
+    servidor.atraso = 0.3
+    cache = _cache(qtd_threads=QTD_FOTOS)
+    urls = [servidor.url_foto(n) for n in range(QTD_FOTOS)]
+
+    inicio = time.perf_counter()
+    cache.pre_carregar(urls)
+    fotos = [cache.obter(url, espera=5.0) for url in urls]
+    decorrido = time.perf_counter() - inicio
+
+    assert all(foto is not None for foto in fotos)
+    # Em série, seriam QTD_FOTOS x 0,3 s
+    assert decorrido < 3 * servidor.atraso, f"{decorrido:.2f}s"
+    assert all(servidor.requisicoes[f"/fotos/{n}.png"] == 1 for n in range(QTD_FOTOS))
+
+
+def verificar_redimensionamento(servidor: ServidorLocal) -> None:
+    """
+    A foto é redimensionada para `TAMANHO_AVATAR` pixels e convertida para JPEG.
+    """
+    foto = _cache().obter(servidor.url_foto(1), espera=5.0)
+
+    with Image.open(BytesIO(foto)) as imagem:
+        assert imagem.format == "JPEG"
+        assert imagem.size == (TAMANHO_AVATAR, TAMANHO_AVATAR), imagem.size
+
+
+def verificar_remocao_lru(servidor: ServidorLocal) -> None:
+    """
+    Ao ultrapassar o limite de bytes, a foto acessada há mais tempo é removida.
+    """
+    tamanhos = {n: len(redimensionar_avatar(gerar_foto(n))) for n in range(3)}
+    cache = _cache(limite_bytes=tamanhos[0] + max(tamanhos[1], tamanhos[2]))
+    urls = {n: servidor.url_foto(n) for n in range(3)}
+
+    cache.obter(urls[0], espera=5.0)
+    cache.obter(urls[1], espera=5.0)
+    cache.obter(urls[0])  # a foto 0 passa a ser a mais recente
+    cache.obter(urls[2], espera=5.0)
+
+    assert list(cache._fotos) == [urls[0], urls[2]], list(cache._fotos)
+    assert cache.total_bytes == tamanhos[0] + tamanhos[2]
+    assert cache.total_bytes <= cache.limite_bytes
+
+
+def verificar_nao_encontrada(servidor: ServidorLocal) -> None:
+    """
+    Foto inexistente (404): retorna None, sem guardar no cache nem tentar novamente.
+    """
+    cache = _cache()
+    url = f"{servidor.url}/fotos/inexistente.jpg"
+
+    assert cache.obter(url, espera=5.0) is None
+    assert url not in cache._fotos
+    assert servidor.requisicoes["/fotos/inexistente.jpg"] == 1
+
+
+def verificar_falhas_recentes(servidor: ServidorLocal) -> None:
+    """
+    Foto cujo download falhou: não é baixada novamente nas próximas execuções nem no
+    pré-carregamento, até passar o tempo de nova tentativa. As falhas guardadas são
+    limitadas pela capacidade (LRU).
+    """
+    tempo_nova_tentativa = 0.5
+    cache = _cache(tempo_nova_tentativa=tempo_nova_tentativa, capacidade_falhas=2)
+    url = f"{servidor.url}/fotos/inexistente.jpg"
+
+    assert cache.obter(url, espera=5.0) is None
+    assert cache.obter(url, espera=5.0) is None
+    cache.pre_carregar([url])
+    assert servidor.requisicoes["/fotos/inexistente.jpg"] == 1, servidor.requisicoes
+
+    time.sleep(tempo_nova_tentativa)
+    assert cache.obter(url, espera=5.0) is None
+    assert servidor.requisicoes["/fotos/inexistente.jpg"] == 2, servidor.requisicoes
+
+    for n in range(3):
+        cache.obter(f"{servidor.url}/fotos/inexistente{n}.jpg", espera=5.0)
+    assert len(cache._falhas) == 2, list(cache._falhas)
+
+
+def verificar_espera_limitada(servidor: ServidorLocal) -> None:
+    """
+    Foto ainda não baixada: a espera é limitada e a foto fica disponível depois que
+    o download termina em segundo plano.
+    """
+    servidor.atraso = 1.0
+    cache = _cache()
+    url = servidor.url_foto(2)
+
+    inicio = time.perf_counter()
+    assert cache.obter(url, espera=0.1) is None
+    assert time.perf_counter() - inicio < 0.5
+
+    time.sleep(servidor.atraso + 0.5)
+    assert cache.obter(url, espera=0.0) is not None
+    assert servidor.requisicoes["/fotos/2.png"] == 1
+
+
+def verificar_disjuntor_proprio(servidor: ServidorLocal) -> None:
+    """
+    O cache usa um cliente com disjuntor próprio, separado do cliente da API.
+    """
+    cache = CacheAvatares()
+
+    assert cache.cliente is not obter_cliente()
+    assert cache.cliente.disjuntor is not obter_cliente().disjuntor
+
+
+VERIFICACOES: list[Callable[[ServidorLocal], None]] = [
+    verificar_pre_carregamento,
+    verificar_redimensionamento,
+    verificar_remocao_lru,
+    verificar_nao_encontrada,
+    verificar_falhas_recentes,
+    verificar_espera_limitada,
+    verificar_disjuntor_proprio,
+]
+
+
+if __name__ == "__main__":
+    falhas = executar_verificacoes(VERIFICACOES)
+    if falhas:
+        print(f"{falhas} verificação(ões) falharam.")
+        sys.exit(1)
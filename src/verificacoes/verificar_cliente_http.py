@@ -0,0 +1,152 @@
+"""
+Verificação do cliente HTTP (`tools.api_data.ClienteHttp`) e do disjuntor contra um
+servidor local que injeta respostas 503 e atrasos, sem acesso à rede.
+
+Verifica a nova tentativa seguida de sucesso, o esgotamento das tentativas, o tempo
+limite de leitura, a falha imediata com o disjuntor aberto e a recuperação depois do
+tempo aberto. O script termina com código de saída 1 quando alguma verificação falha.
+
+Uso (a partir da pasta src):
+    python -m verificacoes.verificar_cliente_http
+"""
+
+import sys
+import time
+import requests as r
+
+from collections.abc import Callable
+from tools.api_data import CircuitoAberto, ClienteHttp, Disjuntor
+from verificacoes.servidor_local import ServidorLocal, executar_verificacoes
+
+ESPERA_BASE: float = 0.01
+TEMPO_ABERTO: float = 0.5
+
+
+def _cliente(**kwargs) -> ClienteHttp:
+    """
+    Cliente com esperas curtas entre as tentativas e um disjuntor próprio.
+    """
+    kwargs.setdefault(
+        "disjuntor", Disjuntor(limite_falhas=2, tempo_aberto=TEMPO_ABERTO)
+    )
+    return ClienteHttp(tentativas=3, espera_base=ESPERA_BASE, **kwargs)
+
+
+def verificar_nova_tentativa(servidor: ServidorLocal) -> None:
+    """
+    Duas respostas 503 seguidas de sucesso: a terceira tentativa retorna a resposta.
+    """
+    cliente = _cliente()
+    servidor.injetar_falhas(2)
+    resposta = cliente.get(f"{servidor.url}/api?results=2")
+
+    assert resposta.status_code == 200
+    assert len(resposta.json()["results"]) == 2
+    assert servidor.requisicoes["/api"] == 3, servidor.requisicoes
+    assert not cliente.disjuntor.aberto
+
+
+def verificar_tentativas_esgotadas(servidor: ServidorLocal) -> None:
+    """
+    Respostas 503 em todas as tentativas: o último erro é lançado e a falha é contada
+    no disjuntor.
+    """
+    cliente = _cliente()
+    servidor.injetar_falhas(3)
+    try:
+        cliente.get(f"{servidor.url}/api")
+    except r.HTTPError as e:
+        assert e.response.status_code == 503
+    else:
+        raise AssertionError("Esperado HTTPError 503")
+
+    assert servidor.requisicoes["/api"] == 3, servidor.requisicoes
+    assert cliente.disjuntor._falhas == 1
+
+
+def verificar_erro_cliente(servidor: ServidorLocal) -> None:
+    """
+    Erro 404: sem novas tentativas e sem contar falha no disjuntor.
+    """
+    cliente = _cliente()
+    try:
+        cliente.get(f"{servidor.url}/inexistente")
+    except r.HTTPError as e:
+        assert e.response.status_code == 404
+    else:
+        raise AssertionError("Esperado HTTPError 404")
+
+    assert servidor.requisicoes["/inexistente"] == 1, servidor.requisicoes
+    assert cliente.disjuntor._falhas == 0
+
+
+def verificar_tempo_limite(servidor: ServidorLocal) -> None:
+    """
+    Resposta mais lenta que o tempo limite de leitura: cada tentativa é interrompida
+    no tempo limite e o erro de tempo limite é lançado.
+    """
+    cliente = _cliente(timeout=(1.0, 0.1))
+    servidor.atraso = 0.5
+    inicio = time.perf_counter()
+    try:
+        cliente.get(f"{servidor.url}/api")
+    except r.Timeout:
+        pass
+    else:
+        raise AssertionError("Esperado Timeout")
+    finally:
+        servidor.atraso = 0.0
+    decorrido = time.perf_counter() - inicio
+
+    assert decorrido < 3 * 0.5, f"{decorrido:.2f}s"
+    assert cliente.disjuntor._falhas == 1
+
+
+def verificar_disjuntor(servidor: ServidorLocal) -> None:
+    """
+    Depois de `limite_falhas` falhas seguidas, as requisições falham imediatamente,
+    sem acessar o servidor. Passado o tempo aberto, a próxima requisição é feita e o
+    sucesso fecha o disjuntor.
+    """
+    cliente = _cliente()
+    for _ in range(cliente.disjuntor.limite_falhas):
+        servidor.injetar_falhas(cliente.tentativas)
+        try:
+            cliente.get(f"{servidor.url}/api")
+        except r.HTTPError:
+            pass
+    assert cliente.disjuntor.aberto
+
+    requisicoes = servidor.requisicoes["/api"]
+    inicio = time.perf_counter()
+    try:
+        cliente.get(f"{servidor.url}/api")
+    except CircuitoAberto:
+        pass
+    else:
+        raise AssertionError("Esperado CircuitoAberto")
+    assert time.perf_counter() - inicio < 0.05
+    assert servidor.requisicoes["/api"] == requisicoes
+
+    # Recuperação: passado o tempo aberto, a requisição é feita e fecha o disjuntor
+    time.sleep(TEMPO_ABERTO)
+    assert cliente.get(f"{servidor.url}/api").status_code == 200
+    assert servidor.requisicoes["/api"] == requisicoes + 1
+    assert not cliente.disjuntor.aberto
+    assert cliente.disjuntor._falhas == 0
+
+
+VERIFICACOES: list[Callable[[ServidorLocal], None]] = [
+    verificar_nova_tentativa,
+    verificar_tentativas_esgotadas,
+    verificar_erro_cliente,
+    verificar_tempo_limite,
+    verificar_disjuntor,
+]
+
+
+if __name__ == "__main__":
+    falhas = executar_verificacoes(VERIFICACOES)
+    if falhas:
+        print(f"{falhas} verificação(ões) falharam.")
+        sys.exit(1)
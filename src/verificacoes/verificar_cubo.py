@@ -0,0 +1,142 @@
+"""
+Verificação do cubo mensal do Extrato de Serviços.
+
+Para vários conjuntos de dados e filtros, compara os totais calculados a partir do cubo
+(`filtrar_cubo` e `totais_cubo`) com os totais dos serviços filtrados diretamente
+(`MotorFiltros`), que são as linhas exibidas na tabela da página. O script termina com
+código de saída 1 quando algum total diverge.
+
+Uso (a partir da pasta src):
+    python -m verificacoes.verificar_cubo --sementes 20
+"""
+
+import argparse
+import random
+import sys
+import polars as pl
+
+from datetime import date, datetime, timedelta
+from mockup_data.faker_data_generation import (
+    gerar_dados_projeto_df,
+    gerar_servicos_projeto_df,
+)
+from tools.extrato_dados import (
+    construir_cubo_mensal,
+    enriquecer_servicos,
+    filtrar_cubo,
+    totais_cubo,
+)
+from tools.filtros import MotorFiltros
+
+DATA_REFERENCIA: datetime = datetime(2026, 1, 1)
+
+
+def gerar_extrato(seed: int) -> pl.DataFrame:
+    """
+    Gera os serviços enriquecidos com os mesmos parâmetros sorteados pela página.
+    """
+    rng = random.Random(seed)
+    qtd_itens, qtd_projetos, qtd_clientes, qtd_servicos = (
+        rng.randint(50, 200),
+        rng.randint(10, 400),
+        rng.randint(10, 500),
+        rng.randint(50, 500),
+    )
+    df_projetos = gerar_dados_projeto_df(
+        qtd_itens=qtd_itens,
+        qtd_projetos=qtd_projetos,
+        qtd_clientes=qtd_clientes,
+        seed=seed,
+        data_referencia=DATA_REFERENCIA,
+    )
+    df_servicos = gerar_servicos_projeto_df(
+        df_projetos=df_projetos,
+        qtd_servicos=qtd_servicos,
+        seed=seed,
+        data_referencia=DATA_REFERENCIA,
+    )
+    return enriquecer_servicos(df_servicos.lazy(), df_projetos.lazy()).collect()
+
+
+def filtros(df: pl.DataFrame) -> list[tuple[tuple[date, date], dict[str, list]]]:
+    """
+    Intervalos de datas e seleções verificados: início antes do primeiro serviço, no
+    dia do primeiro serviço, no primeiro dia do seu mês e no primeiro dia de um mês
+    posterior, sem seleção e com seleções de dimensões do cubo.
+    """
+    primeiro = df["Data Serviço"].min().date()
+    fim = DATA_REFERENCIA.date() + timedelta(days=1)
+    inicios = [
+        primeiro - timedelta(days=10),
+        primeiro,
+        primeiro.replace(day=1),
+        (primeiro.replace(day=1) + timedelta(days=400)).replace(day=1),
+    ]
+    selecoes = [
+        {},
+        {"Nome Cliente": df["Nome Cliente"].unique().sort().head(3).to_list()},
+        {
+            "Projeto Vinculado": (
+                df["Projeto Vinculado"].unique().sort().head(2).to_list()
+            )
+        },
+    ]
+    return [((inicio, fim), selecao) for inicio in inicios for selecao in selecoes]
+
+
+def verificar(seed: int) -> list[str]:
+    """
+    Compara os totais do cubo com os totais dos serviços filtrados de um conjunto de
+    dados.
+
+    Args:
+        seed (int):
+        Semente do conjunto de dados.
+
+    Returns:
+        list[str]:
+        Descrição de cada divergência encontrada.
+    """
+    df = gerar_extrato(seed)
+    cubo = construir_cubo_mensal(df.lazy())
+    motor = MotorFiltros(df)
+
+    divergencias: list[str] = []
+    for intervalo, selecao in filtros(df):
+        cubo_filtrado = filtrar_cubo(cubo, intervalo, selecao)
+        if cubo_filtrado is None:
+            continue
+
+        df_filtrado = motor.filtrar({"Data Serviço": intervalo}, selecao)
+        esperado = df_filtrado.select(
+            pl.col("Custo Serviço").sum(),
+            pl.col("QTD Horas").sum(),
+            pl.len(),
+        ).row(0)
+        obtido = totais_cubo(cubo_filtrado)
+        if obtido != esperado:
+            divergencias.append(
+                f"semente {seed}, intervalo {intervalo}, seleção {selecao}: "
+                f"cubo {obtido} != serviços {esperado}"
+            )
+
+    return divergencias
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sementes", type=int, default=20)
+    args = parser.parse_args()
+
+    divergencias = [
+        divergencia
+        for seed in range(args.sementes)
+        for divergencia in verificar(seed)
+    ]
+    for divergencia in divergencias:
+        print(divergencia)
+
+    if divergencias:
+        print(f"{len(divergencias)} divergência(s) entre o cubo e os serviços.")
+        sys.exit(1)
+    print(f"Totais do cubo conferem com os serviços ({args.sementes} sementes).")
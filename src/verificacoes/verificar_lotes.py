@@ -0,0 +1,133 @@
+"""
+Verificação da geração de serviços em lotes (`mockup_data.geracao_lotes`).
+
+Para várias quantidades de linhas e tamanhos de lote (inclusive com o último lote
+menor que os demais), compara os serviços gerados por `gerar_servicos_paralelo` com 1
+e com vários processos, por `gerar_servicos_em_lotes` e os gravados em Parquet por
+`salvar_dados_parquet`. Com a mesma semente, todos devem ser idênticos. O script
+termina com código de saída 1 quando algum resultado diverge.
+
+Uso (a partir da pasta src):
+    python -m verificacoes.verificar_lotes --processos 4
+"""
+
+import argparse
+import sys
+import tempfile
+import polars as pl
+
+from datetime import datetime
+from mockup_data.faker_data_generation import gerar_dados_projeto_df
+from mockup_data.geracao_lotes import (
+    ARQUIVO_SERVICOS,
+    gerar_servicos_em_lotes,
+    gerar_servicos_paralelo,
+    salvar_dados_parquet,
+)
+
+DATA_REFERENCIA: datetime = datetime(2026, 1, 1)
+
+# Quantidade de linhas e tamanho do lote de cada caso verificado
+CASOS: list[tuple[int, int]] = [
+    (0, 1_000),
+    (999, 1_000),
+    (10_000, 1_000),
+    (25_000, 4_000),
+]
+
+# Parâmetros dos projetos, os mesmos de `salvar_dados_parquet`
+PARAMETROS_PROJETOS: dict = {"qtd_itens": 50, "qtd_projetos": 20, "qtd_clientes": 20}
+
+
+def verificar(
+    qtd_linhas: int, tamanho_lote: int, qtd_processos: int, seed: int
+) -> list[str]:
+    """
+    Compara os serviços gerados pelas diferentes formas de geração em lotes.
+
+    Args:
+        qtd_linhas (int):
+        Quantidade total de serviços.
+
+        tamanho_lote (int):
+        Quantidade de linhas por lote.
+
+        qtd_processos (int):
+        Quantidade de processos da geração paralela.
+
+        seed (int):
+        Semente principal.
+
+    Returns:
+        list[str]:
+        Descrição de cada divergência encontrada.
+    """
+    df_projetos = gerar_dados_projeto_df(
+        **PARAMETROS_PROJETOS, seed=seed, data_referencia=DATA_REFERENCIA
+    )
+    parametros = {
+        "df_projetos": df_projetos,
+        "qtd_linhas": qtd_linhas,
+        "seed": seed,
+        "tamanho_lote": tamanho_lote,
+        "data_referencia": DATA_REFERENCIA,
+    }
+
+    esperado = gerar_servicos_paralelo(**parametros, qtd_processos=1)
+    with tempfile.TemporaryDirectory() as diretorio:
+        salvar_dados_parquet(
+            diretorio,
+            **PARAMETROS_PROJETOS,
+            qtd_linhas=qtd_linhas,
+            seed=seed,
+            tamanho_lote=tamanho_lote,
+            data_referencia=DATA_REFERENCIA,
+        )
+        obtidos = {
+            f"{qtd_processos} processos": gerar_servicos_paralelo(
+                **parametros, qtd_processos=qtd_processos
+            ),
+            "gerar_servicos_em_lotes": pl.concat(
+                [esperado.clear(), *gerar_servicos_em_lotes(**parametros)]
+            ),
+            "salvar_dados_parquet": pl.read_parquet(
+                f"{diretorio}/{ARQUIVO_SERVICOS}"
+            ).cast(esperado.schema),
+        }
+
+    divergencias: list[str] = []
+    if esperado.height != qtd_linhas:
+        divergencias.append(
+            f"{qtd_linhas} linhas, lote {tamanho_lote}: 1 processo gerou "
+            f"{esperado.height} linhas"
+        )
+    for forma, obtido in obtidos.items():
+        if not obtido.equals(esperado):
+            divergencias.append(
+                f"{qtd_linhas} linhas, lote {tamanho_lote}: {forma} diverge de "
+                "1 processo"
+            )
+
+    return divergencias
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    divergencias = [
+        divergencia
+        for qtd_linhas, tamanho_lote in CASOS
+        for divergencia in verificar(
+            qtd_linhas, tamanho_lote, args.processos, args.seed
+        )
+    ]
+    for divergencia in divergencias:
+        print(divergencia)
+
+    if divergencias:
+        print(f"{len(divergencias)} divergência(s) entre as formas de geração.")
+        sys.exit(1)
+    print(f"Serviços idênticos em todas as formas de geração ({len(CASOS)} casos).")